@@ -8,7 +8,7 @@ __all__ = (
 
 
 def create_test_db(objects=None) -> None:
-    if hasattr(db_sync_builder, '_session'):
+    if db_sync_builder.is_initialized:
         db_sync_builder.session.remove()
 
     db_sync_builder.init_session(DB_TEST_URL)
@@ -48,6 +48,7 @@ class Params:
         CHAT_BY_INTERLOCUTOR = '/chat/byInterlocutor', 'GET'
         MESSAGE = '/message', 'GET'
         CHAT_MESSAGES = '/chat/messages', 'GET'
+        CHAT_MESSAGES_SEARCH = '/chat/messages/search', 'GET'
 
         USER_CHATS = '/user/chats', 'GET'
 
@@ -1,6 +1,7 @@
 from _tests.data.http_.set_for_tests.chat import CHAT
 from _tests.data.http_.set_for_tests.chat_by_interlocutor import CHAT_BY_INTERLOCUTOR
 from _tests.data.http_.set_for_tests.chat_messages import CHAT_MESSAGES
+from _tests.data.http_.set_for_tests.chat_messages_search import CHAT_MESSAGES_SEARCH
 from _tests.data.http_.set_for_tests.chat_new import CHAT_NEW
 from _tests.data.http_.set_for_tests.chat_typing import CHAT_TYPING
 from _tests.data.http_.set_for_tests.chat_unread_count import CHAT_UNREAD_COUNT
@@ -58,6 +59,7 @@ class SetForTest:
     chat = CHAT
     chat_by_interlocutor = CHAT_BY_INTERLOCUTOR
     chat_messages = CHAT_MESSAGES
+    chat_messages_search = CHAT_MESSAGES_SEARCH
     user_chats = USER_CHATS
 
     user_logout = USER_LOGOUT
@@ -44,6 +44,7 @@ CHAT = [
                 Params.ID_START + 1,
             ],
             'interlocutorId': Params.ID_START + 1,
+            'lastActivity': anything_place,
         },
     ),
 ]
@@ -112,4 +112,31 @@ CHAT_MESSAGES = [
             },
         ],
     ),
+    _endpoint.new_as_first_user(
+        query_params={
+            'chatId': 1,
+            'beforeMessageId': 0,
+        },
+        expected_status=400,
+    ),
+    _endpoint.new_as_first_user(
+        query_params={
+            'chatId': 1,
+            'beforeMessageId': Params.ID_START + 2,
+            'size': 1,
+        },
+        expected_status=200,
+        expected_json_object=[
+            {
+                'id': Params.ID_START + 1,
+                'chatId': 1,
+                'userId': Params.ID_START,
+                'text': Params.MESSAGE_TEXTS[1],
+                'isRead': True,
+                'hasFiles': False,
+                'creatingDatetime': anything_place,
+                'repliedMessage': anything_place,
+            },
+        ],
+    ),
 ]
@@ -0,0 +1,81 @@
+from _tests.common.anything_place import anything_place
+from _tests.data.http_.params import Params
+
+__all__ = (
+    'CHAT_MESSAGES_SEARCH',
+)
+
+_UPDATED_MESSAGE_JSON = {
+    'id': Params.ID_START + 2,
+    'chatId': 1,
+    'userId': Params.ID_START,
+    'text': Params.UPDATED_TEXT,
+    'isRead': False,
+    'hasFiles': False,
+    'creatingDatetime': anything_place,
+    'repliedMessage': None,
+    'relevance': anything_place,
+}
+
+_endpoint = Params.Endpoint.CHAT_MESSAGES_SEARCH
+CHAT_MESSAGES_SEARCH = [
+    _endpoint.new_as_first_user(
+        query_params={},
+        expected_status=400,
+    ),
+    _endpoint.new_as_first_user(
+        query_params={
+            'query': '+-*',
+        },
+        expected_status=400,
+    ),
+    _endpoint.new_as_first_user(
+        query_params={
+            'query': Params.UPDATED_TEXT,
+            'beforeRelevance': 1,
+        },
+        expected_status=400,
+    ),
+    _endpoint.new_as_first_user(
+        query_params={
+            'query': Params.UPDATED_TEXT,
+            'chatId': 2,
+        },
+        expected_status=403,
+    ),
+    _endpoint.new_as_first_user(
+        query_params={
+            'query': Params.UPDATED_TEXT,
+            'chatId': 100,
+        },
+        expected_status=404,
+    ),
+    _endpoint.new_as_first_user(
+        query_params={
+            'query': Params.UPDATED_TEXT,
+        },
+        expected_status=200,
+        expected_json_object=[
+            _UPDATED_MESSAGE_JSON,
+        ],
+    ),
+    _endpoint.new_as_first_user(
+        query_params={
+            'query': Params.UPDATED_TEXT[:4].upper(),
+            'chatId': 1,
+        },
+        expected_status=200,
+        expected_json_object=[
+            _UPDATED_MESSAGE_JSON,
+        ],
+    ),
+    _endpoint.new_as_first_user(
+        query_params={
+            'query': Params.UPDATED_TEXT,
+            'beforeRelevance': 0,
+            'beforeMessageId': Params.ID_START + 2,
+        },
+        expected_status=200,
+        expected_json_object=[],
+    ),
+]
@@ -21,6 +21,7 @@ USER_CHATS = [
                     Params.ID_START + 3,
                 ],
                 'interlocutorId': Params.ID_START + 3,
+                'lastActivity': anything_place,
             },
             {
                 'id': 1,
@@ -32,6 +33,7 @@ USER_CHATS = [
                     Params.ID_START + 1,
                 ],
                 'interlocutorId': Params.ID_START + 1,
+                'lastActivity': anything_place,
             },
             {
                 'id': 4,
@@ -43,6 +45,7 @@ USER_CHATS = [
                     Params.ID_START + 4,
                 ],
                 'interlocutorId': Params.ID_START + 4,
+                'lastActivity': anything_place,
             },
         ],
     ),
@@ -63,7 +66,21 @@ USER_CHATS = [
                     Params.ID_START + 1,
                 ],
                 'interlocutorId': Params.ID_START + 1,
+                'lastActivity': anything_place,
             },
         ],
     ),
+    _endpoint.new_as_first_user(
+        query_params={
+            'beforeActivity': 'text',
+        },
+        expected_status=400,
+    ),
+    _endpoint.new_as_first_user(
+        query_params={
+            'beforeChatId': 1,
+        },
+        expected_status=200,
+        expected_json_object=[],
+    ),
 ]
@@ -0,0 +1,150 @@
+from collections import UserList as CustomList
+from typing import Awaitable, Callable, AsyncIterator
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.db import DB_TEST_ASYNC_URL
+from db.builders import db_sync_builder, db_async_builder
+from db.exceptions import DBEntityIsForbiddenException
+from db.models import User, Chat, Message, UserChatMatch
+from _tests.common.create_test_db import create_test_db
+
+_FIRST_USER_ID = 1
+_SECOND_USER_ID = 2
+_THIRD_USER_ID = 3
+_CHAT_ID = 1
+_MESSAGE_ID = 3
+
+
+def setup_module(module) -> None:
+    create_test_db()
+
+    users: list[User] = [User.create(f'user{i}@test.test') for i in range(3)]
+    db_sync_builder.session.add_all(users)
+    db_sync_builder.session.commit()
+
+    for interlocutor in users[1:]:
+        chat, matches = Chat.new_with_all_dependencies([users[0].id, interlocutor.id])
+        db_sync_builder.session.add(chat)
+        db_sync_builder.session.add_all(matches)
+        db_sync_builder.session.flush()
+        for i in range(5):
+            message: Message = Message.create(f'text {i}', (users[0], interlocutor)[i % 2], chat)
+            db_sync_builder.session.add(message)
+            db_sync_builder.session.flush()
+            chat.set_last_message(message)
+            chat.increment_unread_counts(message._user_id)
+    db_sync_builder.session.commit()
+
+
+def teardown_function() -> None:
+    db_sync_builder.session.remove()
+
+
+@pytest_asyncio.fixture
+async def session() -> AsyncIterator[AsyncSession]:
+    # Every test has its own event loop, so connections must not outlive it:
+    db_async_builder.init_session(DB_TEST_ASYNC_URL)
+    async with db_async_builder.new_session() as session:
+        yield session
+    await db_async_builder.engine.dispose()
+
+
+def _comparable(result):
+    if isinstance(result, (list, tuple, CustomList)):
+        return [_comparable(item) for item in result]
+    if isinstance(result, dict):
+        return {key: _comparable(value) for key, value in result.items()}
+    if hasattr(result, 'id'):
+        return type(result).__name__, result.id
+    return result
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('sync_query, async_query', [
+    (
+        lambda: User.by_id(_FIRST_USER_ID),
+        lambda s: User.async_by_id(s, _FIRST_USER_ID),
+    ),
+    (
+        lambda: User.by_email('user1@test.test'),
+        lambda s: User.async_by_email(s, 'user1@test.test'),
+    ),
+    (
+        lambda: User.by_id(_FIRST_USER_ID).chats(size=1),
+        lambda s: UserChatMatch.async_chats_of_user(s, _FIRST_USER_ID, size=1),
+    ),
+    (
+        lambda: Chat.by_id(_CHAT_ID).messages(size=3),
+        lambda s: _chat_then(s, lambda chat: chat.async_messages(s, size=3)),
+    ),
+    (
+        lambda: Chat.by_id(_CHAT_ID).messages(size=3, before_message_id=_MESSAGE_ID),
+        lambda s: _chat_then(s, lambda chat: chat.async_messages(s, size=3, before_message_id=_MESSAGE_ID)),
+    ),
+    (
+        lambda: Chat.by_id(_CHAT_ID).users(),
+        lambda s: _chat_then(s, lambda chat: chat.async_users(s)),
+    ),
+    (
+        lambda: Chat.by_id(_CHAT_ID).interlocutor_of_user(_FIRST_USER_ID),
+        lambda s: _chat_then(s, lambda chat: chat.async_interlocutor_of_user(s, _FIRST_USER_ID)),
+    ),
+    (
+        lambda: Chat.by_id(_CHAT_ID).unread_count_of_user(_FIRST_USER_ID),
+        lambda s: _chat_then(s, lambda chat: chat.async_unread_count_of_user(s, _FIRST_USER_ID)),
+    ),
+    (
+        lambda: Chat.between_users(_FIRST_USER_ID, _THIRD_USER_ID),
+        lambda s: Chat.async_between_users(s, _FIRST_USER_ID, _THIRD_USER_ID),
+    ),
+    (
+        lambda: Message.by_ids([_MESSAGE_ID, _MESSAGE_ID + 1]),
+        lambda s: Message.async_by_ids(s, [_MESSAGE_ID, _MESSAGE_ID + 1]),
+    ),
+    (
+        lambda: UserChatMatch.chat_if_user_has_access(_SECOND_USER_ID, _CHAT_ID),
+        lambda s: UserChatMatch.async_chat_if_user_has_access(s, _SECOND_USER_ID, _CHAT_ID),
+    ),
+    (
+        lambda: UserChatMatch.all_interlocutors_of_all_chats_of_user(_FIRST_USER_ID),
+        lambda s: UserChatMatch.async_all_interlocutors_of_all_chats_of_user(s, _FIRST_USER_ID),
+    ),
+    (
+        lambda: UserChatMatch.chat_ids_of_user(_FIRST_USER_ID),
+        lambda s: UserChatMatch.async_chat_ids_of_user(s, _FIRST_USER_ID),
+    ),
+    (
+        lambda: UserChatMatch.user_ids_of_chats([_CHAT_ID, _CHAT_ID + 1]),
+        lambda s: UserChatMatch.async_user_ids_of_chats(s, [_CHAT_ID, _CHAT_ID + 1]),
+    ),
+    (
+        lambda: UserChatMatch.unread_counts_of_user(_SECOND_USER_ID, [_CHAT_ID, _CHAT_ID + 1]),
+        lambda s: UserChatMatch.async_unread_counts_of_user(s, _SECOND_USER_ID, [_CHAT_ID, _CHAT_ID + 1]),
+    ),
+    (
+        lambda: UserChatMatch.last_seen_message_id_of_user(_FIRST_USER_ID, _CHAT_ID),
+        lambda s: UserChatMatch.async_last_seen_message_id_of_user(s, _FIRST_USER_ID, _CHAT_ID),
+    ),
+])
+async def test_async_query_matches_sync_one(session: AsyncSession,
+                                            sync_query: Callable[[], object],
+                                            async_query: Callable[[AsyncSession], Awaitable[object]],
+                                            ) -> None:
+    assert _comparable(await async_query(session)) == _comparable(sync_query())
+
+
+@pytest.mark.asyncio
+async def test_async_check_user_access(session: AsyncSession) -> None:
+    chat: Chat = await Chat.async_by_id(session, _CHAT_ID)
+    await chat.async_check_user_access(session, _SECOND_USER_ID)
+    with pytest.raises(DBEntityIsForbiddenException):
+        await chat.async_check_user_access(session, _THIRD_USER_ID)
+
+
+async def _chat_then(session: AsyncSession,
+                     func: Callable[[Chat], Awaitable[object]],
+                     ) -> object:
+    return await func(await Chat.async_by_id(session, _CHAT_ID))
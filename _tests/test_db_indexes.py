@@ -0,0 +1,145 @@
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+import pytest
+from sqlalchemy import event, text
+
+from db.builders import db_sync_builder
+from db.models import User, Chat, Message, UserChatMatch
+from _tests.common.create_test_db import create_test_db
+
+_USERS_COUNT = 3
+_CHATS_COUNT = 30
+_MESSAGES_COUNT_PER_CHAT = 40
+_FIRST_USER_ID = 1
+_SECOND_USER_ID = 2
+_CHAT_ID = 1
+# Ids of messages of the first chat are 1..40 and alternate between the first and the second users:
+_MESSAGE_ID = 20
+
+
+def setup_module(module) -> None:
+    create_test_db()
+
+    users: list[User] = [User.create(f'user{i}@test.test') for i in range(_USERS_COUNT)]
+    db_sync_builder.session.add_all(users)
+    db_sync_builder.session.commit()
+
+    for _ in range(_CHATS_COUNT):
+        chat, matches = Chat.new_with_all_dependencies([user.id for user in users[:2]])
+        db_sync_builder.session.add(chat)
+        db_sync_builder.session.add_all(matches)
+        db_sync_builder.session.flush()
+        db_sync_builder.session.add_all([
+            Message.create(f'text {i}', users[i % 2], chat) for i in range(_MESSAGES_COUNT_PER_CHAT)
+        ])
+    db_sync_builder.session.commit()
+
+    with db_sync_builder.engine.connect() as connection:
+        for model in (Chat, Message, UserChatMatch):
+            connection.execute(text(f'ANALYZE TABLE {model.__tablename__}'))
+
+
+def teardown_function() -> None:
+    db_sync_builder.session.rollback()
+
+
+@contextmanager
+def _captured_statements() -> Iterator[list[tuple[str, object]]]:
+    statements: list[tuple[str, object]] = []
+
+    def before_cursor_execute(_connection, _cursor, statement, parameters, _context, _executemany) -> None:
+        statements.append((statement, parameters))
+
+    event.listen(db_sync_builder.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db_sync_builder.engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def _used_keys(statement: str,
+               parameters: object,
+               table_name: str,
+               ) -> list[str | None]:
+    with db_sync_builder.engine.connect() as connection:
+        rows = connection.exec_driver_sql(f'EXPLAIN {statement}', parameters).mappings().all()
+    return [row['key'] for row in rows if row['table'] == table_name]
+
+
+@pytest.mark.parametrize('query, table_name, expected_keys', [
+    (
+        lambda: Chat.by_id(_CHAT_ID).messages(size=20),
+        Message.__tablename__,
+        {'ix_messages_chat_id_creating_datetime'},
+    ),
+    (
+        lambda: Chat.by_id(_CHAT_ID).messages(size=20, before_message_id=_MESSAGE_ID),
+        Message.__tablename__,
+        {'ix_messages_chat_id_id'},
+    ),
+    (
+        lambda: Chat.by_id(_CHAT_ID).read_interlocutor_messages_up_to(_MESSAGE_ID, _FIRST_USER_ID),
+        Message.__tablename__,
+        {'ix_messages_chat_id_is_read_user_id', 'ix_messages_chat_id_id'},
+    ),
+    (
+        lambda: Chat.by_id(_CHAT_ID).interlocutor_messages_after_count(_MESSAGE_ID, _FIRST_USER_ID),
+        Message.__tablename__,
+        {'ix_messages_chat_id_id', 'ix_messages_chat_id_is_read_user_id'},
+    ),
+    (
+        lambda: UserChatMatch.search_messages_of_user(_FIRST_USER_ID, ['text'], size=20),
+        Message.__tablename__,
+        {'ix_messages_text_fulltext'},
+    ),
+    (
+        lambda: UserChatMatch.chat_if_user_has_access(_FIRST_USER_ID, _CHAT_ID),
+        UserChatMatch.__tablename__,
+        {'uq_user_chat_matches_user_id_chat_id'},
+    ),
+    (
+        lambda: UserChatMatch.unread_count_of_user(_FIRST_USER_ID, _CHAT_ID),
+        UserChatMatch.__tablename__,
+        {'uq_user_chat_matches_user_id_chat_id'},
+    ),
+    (
+        lambda: UserChatMatch.unread_counts_of_user(_FIRST_USER_ID, [_CHAT_ID, _CHAT_ID + 1]),
+        UserChatMatch.__tablename__,
+        {'uq_user_chat_matches_user_id_chat_id'},
+    ),
+    (
+        lambda: UserChatMatch.chat_ids_of_user(_FIRST_USER_ID),
+        UserChatMatch.__tablename__,
+        {'uq_user_chat_matches_user_id_chat_id'},
+    ),
+    (
+        lambda: UserChatMatch.user_ids_of_chats([_CHAT_ID, _CHAT_ID + 1]),
+        UserChatMatch.__tablename__,
+        {'ix_user_chat_matches_chat_id_user_id'},
+    ),
+    (
+        lambda: UserChatMatch.chats_of_user(_FIRST_USER_ID, size=20),
+        UserChatMatch.__tablename__,
+        {'uq_user_chat_matches_user_id_chat_id', 'ix_user_chat_matches_chat_id_user_id'},
+    ),
+    (
+        lambda: UserChatMatch.increment_unread_counts(_CHAT_ID, _SECOND_USER_ID),
+        UserChatMatch.__tablename__,
+        {'ix_user_chat_matches_chat_id_user_id'},
+    ),
+])
+def test_query_uses_index(query: Callable[[], object],
+                          table_name: str,
+                          expected_keys: set[str],
+                          ) -> None:
+    with _captured_statements() as statements:
+        query()
+
+    used_keys: list[str | None] = [
+        key
+        for statement, parameters in statements
+        for key in _used_keys(statement, parameters, table_name)
+    ]
+    assert used_keys
+    assert all(key in expected_keys for key in used_keys), used_keys
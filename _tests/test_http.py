@@ -4,7 +4,10 @@ from werkzeug.test import TestResponse
 from unittest.mock import patch
 
 from config.paths import MEDIA_FOLDER
+from db.auth_token_cache import AuthTokenCache
+from db.membership_cache import MembershipCache
 from db.models import User, Message
+from db.user_cache import UserCache
 from http_.app import app
 from http_.users.email.codes.functions import delete_email_code
 from http_.common.content_length_check_decorator import _max_lengths
@@ -28,6 +31,10 @@ def setup_module(module) -> None:
         set_initial_autoincrement_value(table_name, Params.ID_START)
 
     delete_email_code(Params.EMAIL_FOR_CODE)
+    # Ids are reused by every run:
+    UserCache().clear()
+    AuthTokenCache().clear()
+    MembershipCache().clear()
 
     module.max_lengths_patcher = patch.dict(_max_lengths, {
         'user_avatar_edit': len(Params.AVATAR_MAX_BYTES),
@@ -0,0 +1,77 @@
+import pytest
+
+from websocket_.presence_aggregator import PresenceAggregator
+
+
+@pytest.mark.parametrize('transitions, changes', [
+    ([], {}),
+    ([(1, True)], {1: True}),
+    ([(1, False)], {1: False}),
+    ([(1, True), (2, False)], {1: True, 2: False}),
+    # Flaps within the window produce nothing:
+    ([(1, True), (1, False)], {}),
+    ([(1, False), (1, True)], {}),
+    ([(1, True), (1, False), (1, True), (1, False)], {}),
+    ([(1, True), (1, False), (1, True)], {1: True}),
+    ([(1, True), (2, True), (2, False)], {1: True}),
+])
+def test_pop_changes(transitions: list[tuple[int, bool]],
+                     changes: dict[int, bool],
+                     ) -> None:
+    aggregator: PresenceAggregator = PresenceAggregator(window=0)
+    for user_id, status in transitions:
+        aggregator.add(user_id, status)
+
+    assert aggregator.pop_changes() == changes
+
+
+def test_pop_changes_starts_new_window() -> None:
+    aggregator: PresenceAggregator = PresenceAggregator(window=0)
+    aggregator.add(1, True)
+    assert aggregator.is_due()
+    assert aggregator.pop_changes() == {1: True}
+
+    assert not aggregator.is_due()
+    assert aggregator.pop_changes() == {}
+
+    # The status before the new window is the one sent by the previous window:
+    aggregator.add(1, False)
+    assert aggregator.pop_changes() == {1: False}
+
+
+def test_is_due_after_window() -> None:
+    aggregator: PresenceAggregator = PresenceAggregator(window=60)
+    aggregator.add(1, True)
+
+    assert not aggregator.is_due()
+
+
+@pytest.mark.parametrize('statuses, recipient_ids_of_users, merged', [
+    ({}, {}, []),
+    ({1: True}, {1: []}, []),
+    ({1: True}, {1: [2, 3]}, [([2, 3], {1: True})]),
+    # A recipient gets all statuses meant for it in one payload:
+    ({1: True, 2: False}, {1: [3], 2: [3]}, [([3], {1: True, 2: False})]),
+    # Recipients with equal payloads are grouped:
+    (
+        {1: True, 2: False},
+        {1: [3, 4, 5], 2: [4, 5]},
+        [([3], {1: True}), ([4, 5], {1: True, 2: False})],
+    ),
+])
+def test_merge(statuses: dict[int, bool],
+               recipient_ids_of_users: dict[int, list[int]],
+               merged: list[tuple[list[int], dict[int, bool]]],
+               ) -> None:
+    assert sorted(PresenceAggregator.merge(statuses, recipient_ids_of_users)) == sorted(merged)
+
+
+def test_merge_of_flapped_user() -> None:
+    # A user who has flapped within the window isn't sent to anybody:
+    aggregator: PresenceAggregator = PresenceAggregator(window=0)
+    aggregator.add(1, True)
+    aggregator.add(2, False)
+    aggregator.add(2, True)
+    statuses: dict[int, bool] = aggregator.pop_changes()
+
+    assert PresenceAggregator.merge(statuses, {user_id: [3] for user_id in statuses}) == [([3], {1: True})]
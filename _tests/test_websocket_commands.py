@@ -0,0 +1,122 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from db.builders import db_sync_builder
+from db.membership_cache import MembershipCache
+from db.models import User, Chat, Message
+from websocket_.command_handler import CommandHandler
+from _tests.common.create_test_db import create_test_db
+
+_FIRST_USER_ID = 1
+_THIRD_USER_ID = 3
+_CHAT_ID = 1
+_NOT_EXISTING_ID = 1000
+_REQUEST_ID = 'request-1'
+
+
+def setup_module(module) -> None:
+    create_test_db()
+    MembershipCache().clear()
+
+    users: list[User] = [User.create(f'user{i}@test.test') for i in range(3)]
+    db_sync_builder.session.add_all(users)
+    db_sync_builder.session.commit()
+
+    chat, matches = Chat.new_with_all_dependencies([users[0].id, users[1].id])
+    db_sync_builder.session.add(chat)
+    db_sync_builder.session.add_all(matches)
+    db_sync_builder.session.flush()
+    db_sync_builder.session.add_all([Message.create(f'text {i}', users[i % 2], chat) for i in range(3)])
+    db_sync_builder.session.commit()
+
+    module.signal_queue_push_patcher = patch('common.signals.queue.SignalQueue.push')
+    module.signal_queue_push_patcher.start()
+
+
+def teardown_module(module) -> None:
+    module.signal_queue_push_patcher.stop()
+
+
+def teardown_function() -> None:
+    db_sync_builder.session.remove()
+
+
+def _frame(command_type: str,
+           data: dict,
+           request_id: int | str | None = _REQUEST_ID,
+           ) -> str:
+    frame: dict = {'type': command_type, 'data': data}
+    if request_id is not None:
+        frame['requestId'] = request_id
+    return json.dumps(frame)
+
+
+@pytest.mark.parametrize('frame, status', [
+    (_frame('NEW_MESSAGE', {'chatId': _CHAT_ID, 'text': 'new text'}), 201),
+    (_frame('NEW_MESSAGE', {'chatId': _CHAT_ID}), 400),
+    (_frame('NEW_MESSAGE', {'chatId': 'chat', 'text': 'new text'}), 400),
+    (_frame('NEW_MESSAGE', {'chatId': _NOT_EXISTING_ID, 'text': 'new text'}), 404),
+    (_frame('NEW_MESSAGE', {'chatId': _CHAT_ID, 'text': 'new text', 'repliedMessageId': _NOT_EXISTING_ID}), 404),
+    (_frame('READ', {'messageId': 2}), 200),
+    (_frame('READ', {}), 400),
+    (_frame('READ', {'messageId': _NOT_EXISTING_ID}), 404),
+    (_frame('TYPING', {'chatId': _CHAT_ID}), 200),
+    (_frame('TYPING', {'chatId': _CHAT_ID + 1}), 403),
+])
+def test_ack_status(frame: str, status: int) -> None:
+    ack: dict = json.loads(CommandHandler().handle(_FIRST_USER_ID, frame))
+
+    assert ack['type'] == 'ACK'
+    assert ack['data']['requestId'] == _REQUEST_ID
+    assert ack['data']['status'] == status
+
+
+@pytest.mark.parametrize('frame', [
+    _frame('NEW_MESSAGE', {'chatId': _CHAT_ID, 'text': 'new text'}),
+    _frame('READ', {'messageId': 1}),
+    _frame('TYPING', {'chatId': _CHAT_ID}),
+])
+def test_ack_status_of_user_without_access(frame: str) -> None:
+    ack: dict = json.loads(CommandHandler().handle(_THIRD_USER_ID, frame))
+
+    assert ack['data']['status'] == 403
+
+
+def test_new_message_ack_has_message() -> None:
+    ack: dict = json.loads(CommandHandler().handle(
+        _FIRST_USER_ID,
+        _frame('NEW_MESSAGE', {'chatId': _CHAT_ID, 'text': 'text of ack'}),
+    ))
+
+    assert ack['data']['data']['text'] == 'text of ack'
+    assert Message.by_id(ack['data']['data']['id']).text == 'text of ack'
+
+
+def test_no_ack_without_request_id() -> None:
+    assert CommandHandler().handle(
+        _FIRST_USER_ID,
+        _frame('NEW_MESSAGE', {'chatId': _NOT_EXISTING_ID, 'text': 'new text'}, request_id=None),
+    ) is None
+
+
+@pytest.mark.parametrize('frame', [
+    'not json',
+    '[]',
+    json.dumps({'requestId': _REQUEST_ID, 'data': {}}),
+    json.dumps({'type': 'UNKNOWN', 'requestId': _REQUEST_ID, 'data': {}}),
+    json.dumps({'type': 'READ', 'requestId': _REQUEST_ID, 'data': []}),
+])
+def test_no_ack_for_invalid_frame(frame: str) -> None:
+    assert CommandHandler().handle(_FIRST_USER_ID, frame) is None
+
+
+def test_ack_status_of_unexpected_error() -> None:
+    with patch('db.models.Chat.by_id', side_effect=ConnectionError):
+        ack: dict = json.loads(CommandHandler().handle(
+            _FIRST_USER_ID,
+            _frame('NEW_MESSAGE', {'chatId': _CHAT_ID, 'text': 'new text'}),
+        ))
+
+    assert ack['data']['status'] == 500
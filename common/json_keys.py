@@ -31,16 +31,28 @@ class JSONKey(StrEnum):
 
     OFFSET = 'offset'
     SIZE = 'size'
+    BEFORE_MESSAGE_ID = 'beforeMessageId'
+    BEFORE_ACTIVITY = 'beforeActivity'
+    BEFORE_CHAT_ID = 'beforeChatId'
+    BEFORE_RELEVANCE = 'beforeRelevance'
+
+    QUERY = 'query'
+    RELEVANCE = 'relevance'
 
     NAME = 'name'
     IS_GROUP = 'isGroup'
     USER_IDS = 'userIds'
     UNREAD_COUNT = 'unreadCount'
+    LAST_ACTIVITY = 'lastActivity'
 
     IS_THAT = 'isThat'
 
     TYPE = 'type'
     DATA = 'data'
 
+    RECONNECT_AFTER = 'reconnectAfter'
+    REQUEST_ID = 'requestId'
+    STATUS = 'status'
+
     def __repr__(self) -> str:
         return '\'' + str(self) + '\''
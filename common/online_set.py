@@ -2,6 +2,8 @@ from typing import Final
 
 from common.resident_app import resident_app
 from common.singleton import SingletonMeta
+from common.ttl_cache import TTLCache
+from config.api import ONLINE_LOCAL_CACHE_TTL, ONLINE_LOCAL_CACHE_MAX_SIZE
 
 __all__ = (
     'OnlineSet',
@@ -9,16 +11,47 @@ __all__ = (
 
 
 class OnlineSet(metaclass=SingletonMeta):
+    # Redis set of ids of online users with an in-process snapshot of recently looked up statuses.
     _KEY: Final[str] = 'online_set'
 
+    def __init__(self) -> None:
+        self._local_cache: TTLCache[int, bool] = TTLCache(ONLINE_LOCAL_CACHE_MAX_SIZE, ONLINE_LOCAL_CACHE_TTL)
+
     def add(self, user_id: int) -> None:
         resident_app.sadd(self._KEY, user_id)
+        self._local_cache.set(user_id, True)
 
     def remove(self, user_id: int) -> None:
         resident_app.srem(self._KEY, user_id)
+        self._local_cache.set(user_id, False)
+
+    def remove_many(self, user_ids: list[int]) -> None:
+        if not user_ids:
+            return
+        resident_app.srem(self._KEY, *user_ids)
+        for user_id in user_ids:
+            self._local_cache.set(user_id, False)
 
     def exists(self, user_id: int | str) -> bool:
-        return resident_app.sismember(self._KEY, str(user_id)) is 1
+        return self.exists_many([int(user_id)])[int(user_id)]
+
+    def exists_many(self, user_ids: list[int]) -> dict[int, bool]:
+        # One round trip for all ids which aren't in the snapshot.
+        statuses: dict[int, bool] = {}
+        missed_user_ids: list[int] = []
+        for user_id in dict.fromkeys(user_ids):
+            try:
+                statuses[user_id] = self._local_cache.get(user_id)
+            except KeyError:
+                missed_user_ids.append(user_id)
+
+        if missed_user_ids:
+            for user_id, is_member in zip(missed_user_ids, resident_app.smismember(self._KEY, missed_user_ids)):
+                statuses[user_id] = bool(is_member)
+                self._local_cache.set(user_id, statuses[user_id])
+
+        return statuses
 
     def clear(self) -> None:
         resident_app.delete(self._KEY)
+        self._local_cache.clear()
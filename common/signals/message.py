@@ -5,6 +5,7 @@ from common.signals.signal_types import SignalType
 __all__ = (
     'SignalQueueMessage',
     'SignalQueueMessageJSONDictToForward',
+    'DumpedSignalQueueMessage',
 )
 
 
@@ -18,3 +19,10 @@ class SignalQueueMessageJSONDictToForward(TypedDict):
 
     type: SignalType
     data: dict
+
+
+class DumpedSignalQueueMessage(NamedTuple):
+    # `message` stays JSON-encoded exactly as it was popped, ready to be forwarded as is.
+
+    user_ids: list[int]
+    dumped_message: str
@@ -0,0 +1,102 @@
+from time import time
+from typing import Final
+
+from redis.commands.core import Script
+
+from common.resident_app import resident_app
+from common.singleton import SingletonMeta
+
+__all__ = (
+    'NodeRegistry',
+)
+
+
+class NodeRegistry(metaclass=SingletonMeta):
+    # Which WebSocket nodes hold connections of which users (both directions are stored)
+    # and when every node has been seen alive for the last time.
+    _USER_NODES_KEY_PREFIX: Final[str] = 'websocket_user_nodes_'
+    _NODE_USERS_KEY_PREFIX: Final[str] = 'websocket_node_users_'
+    _HEARTBEATS_KEY: Final[str] = 'websocket_node_heartbeats'
+    # Removes the heartbeat only if it is still stale, so only one node claims a dead one
+    # and a node which has just come back isn't claimed:
+    _CLAIM_IF_DEAD_SCRIPT: Final[str] = '''
+        local heartbeat = redis.call('ZSCORE', KEYS[1], ARGV[1])
+        if heartbeat and tonumber(heartbeat) <= tonumber(ARGV[2]) then
+            return redis.call('ZREM', KEYS[1], ARGV[1])
+        end
+        return 0
+    '''
+
+    def __init__(self) -> None:
+        self._claim_if_dead: Script = resident_app.register_script(self._CLAIM_IF_DEAD_SCRIPT)
+
+    def add(self, node_id: str, user_id: int) -> None:
+        pipeline = resident_app.pipeline()
+        pipeline.sadd(self._user_nodes_key(user_id), node_id)
+        pipeline.sadd(self._node_users_key(node_id), user_id)
+        pipeline.execute()
+
+    def add_many(self, node_id: str, user_ids: list[int]) -> None:
+        if not user_ids:
+            return
+        pipeline = resident_app.pipeline()
+        for user_id in user_ids:
+            pipeline.sadd(self._user_nodes_key(user_id), node_id)
+        pipeline.sadd(self._node_users_key(node_id), *user_ids)
+        pipeline.execute()
+
+    def remove(self, node_id: str, user_id: int) -> bool:
+        # Returns `True` if the user is not connected to any node anymore.
+        pipeline = resident_app.pipeline()
+        pipeline.srem(self._user_nodes_key(user_id), node_id)
+        pipeline.srem(self._node_users_key(node_id), user_id)
+        pipeline.scard(self._user_nodes_key(user_id))
+        return pipeline.execute()[-1] == 0
+
+    def is_connected(self, user_id: int) -> bool:
+        return bool(resident_app.exists(self._user_nodes_key(user_id)))
+
+    def nodes_of_users(self, user_ids: list[int]) -> set[str]:
+        if not user_ids:
+            return set()
+        return resident_app.sunion([self._user_nodes_key(user_id) for user_id in user_ids])
+
+    def heartbeat(self, node_id: str) -> bool:
+        # Returns `True` if the node had no heartbeat, i.e. it is new or it has been cleared.
+        return resident_app.zadd(self._HEARTBEATS_KEY, {node_id: time()}) == 1
+
+    def claim_dead_nodes(self, ttl: float) -> list[str]:
+        # Returns ids of nodes which haven't sent heartbeats for `ttl` seconds and have been claimed by the caller,
+        # who must clear them.
+        deadline: float = time() - ttl
+        return [
+            node_id
+            for node_id in resident_app.zrangebyscore(self._HEARTBEATS_KEY, '-inf', deadline)
+            if self._claim_if_dead(keys=[self._HEARTBEATS_KEY], args=[node_id, deadline])
+        ]
+
+    def clear_node(self, node_id: str) -> list[int]:
+        # Returns ids of users who are not connected to any node anymore.
+        user_ids: list[int] = [int(user_id) for user_id in resident_app.smembers(self._node_users_key(node_id))]
+
+        pipeline = resident_app.pipeline()
+        for user_id in user_ids:
+            pipeline.srem(self._user_nodes_key(user_id), node_id)
+        pipeline.delete(self._node_users_key(node_id))
+        # The last, so a node which is still alive and has restored its users meanwhile
+        # notices it on the next heartbeat:
+        pipeline.zrem(self._HEARTBEATS_KEY, node_id)
+        pipeline.execute()
+        if not user_ids:
+            return []
+
+        pipeline = resident_app.pipeline()
+        for user_id in user_ids:
+            pipeline.exists(self._user_nodes_key(user_id))
+        return [user_id for user_id, exists in zip(user_ids, pipeline.execute()) if not exists]
+
+    def _user_nodes_key(self, user_id: int) -> str:
+        return self._USER_NODES_KEY_PREFIX + str(user_id)
+
+    def _node_users_key(self, node_id: str) -> str:
+        return self._NODE_USERS_KEY_PREFIX + node_id
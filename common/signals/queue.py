@@ -5,7 +5,14 @@ from common.hinting import raises
 from common.resident_app import resident_app
 from common.singleton import SingletonMeta
 from common.signals.exceptions import SignalQueueIsEmptyException
-from common.signals.message import SignalQueueMessage
+from common.signals.message import SignalQueueMessage, DumpedSignalQueueMessage
+from common.signals.node_registry import NodeRegistry
+from config.api import (
+    WEBSOCKET_MULTI_NODE,
+    SIGNAL_QUEUE_BATCH_SIZE,
+    SIGNAL_QUEUE_BLOCK_TIMEOUT,
+    SIGNAL_QUEUE_MAX_LENGTH,
+)
 
 __all__ = (
     'SignalQueue',
@@ -14,22 +21,83 @@ __all__ = (
 
 class SignalQueue(metaclass=SingletonMeta):
     _KEY: Final[str] = 'signals'
+    _NODE_KEY_PREFIX: Final[str] = 'signals_'
+    # The dumped layout is fixed, so the forwarded part can be sliced out without decoding it:
+    _DUMP_PREFIX: Final[str] = '{"user_ids": '
+    _DUMP_SEPARATOR: Final[str] = ', "message": '
+    _DUMP_SUFFIX: Final[str] = '}'
+
+    def push(self, message: SignalQueueMessage,
+             except_node_id: str | None = None,
+             ) -> None:
+        # `except_node_id` is a node which has already sent the message to its clients (the multi node mode only).
+        if not WEBSOCKET_MULTI_NODE:
+            resident_app.rpush(self._KEY, self._dump(message))
+            return
+
+        # Only the nodes holding connections of the recipients get the message:
+        node_ids: set[str] = NodeRegistry().nodes_of_users(message.user_ids)
+        node_ids.discard(except_node_id)
+        if not node_ids:
+            return
 
-    def push(self, message: SignalQueueMessage) -> None:
-        resident_app.rpush(self._KEY, self._dump(message))
+        dumped_message: str = self._dump(message)
+        pipeline = resident_app.pipeline()
+        for node_id in node_ids:
+            pipeline.rpush(self._node_key(node_id), dumped_message)
+            # A crashed node must not make its queue grow forever:
+            pipeline.ltrim(self._node_key(node_id), -SIGNAL_QUEUE_MAX_LENGTH, -1)
+        pipeline.execute()
 
-    @staticmethod
-    def _dump(message: SignalQueueMessage) -> str:
-        return json.dumps(message._asdict())
+    @classmethod
+    def _dump(cls, message: SignalQueueMessage) -> str:
+        return (
+            cls._DUMP_PREFIX
+            + json.dumps(message.user_ids)
+            + cls._DUMP_SEPARATOR
+            + json.dumps(message.message)
+            + cls._DUMP_SUFFIX
+        )
 
     @raises(SignalQueueIsEmptyException)
-    def pop(self) -> SignalQueueMessage:
-        dumped_message: str | None = resident_app.lpop(self._KEY)
-        if not dumped_message:
+    def pop_many(self, batch_size: int = SIGNAL_QUEUE_BATCH_SIZE,
+                 timeout: float = SIGNAL_QUEUE_BLOCK_TIMEOUT,
+                 node_id: str | None = None,
+                 ) -> list[DumpedSignalQueueMessage]:
+        key: str = self._KEY if node_id is None else self._node_key(node_id)
+
+        # Blocks until at least one message appears, so an idle queue costs one round trip per `timeout`:
+        popped: tuple[str, str] | None = resident_app.blpop([key], timeout=timeout)
+        if popped is None:
             raise SignalQueueIsEmptyException
-        return self._load(dumped_message)
 
-    @staticmethod
-    def _load(dumped_message: str) -> SignalQueueMessage:
-        kwargs = json.loads(dumped_message)
-        return SignalQueueMessage(**kwargs)
+        dumped_messages: list[str] = [popped[1]]
+        if batch_size > 1:
+            dumped_messages += resident_app.lpop(key, batch_size - 1) or []
+
+        return [self._load_user_ids_only(dumped_message) for dumped_message in dumped_messages]
+
+    @raises(SignalQueueIsEmptyException)
+    def pop_pending(self, batch_size: int = SIGNAL_QUEUE_BATCH_SIZE,
+                    node_id: str | None = None,
+                    ) -> list[DumpedSignalQueueMessage]:
+        # Never blocks, unlike `pop_many`.
+        key: str = self._KEY if node_id is None else self._node_key(node_id)
+        dumped_messages: list[str] | None = resident_app.lpop(key, batch_size)
+        if not dumped_messages:
+            raise SignalQueueIsEmptyException
+        return [self._load_user_ids_only(dumped_message) for dumped_message in dumped_messages]
+
+    def clear_node(self, node_id: str) -> None:
+        resident_app.delete(self._node_key(node_id))
+
+    @classmethod
+    def _load_user_ids_only(cls, dumped_message: str) -> DumpedSignalQueueMessage:
+        separator_index: int = dumped_message.index(cls._DUMP_SEPARATOR)
+        return DumpedSignalQueueMessage(
+            user_ids=json.loads(dumped_message[len(cls._DUMP_PREFIX):separator_index]),
+            dumped_message=dumped_message[separator_index + len(cls._DUMP_SEPARATOR):-len(cls._DUMP_SUFFIX)],
+        )
+
+    def _node_key(self, node_id: str) -> str:
+        return self._NODE_KEY_PREFIX + node_id
@@ -16,3 +16,5 @@ class SignalType(StrEnum):
     FILES = 'FILES'
     READ = 'READ'
     ONLINE_STATUSES = 'ONLINE_STATUSES'
+    # Not queued, it is the answer to a WebSocket command:
+    ACK = 'ACK'
@@ -0,0 +1,159 @@
+import os
+import signal
+from multiprocessing import Process
+from multiprocessing.connection import wait
+from time import monotonic, sleep
+from typing import Callable, Final
+
+from common.logs import logger
+
+__all__ = (
+    'Supervisor',
+)
+
+
+class Supervisor:
+    # Runs every service in its own process and restarts it if it exits.
+    # Every service is a leader of its own process group, so subprocesses it starts (gunicorn, uvicorn)
+    # are stopped with it.
+    _STOP_SIGNALS: Final[tuple[signal.Signals, ...]] = (signal.SIGTERM, signal.SIGINT)
+    _GROUP_CHECK_INTERVAL: Final[float] = 0.1
+
+    def __init__(self, services: list[Callable[[], object]],
+                 restart_delay: float = 1,
+                 max_restart_delay: float = 60,
+                 stop_timeout: float = 30,
+                 ) -> None:
+        self._services = services
+        self._restart_delay = restart_delay
+        self._max_restart_delay = max_restart_delay
+        self._stop_timeout = stop_timeout
+
+        self._processes: dict[Callable[[], object], Process] = {}
+        self._started_at: dict[Callable[[], object], float] = {}
+        self._restart_delays: dict[Callable[[], object], float] = {}
+        # Exited services with `monotonic()` values to restart them at:
+        self._restart_deadlines: dict[Callable[[], object], float] = {}
+        self._is_stopping: bool = False
+        # Self-pipe: a signal handler wakes up the waiting below.
+        self._wakeup_read_fd, self._wakeup_write_fd = os.pipe()
+
+    def run(self) -> None:
+        for signal_ in self._STOP_SIGNALS:
+            signal.signal(signal_, self._handle_stop_signal)
+
+        for service in self._services:
+            self._start(service)
+
+        while not self._is_stopping:
+            self._wait_and_restart()
+
+        self._stop_all()
+
+    def _wait_and_restart(self) -> None:
+        # Blocks until a process exits, a restart is due or a stop signal comes, so nothing is spinning.
+        # Every service waits for its restart on its own, the others are watched meanwhile.
+        sentinels: dict[int, Callable[[], object]] = {
+            process.sentinel: service for service, process in self._processes.items()
+        }
+        timeout: float | None = None
+        if self._restart_deadlines:
+            timeout = max(min(self._restart_deadlines.values()) - monotonic(), 0)
+        ready: list = wait([*sentinels, self._wakeup_read_fd], timeout)
+        if self._is_stopping:
+            return
+
+        for sentinel in ready:
+            if sentinel not in sentinels:
+                continue
+            service: Callable[[], object] = sentinels[sentinel]
+            process: Process = self._processes.pop(service)
+            process.join()
+            logger.error(f'Service {process.name} exited with code {process.exitcode}.')
+            self._signal_group(process, signal.SIGTERM)  # Its subprocesses could survive it.
+            self._schedule_restart(service)
+
+        for service, deadline in tuple(self._restart_deadlines.items()):
+            if deadline <= monotonic():
+                self._restart_deadlines.pop(service)
+                self._start(service)
+
+    def _schedule_restart(self, service: Callable[[], object]) -> None:
+        # A service which keeps crashing is restarted with growing delays.
+        if monotonic() - self._started_at[service] >= self._max_restart_delay:
+            self._restart_delays.pop(service, None)
+        delay: float = self._restart_delays.get(service, self._restart_delay)
+        logger.info(f'Restarting service {service.__name__} in {delay} s.')
+        self._restart_delays[service] = min(delay * 2, self._max_restart_delay)
+        self._restart_deadlines[service] = monotonic() + delay
+
+    def _start(self, service: Callable[[], object]) -> None:
+        process: Process = Process(target=_run_service, args=(service,), name=service.__name__)
+        # Stop signals are kept pending until the service has reset their handlers inherited from here:
+        signal.pthread_sigmask(signal.SIG_BLOCK, self._STOP_SIGNALS)
+        try:
+            process.start()
+        finally:
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, self._STOP_SIGNALS)
+        # The service does it too, but the group must exist before anything is signaled to it:
+        try:
+            os.setpgid(process.pid, process.pid)
+        except (ProcessLookupError, PermissionError):
+            pass  # The service has already exited or has done it itself.
+        self._processes[service] = process
+        self._started_at[service] = monotonic()
+        logger.info(f'Service {process.name} has been started (pid {process.pid}).')
+
+    def _stop_all(self) -> None:
+        logger.info('Stopping services...')
+        for process in self._processes.values():
+            self._signal_group(process, signal.SIGTERM)
+
+        deadline: float = monotonic() + self._stop_timeout
+        for process in self._processes.values():
+            if not self._wait_group(process, deadline):
+                logger.warning(f'Service {process.name} has not stopped in time, it is killed.')
+                self._signal_group(process, signal.SIGKILL)
+                process.join()
+
+        logger.info('All services have been stopped.')
+
+    def _wait_group(self, process: Process, deadline: float) -> bool:
+        # Subprocesses of a service (gunicorn or uvicorn workers) can outlive it, so the whole group is waited for.
+        # Returns `False` if something of the group is still alive at `deadline`.
+        while True:
+            process.join(max(min(deadline - monotonic(), self._GROUP_CHECK_INTERVAL), 0))  # Reaps the service.
+            if not process.is_alive() and not self._group_exists(process):
+                return True
+            if monotonic() >= deadline:
+                return False
+            if not process.is_alive():
+                sleep(self._GROUP_CHECK_INTERVAL)
+
+    def _handle_stop_signal(self, _signal_number: int, _frame) -> None:
+        # Nothing is logged here: logging isn't reentrant.
+        self._is_stopping = True
+        os.write(self._wakeup_write_fd, b'\0')
+
+    @staticmethod
+    def _signal_group(process: Process, signal_: signal.Signals) -> None:
+        try:
+            os.killpg(process.pid, signal_)
+        except ProcessLookupError:
+            pass
+
+    @staticmethod
+    def _group_exists(process: Process) -> bool:
+        try:
+            os.killpg(process.pid, 0)
+        except ProcessLookupError:
+            return False
+        return True
+
+
+def _run_service(service: Callable[[], object]) -> None:
+    os.setpgrp()
+    for signal_ in Supervisor._STOP_SIGNALS:  # noqa
+        signal.signal(signal_, signal.SIG_DFL)
+    signal.pthread_sigmask(signal.SIG_UNBLOCK, Supervisor._STOP_SIGNALS)  # noqa
+    service()
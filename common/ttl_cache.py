@@ -0,0 +1,54 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Generic, TypeVar
+
+from common.hinting import raises
+
+__all__ = (
+    'TTLCache',
+)
+
+KeyT = TypeVar('KeyT')
+ValueT = TypeVar('ValueT')
+
+
+class TTLCache(Generic[KeyT, ValueT]):
+    # Thread-safe in-process LRU cache whose entries expire.
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self._max_size = max_size
+        self._ttl = ttl
+        self._data: OrderedDict[KeyT, tuple[ValueT, float]] = OrderedDict()
+        self._lock: Lock = Lock()
+
+    @raises(KeyError)
+    def get(self, key: KeyT) -> ValueT:
+        with self._lock:
+            value, expires_at = self._data[key]
+            if expires_at <= monotonic():
+                del self._data[key]
+                raise KeyError(key)
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: KeyT,
+            value: ValueT,
+            ttl: float | None = None,
+            ) -> None:
+        # `ttl` can only shorten the default one.
+        ttl = self._ttl if ttl is None else min(ttl, self._ttl)
+        with self._lock:
+            self._data[key] = (value, monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self._max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key: KeyT) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
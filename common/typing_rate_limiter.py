@@ -0,0 +1,33 @@
+from typing import Final
+
+from common.resident_app import resident_app
+from common.singleton import SingletonMeta
+from common.ttl_cache import TTLCache
+from config.api import TYPING_SIGNAL_INTERVAL, TYPING_LOCAL_CACHE_MAX_SIZE
+
+__all__ = (
+    'TypingRateLimiter',
+)
+
+
+class TypingRateLimiter(metaclass=SingletonMeta):
+    # At most one typing signal per user and chat in `TYPING_SIGNAL_INTERVAL`, shared by HTTP and all WebSocket nodes.
+    # The in-process tier rejects repeated signals without a round trip.
+    _KEY_PREFIX: Final[str] = 'typing_'
+
+    def __init__(self) -> None:
+        self._local_cache: TTLCache[tuple[int, int], bool] = TTLCache(
+            TYPING_LOCAL_CACHE_MAX_SIZE, TYPING_SIGNAL_INTERVAL,
+        )
+
+    def allow(self, user_id: int, chat_id: int) -> bool:
+        try:
+            return not self._local_cache.get((user_id, chat_id))
+        except KeyError:
+            pass
+
+        self._local_cache.set((user_id, chat_id), True)
+        return bool(resident_app.set(self._key(user_id, chat_id), 1, nx=True, px=int(TYPING_SIGNAL_INTERVAL * 1000)))
+
+    def _key(self, user_id: int, chat_id: int) -> str:
+        return f'{self._KEY_PREFIX}{user_id}_{chat_id}'
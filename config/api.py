@@ -1,5 +1,6 @@
 from os import environ
 from pathlib import Path
+from socket import gethostname
 from typing import Final
 
 from dotenv import load_dotenv
@@ -11,7 +12,31 @@ __all__ = (
 
     'HOST',
     'HTTP_PORT',
+    'HTTP_SERVER',
+    'HTTP_WORKERS',
+    'HTTP_WORKER_CLASS',
+    'HTTP_THREADS',
+    'HTTP_PRELOAD',
+    'HTTP_ASGI_THREADS',
+    'HTTP_ASGI_SEND_QUEUE_SIZE',
     'WEBSOCKET_PORT',
+    'WEBSOCKET_ENGINE',
+    'WEBSOCKET_MULTI_NODE',
+    'WEBSOCKET_NODE_ID',
+    'WEBSOCKET_OUTBOX_MAX_SIZE',
+    'WEBSOCKET_SLOW_CLIENT_POLICY',
+    'WEBSOCKET_OUTBOX_METRICS_INTERVAL',
+    'WEBSOCKET_DRAIN_BATCH_SIZE',
+    'WEBSOCKET_DRAIN_BATCH_INTERVAL',
+    'WEBSOCKET_RECONNECT_MAX_DELAY',
+    'WEBSOCKET_DRAIN_TIMEOUT',
+    'WEBSOCKET_HEARTBEAT_INTERVAL',
+    'WEBSOCKET_NODE_TTL',
+    'WEBSOCKET_PRESENCE_WINDOW',
+
+    'SUPERVISOR_RESTART_DELAY',
+    'SUPERVISOR_MAX_RESTART_DELAY',
+    'SUPERVISOR_STOP_TIMEOUT',
 
     'CORS_ORIGINS',
 
@@ -20,10 +45,23 @@ __all__ = (
     'JWT_ACCESS_TOKEN_EXPIRES',
     'JWT_REFRESH_TOKEN_EXPIRES',
 
+    'AUTH_LOCAL_CACHE_TTL',
+    'AUTH_LOCAL_CACHE_MAX_SIZE',
+    'USER_CACHE_TTL',
+    'MEMBERSHIP_CACHE_TTL',
+    'ONLINE_LOCAL_CACHE_TTL',
+    'ONLINE_LOCAL_CACHE_MAX_SIZE',
+    'TYPING_SIGNAL_INTERVAL',
+    'TYPING_LOCAL_CACHE_MAX_SIZE',
+
     'REDIS_HOST',
     'REDIS_PORT',
     'REDIS_URL',
 
+    'SIGNAL_QUEUE_BATCH_SIZE',
+    'SIGNAL_QUEUE_BLOCK_TIMEOUT',
+    'SIGNAL_QUEUE_MAX_LENGTH',
+
     'SMTP_HOST',
     'SMTP_PORT',
 
@@ -42,7 +80,45 @@ DEBUG: Final[bool] = False if environ['DEBUG'].lower() == 'false' else bool(envi
 
 HOST: Final[str] = environ['HOST']  # Is common for HTTP and WebSocket.
 HTTP_PORT: Final[int] = int(environ['HTTP_PORT'])
+HTTP_SERVER: Final[str] = environ.get('HTTP_SERVER', 'wsgi')  # 'wsgi' (gunicorn) or 'asgi' (uvicorn).
+HTTP_WORKERS: Final[int] = int(environ.get('HTTP_WORKERS', 4))  # Processes.
+# Gunicorn only. 'sync', 'gthread' or 'gevent' (gevent must be installed separately):
+HTTP_WORKER_CLASS: Final[str] = environ.get('HTTP_WORKER_CLASS', 'sync')
+HTTP_THREADS: Final[int] = int(environ.get('HTTP_THREADS', 1))  # Per 'gthread' worker.
+# Gunicorn only. The app is imported once before forking, DB pools are dropped in workers after it:
+HTTP_PRELOAD: Final[bool] = environ.get('HTTP_PRELOAD', 'false').lower() == 'true'
+# Threads of every ASGI worker which run the WSGI app, slow clients are served by the event loop meanwhile:
+HTTP_ASGI_THREADS: Final[int] = int(environ.get('HTTP_ASGI_THREADS', 20))
+# Response chunks buffered per ASGI request, a thread waits for a slow client when they are full:
+HTTP_ASGI_SEND_QUEUE_SIZE: Final[int] = int(environ.get('HTTP_ASGI_SEND_QUEUE_SIZE', 10))
 WEBSOCKET_PORT: Final[int] = int(environ['WEBSOCKET_PORT'])
+WEBSOCKET_ENGINE: Final[str] = environ.get('WEBSOCKET_ENGINE', 'sync')  # 'sync' or 'asyncio'.
+# Several WebSocket nodes behind a load balancer. Signals are routed to a personal queue of each node:
+WEBSOCKET_MULTI_NODE: Final[bool] = environ.get('WEBSOCKET_MULTI_NODE', 'false').lower() == 'true'
+# Should be stable across restarts, otherwise what the previous id has left is reaped only after `WEBSOCKET_NODE_TTL`:
+WEBSOCKET_NODE_ID: Final[str] = environ.get('WEBSOCKET_NODE_ID', gethostname())
+WEBSOCKET_OUTBOX_MAX_SIZE: Final[int] = int(environ.get('WEBSOCKET_OUTBOX_MAX_SIZE', 1000))  # Per connection.
+# 'drop_new', 'drop_oldest' or 'disconnect':
+WEBSOCKET_SLOW_CLIENT_POLICY: Final[str] = environ.get('WEBSOCKET_SLOW_CLIENT_POLICY', 'drop_oldest')
+WEBSOCKET_OUTBOX_METRICS_INTERVAL: Final[float] = float(environ.get('WEBSOCKET_OUTBOX_METRICS_INTERVAL', 60))  # In seconds.
+# On SIGTERM clients are closed in batches and told to reconnect after a random delay up to the max one:
+WEBSOCKET_DRAIN_BATCH_SIZE: Final[int] = int(environ.get('WEBSOCKET_DRAIN_BATCH_SIZE', 100))
+WEBSOCKET_DRAIN_BATCH_INTERVAL: Final[float] = float(environ.get('WEBSOCKET_DRAIN_BATCH_INTERVAL', 0.1))  # In seconds.
+WEBSOCKET_RECONNECT_MAX_DELAY: Final[float] = float(environ.get('WEBSOCKET_RECONNECT_MAX_DELAY', 10))  # In seconds.
+# Must be less than `SUPERVISOR_STOP_TIMEOUT`. In seconds:
+WEBSOCKET_DRAIN_TIMEOUT: Final[float] = float(environ.get('WEBSOCKET_DRAIN_TIMEOUT', 20))
+# Every node sends heartbeats. Online users of a node which hasn't sent them for the TTL are set offline
+# by another node. The TTL must be greater than `WEBSOCKET_DRAIN_TIMEOUT`. In seconds:
+WEBSOCKET_HEARTBEAT_INTERVAL: Final[float] = float(environ.get('WEBSOCKET_HEARTBEAT_INTERVAL', 5))
+WEBSOCKET_NODE_TTL: Final[float] = float(environ.get('WEBSOCKET_NODE_TTL', 30))
+# Online status changes are collected for the window and sent in one message per recipient.
+# Checked every `SIGNAL_QUEUE_BLOCK_TIMEOUT` at worst. In seconds:
+WEBSOCKET_PRESENCE_WINDOW: Final[float] = float(environ.get('WEBSOCKET_PRESENCE_WINDOW', 1))
+
+# `main.py` restarts crashed services, the delay is doubled while a service keeps crashing. In seconds:
+SUPERVISOR_RESTART_DELAY: Final[float] = float(environ.get('SUPERVISOR_RESTART_DELAY', 1))
+SUPERVISOR_MAX_RESTART_DELAY: Final[float] = float(environ.get('SUPERVISOR_MAX_RESTART_DELAY', 60))
+SUPERVISOR_STOP_TIMEOUT: Final[float] = float(environ.get('SUPERVISOR_STOP_TIMEOUT', 30))  # Then it is killed.
 
 CORS_ORIGINS: Final[list[str]] = environ['CORS_ORIGINS'].split(',')
 
@@ -51,10 +127,26 @@ JWT_ALGORITHM: Final[str] = environ['JWT_ALGORITHM']
 JWT_ACCESS_TOKEN_EXPIRES: Final[int] = int(environ['JWT_ACCESS_TOKEN_EXPIRES'])
 JWT_REFRESH_TOKEN_EXPIRES: Final[int] = int(environ['JWT_REFRESH_TOKEN_EXPIRES'])
 
+# In-process tier of auth caches. Bounds how long a revoked token or edited user is seen by other processes:
+AUTH_LOCAL_CACHE_TTL: Final[float] = float(environ.get('AUTH_LOCAL_CACHE_TTL', 5))  # In seconds.
+AUTH_LOCAL_CACHE_MAX_SIZE: Final[int] = int(environ.get('AUTH_LOCAL_CACHE_MAX_SIZE', 10_000))
+USER_CACHE_TTL: Final[int] = int(environ.get('USER_CACHE_TTL', 300))  # Redis tier, in seconds.
+MEMBERSHIP_CACHE_TTL: Final[int] = int(environ.get('MEMBERSHIP_CACHE_TTL', 3600))  # In seconds.
+# In-process snapshot of online statuses. Bounds how long a changed status is seen by other processes:
+ONLINE_LOCAL_CACHE_TTL: Final[float] = float(environ.get('ONLINE_LOCAL_CACHE_TTL', 2))  # In seconds.
+ONLINE_LOCAL_CACHE_MAX_SIZE: Final[int] = int(environ.get('ONLINE_LOCAL_CACHE_MAX_SIZE', 100_000))
+# Typing signals of a user in a chat which come more often are dropped. In seconds:
+TYPING_SIGNAL_INTERVAL: Final[float] = float(environ.get('TYPING_SIGNAL_INTERVAL', 2))
+TYPING_LOCAL_CACHE_MAX_SIZE: Final[int] = int(environ.get('TYPING_LOCAL_CACHE_MAX_SIZE', 100_000))
+
 REDIS_HOST: Final[str] = environ['REDIS_HOST']
 REDIS_PORT: Final[int] = int(environ['REDIS_PORT'])
 REDIS_URL: Final[str] = f'redis://{REDIS_HOST}:{REDIS_PORT}'
 
+SIGNAL_QUEUE_BATCH_SIZE: Final[int] = int(environ.get('SIGNAL_QUEUE_BATCH_SIZE', 100))
+SIGNAL_QUEUE_BLOCK_TIMEOUT: Final[float] = float(environ.get('SIGNAL_QUEUE_BLOCK_TIMEOUT', 1))  # In seconds.
+SIGNAL_QUEUE_MAX_LENGTH: Final[int] = int(environ.get('SIGNAL_QUEUE_MAX_LENGTH', 10_000))  # Per node queue.
+
 SMTP_HOST: Final[str] = environ['SMTP_HOST']
 SMTP_PORT: Final[int] = int(environ['SMTP_PORT'])
 
@@ -9,6 +9,12 @@ load_dotenv()
 __all__ = (
     'DB_URL',
     'DB_TEST_URL',
+    'DB_ASYNC_URL',
+    'DB_TEST_ASYNC_URL',
+    'DB_POOL_SIZE',
+    'DB_MAX_OVERFLOW',
+    'DB_POOL_RECYCLE',
+    'DB_POOL_PRE_PING',
     'DEFAULT_TRANSACTION_RETRY_MAX_ATTEMPTS'
 )
 
@@ -28,4 +34,15 @@ DB_TEST_URL: URL = DB_URL.set(
     database=environ['DB_TEST_NAME'],
 )
 
+# The same databases through an asyncio driver:
+DB_ASYNC_DRIVERNAME: Final[str] = environ.get('DB_ASYNC_DRIVERNAME', 'mysql+aiomysql')
+DB_ASYNC_URL: URL = DB_URL.set(drivername=DB_ASYNC_DRIVERNAME)
+DB_TEST_ASYNC_URL: URL = DB_TEST_URL.set(drivername=DB_ASYNC_DRIVERNAME)
+
+# Per process, every HTTP worker and the WebSocket server have their own pools:
+DB_POOL_SIZE: Final[int] = int(environ.get('DB_POOL_SIZE', 30))
+DB_MAX_OVERFLOW: Final[int] = int(environ.get('DB_MAX_OVERFLOW', 10))
+DB_POOL_RECYCLE: Final[int] = int(environ.get('DB_POOL_RECYCLE', 3600))  # In seconds, -1 disables it.
+DB_POOL_PRE_PING: Final[bool] = environ.get('DB_POOL_PRE_PING', 'false').lower() == 'true'
+
 DEFAULT_TRANSACTION_RETRY_MAX_ATTEMPTS: Final[int] = int(environ['DEFAULT_TRANSACTION_RETRY_MAX_ATTEMPTS'])
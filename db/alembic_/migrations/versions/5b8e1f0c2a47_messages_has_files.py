@@ -0,0 +1,38 @@
+"""Added 'messages.has_files' field
+
+Revision ID: 5b8e1f0c2a47
+Revises: d1c6cb91f059
+Create Date: 2026-10-18 12:10:41.502113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from config.paths import MEDIA_FOLDER
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8e1f0c2a47'
+down_revision: Union[str, None] = 'd1c6cb91f059'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('messages', sa.Column('has_files', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+    # Storage folders are named by message ids:
+    files_path = MEDIA_FOLDER.joinpath('files')
+    if not files_path.exists():
+        return
+    message_ids: list[int] = [int(path.name) for path in files_path.iterdir() if path.is_dir() and path.name.isdigit()]
+    if not message_ids:
+        return
+
+    messages = sa.table('messages', sa.column('id', sa.Integer()), sa.column('has_files', sa.Boolean()))
+    op.execute(messages.update().where(messages.c.id.in_(message_ids)).values(has_files=True))
+
+
+def downgrade() -> None:
+    op.drop_column('messages', 'has_files')
@@ -0,0 +1,39 @@
+"""Added 'chats.last_message_id' and 'chats.last_activity_at' fields
+
+Revision ID: a3d90c6e7b15
+Revises: 5b8e1f0c2a47
+Create Date: 2026-10-18 13:02:17.884310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d90c6e7b15'
+down_revision: Union[str, None] = '5b8e1f0c2a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('chats', sa.Column('last_message_id', sa.Integer(), nullable=True))
+    op.add_column('chats', sa.Column('last_activity_at', mysql.DATETIME(fsp=6), nullable=True))
+    op.create_index('ix_chats_last_activity_at_id', 'chats', ['last_activity_at', 'id'], unique=False)
+
+    op.execute(
+        'UPDATE chats JOIN ('
+        '    SELECT chat_id, id, creating_datetime, ROW_NUMBER() OVER ('
+        '        PARTITION BY chat_id ORDER BY creating_datetime DESC, id DESC'
+        '    ) AS rn FROM messages'
+        ') AS last_messages ON last_messages.chat_id = chats.id AND last_messages.rn = 1 '
+        'SET chats.last_message_id = last_messages.id, chats.last_activity_at = last_messages.creating_datetime'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_chats_last_activity_at_id', table_name='chats')
+    op.drop_column('chats', 'last_activity_at')
+    op.drop_column('chats', 'last_message_id')
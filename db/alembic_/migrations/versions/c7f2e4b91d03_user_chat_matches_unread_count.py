@@ -0,0 +1,34 @@
+"""Added 'user_chat_matches.unread_count' field
+
+Revision ID: c7f2e4b91d03
+Revises: a3d90c6e7b15
+Create Date: 2026-10-18 14:21:55.317902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7f2e4b91d03'
+down_revision: Union[str, None] = 'a3d90c6e7b15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('user_chat_matches', sa.Column('unread_count', sa.Integer(), server_default='0', nullable=False))
+
+    op.execute(
+        'UPDATE user_chat_matches SET unread_count = ('
+        '    SELECT COUNT(messages.id) FROM messages'
+        '    WHERE messages.chat_id = user_chat_matches.chat_id'
+        '    AND messages.id > user_chat_matches.last_seen_message_id'
+        '    AND messages.user_id != user_chat_matches.user_id'
+        ')'
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('user_chat_matches', 'unread_count')
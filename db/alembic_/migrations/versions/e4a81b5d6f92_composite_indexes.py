@@ -0,0 +1,48 @@
+"""Added composite indexes to 'messages' and 'user_chat_matches'
+
+Revision ID: e4a81b5d6f92
+Revises: c7f2e4b91d03
+Create Date: 2026-10-18 15:07:41.529063
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a81b5d6f92'
+down_revision: Union[str, None] = 'c7f2e4b91d03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_messages_chat_id_id', 'messages', ['chat_id', 'id'], unique=False)
+    op.create_index('ix_messages_chat_id_creating_datetime', 'messages', ['chat_id', 'creating_datetime'],
+                    unique=False)
+    op.create_index('ix_messages_chat_id_is_read_user_id', 'messages', ['chat_id', 'is_read', 'user_id'],
+                    unique=False)
+
+    # Duplicated matches would break the unique key, the oldest match of every pair is kept.
+    op.execute(
+        'DELETE duplicates FROM user_chat_matches AS duplicates '
+        'JOIN user_chat_matches AS originals ON originals.user_id = duplicates.user_id '
+        'AND originals.chat_id = duplicates.chat_id AND originals.id < duplicates.id'
+    )
+    op.create_unique_constraint('uq_user_chat_matches_user_id_chat_id', 'user_chat_matches', ['user_id', 'chat_id'])
+    op.create_index('ix_user_chat_matches_chat_id_user_id', 'user_chat_matches', ['chat_id', 'user_id'],
+                    unique=False)
+
+
+def downgrade() -> None:
+    # MySQL drops implicit indexes of foreign keys once the composite ones cover them,
+    # so they are restored before the composite ones are dropped.
+    op.create_index('ix_messages_chat_id', 'messages', ['chat_id'], unique=False)
+    op.create_index('ix_user_chat_matches_user_id', 'user_chat_matches', ['user_id'], unique=False)
+    op.create_index('ix_user_chat_matches_chat_id', 'user_chat_matches', ['chat_id'], unique=False)
+
+    op.drop_index('ix_user_chat_matches_chat_id_user_id', table_name='user_chat_matches')
+    op.drop_constraint('uq_user_chat_matches_user_id_chat_id', 'user_chat_matches', type_='unique')
+    op.drop_index('ix_messages_chat_id_is_read_user_id', table_name='messages')
+    op.drop_index('ix_messages_chat_id_creating_datetime', table_name='messages')
+    op.drop_index('ix_messages_chat_id_id', table_name='messages')
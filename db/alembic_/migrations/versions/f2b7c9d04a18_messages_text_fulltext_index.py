@@ -0,0 +1,24 @@
+"""Added full-text index to 'messages.text'
+
+Revision ID: f2b7c9d04a18
+Revises: e4a81b5d6f92
+Create Date: 2026-10-18 16:12:03.771840
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b7c9d04a18'
+down_revision: Union[str, None] = 'e4a81b5d6f92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_messages_text_fulltext', 'messages', ['text'], unique=False, mysql_prefix='FULLTEXT')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_messages_text_fulltext', table_name='messages')
@@ -0,0 +1,56 @@
+from time import time
+from typing import Final
+
+from common.resident_app import resident_app
+from common.singleton import SingletonMeta
+from common.ttl_cache import TTLCache
+from config.api import AUTH_LOCAL_CACHE_TTL, AUTH_LOCAL_CACHE_MAX_SIZE
+from db.cache_versions import CacheVersions
+from db.models import AuthToken
+
+__all__ = (
+    'AuthTokenCache',
+)
+
+
+class AuthTokenCache(metaclass=SingletonMeta):
+    # Validity of tokens: in-process tier, then Redis, then DB. Only valid tokens are cached,
+    # no longer than they live, because a revoked token never becomes valid again.
+    _KEY_PREFIX: Final[str] = 'valid_auth_token_'
+
+    def __init__(self) -> None:
+        self._local_cache: TTLCache[str, bool] = TTLCache(AUTH_LOCAL_CACHE_MAX_SIZE, AUTH_LOCAL_CACHE_TTL)
+        self._versions: CacheVersions = CacheVersions()
+
+    def exists(self, value: str, expires_at: float) -> bool:
+        try:
+            return self._local_cache.get(value)
+        except KeyError:
+            pass
+
+        ttl: float = expires_at - time()
+        if ttl <= 0:
+            return False
+
+        if not resident_app.exists(self._key(value)):
+            version: str = self._versions.get(self._key(value))
+            if not AuthToken.exists(value):
+                return False
+            # The token could have been revoked since it was read, then it is valid for this request only:
+            if not self._versions.set_if_not_invalidated(self._key(value), version, 1, ttl):
+                return True
+
+        self._local_cache.set(value, True, ttl)
+        return True
+
+    def invalidate(self, value: str) -> None:
+        self._local_cache.delete(value)
+        self._versions.invalidate([self._key(value)])
+
+    def clear(self) -> None:
+        self._local_cache.clear()
+        for key in resident_app.scan_iter(match=self._KEY_PREFIX + '*'):
+            resident_app.delete(key)
+
+    def _key(self, value: str) -> str:
+        return self._KEY_PREFIX + value
@@ -14,6 +14,7 @@ from sqlalchemy.ext.asyncio import (
 )
 
 from common.singleton import AbstractSingletonMeta
+from config.db import DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_RECYCLE, DB_POOL_PRE_PING
 
 __all__ = (
     'db_sync_builder',
@@ -30,12 +31,25 @@ class AbstractDBBuilder(metaclass=AbstractSingletonMeta):
     def engine(self):
         return self._engine
 
+    @property
+    def is_initialized(self) -> bool:
+        return hasattr(self, '_engine')
+
     @abstractmethod
     def init_session(self, url: URL | str,
                      isolation_level: str | None = _DEFAULT_ISOLATION_LEVEL,
+                     pool_size: int = DB_POOL_SIZE,
+                     max_overflow: int = DB_MAX_OVERFLOW,
+                     pool_recycle: int = DB_POOL_RECYCLE,
+                     pool_pre_ping: bool = DB_POOL_PRE_PING,
                      ) -> None:
         raise NotImplementedError
 
+    @abstractmethod
+    def dispose_after_fork(self) -> None:
+        # Connections inherited from a parent process are dropped without closing, they belong to the parent.
+        raise NotImplementedError
+
 
 class DBSyncBuilder(AbstractDBBuilder):
 
@@ -48,8 +62,19 @@ class DBSyncBuilder(AbstractDBBuilder):
 
     def init_session(self, url: URL | str,
                      isolation_level: str | None = _DEFAULT_ISOLATION_LEVEL,
+                     pool_size: int = DB_POOL_SIZE,
+                     max_overflow: int = DB_MAX_OVERFLOW,
+                     pool_recycle: int = DB_POOL_RECYCLE,
+                     pool_pre_ping: bool = DB_POOL_PRE_PING,
                      ) -> None:
-        self._engine = create_engine(url=url, isolation_level=isolation_level, pool_size=30)
+        self._engine = create_engine(
+            url=url,
+            isolation_level=isolation_level,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_recycle=pool_recycle,
+            pool_pre_ping=pool_pre_ping,
+        )
         self._session = scoped_session(
             sessionmaker(
                 bind=self._engine,
@@ -58,6 +83,9 @@ class DBSyncBuilder(AbstractDBBuilder):
             ),
         )
 
+    def dispose_after_fork(self) -> None:
+        self._engine.dispose(close=False)
+
 
 class DBAsyncBuilder(AbstractDBBuilder):
 
@@ -66,8 +94,19 @@ class DBAsyncBuilder(AbstractDBBuilder):
 
     def init_session(self, url: URL | str,
                      isolation_level: str | None = _DEFAULT_ISOLATION_LEVEL,
+                     pool_size: int = DB_POOL_SIZE,
+                     max_overflow: int = DB_MAX_OVERFLOW,
+                     pool_recycle: int = DB_POOL_RECYCLE,
+                     pool_pre_ping: bool = DB_POOL_PRE_PING,
                      ) -> None:
-        self._engine = create_async_engine(url=url, isolation_level=isolation_level)
+        self._engine = create_async_engine(
+            url=url,
+            isolation_level=isolation_level,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_recycle=pool_recycle,
+            pool_pre_ping=pool_pre_ping,
+        )
         self._session_maker = cast(
             sessionmaker[AsyncSession],
             sessionmaker(
@@ -75,12 +114,17 @@ class DBAsyncBuilder(AbstractDBBuilder):
                 class_=AsyncSession,
                 autocommit=False,
                 autoflush=False,
+                # Expired attributes would be lazy loaded, and it is impossible outside of a greenlet context:
+                expire_on_commit=False,
             ),
         )
 
     def new_session(self) -> AsyncSession:
         return self._session_maker()
 
+    def dispose_after_fork(self) -> None:
+        self._engine.sync_engine.dispose(close=False)
+
 
 db_sync_builder: DBSyncBuilder = DBSyncBuilder()
 db_async_builder: DBAsyncBuilder = DBAsyncBuilder()
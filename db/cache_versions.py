@@ -0,0 +1,83 @@
+from typing import Final
+
+from redis.client import Pipeline
+from redis.commands.core import Script
+
+from common.resident_app import resident_app
+from common.singleton import SingletonMeta
+
+__all__ = (
+    'CacheVersions',
+)
+
+
+class CacheVersions(metaclass=SingletonMeta):
+    # Every cached key has a version which is incremented on its invalidation. A value read from DB
+    # is cached only if the version is still the one taken before the read, so a read which has raced
+    # with a write and its invalidation isn't cached.
+    _KEY_SUFFIX: Final[str] = '_version'
+    _TTL: Final[int] = 60 * 60  # In seconds. Versions have to outlive DB reads only.
+    _SET_IF_NOT_INVALIDATED_SCRIPT: Final[str] = '''
+        if (redis.call('GET', KEYS[2]) or '0') ~= ARGV[1] then
+            return 0
+        end
+        redis.call('SET', KEYS[1], ARGV[2], 'PX', ARGV[3])
+        return 1
+    '''
+    _SADD_IF_NOT_INVALIDATED_SCRIPT: Final[str] = '''
+        if (redis.call('GET', KEYS[2]) or '0') ~= ARGV[1] then
+            return 0
+        end
+        redis.call('SADD', KEYS[1], unpack(ARGV, 3))
+        redis.call('PEXPIRE', KEYS[1], ARGV[2])
+        return 1
+    '''
+
+    def __init__(self) -> None:
+        self._set_if_not_invalidated: Script = resident_app.register_script(self._SET_IF_NOT_INVALIDATED_SCRIPT)
+        self._sadd_if_not_invalidated: Script = resident_app.register_script(self._SADD_IF_NOT_INVALIDATED_SCRIPT)
+
+    def get(self, key: str) -> str:
+        return self.get_many([key])[0]
+
+    def get_many(self, keys: list[str]) -> list[str]:
+        # Must be called before DB is read.
+        return [version or '0' for version in resident_app.mget([self._version_key(key) for key in keys])]
+
+    def set_if_not_invalidated(self, key: str,
+                               version: str,
+                               value: str | int,
+                               ttl: float,
+                               ) -> bool:
+        # `ttl` is in seconds. Returns `False` if the key has been invalidated since `version` was taken.
+        return bool(self._set_if_not_invalidated(
+            keys=[key, self._version_key(key)],
+            args=[version, value, int(ttl * 1000)],
+        ))
+
+    def sadd_if_not_invalidated(self, key: str,
+                                version: str,
+                                members: list[int],
+                                ttl: float,
+                                pipeline: Pipeline | None = None,
+                                ) -> None:
+        # `ttl` is in seconds.
+        self._sadd_if_not_invalidated(
+            keys=[key, self._version_key(key)],
+            args=[version, int(ttl * 1000), *members],
+            client=pipeline,
+        )
+
+    def invalidate(self, keys: list[str]) -> None:
+        # Deletes the keys too.
+        if not keys:
+            return
+        pipeline = resident_app.pipeline()
+        pipeline.delete(*keys)
+        for key in keys:
+            pipeline.incr(self._version_key(key))
+            pipeline.expire(self._version_key(key), self._TTL)
+        pipeline.execute()
+
+    def _version_key(self, key: str) -> str:
+        return key + self._KEY_SUFFIX
@@ -5,6 +5,8 @@ from os import PathLike
 from pathlib import Path
 from typing import Union, Self, Protocol
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
 __all__ = (
     'IBaseModel',
     'IAuthToken',
@@ -32,6 +34,12 @@ class IBaseModel:
     def by_id(cls, id_: int) -> Self:
         raise NotImplementedError
 
+    @classmethod
+    async def async_by_id(cls, session: AsyncSession,
+                          id_: int,
+                          ) -> Self:
+        raise NotImplementedError
+
 
 class IAuthToken(IBaseModel):
 
@@ -91,11 +99,35 @@ class IUser(IBaseModel):
     def by_email(cls, email: str) -> Self:
         raise NotImplementedError
 
+    @classmethod
+    async def async_by_email(cls, session: AsyncSession,
+                             email: str,
+                             ) -> Self:
+        raise NotImplementedError
+
     def chats(self, offset: int | None = None,
               size: int | None = None,
+              before_activity: datetime | None = None,
+              before_chat_id: int | None = None,
               ) -> 'IChatList':
         raise NotImplementedError
 
+    async def async_chats(self, session: AsyncSession,
+                          offset: int | None = None,
+                          size: int | None = None,
+                          before_activity: datetime | None = None,
+                          before_chat_id: int | None = None,
+                          ) -> 'IChatList':
+        raise NotImplementedError
+
+    def search_messages(self, words: list[str],
+                        chat_id: int | None = None,
+                        size: int | None = None,
+                        before_relevance: float | None = None,
+                        before_message_id: int | None = None,
+                        ) -> list[tuple['IMessage', float]]:
+        raise NotImplementedError
+
     def set_info(self, first_name: str | None = None,
                  last_name: str | None = None,
                  ) -> None:
@@ -106,6 +138,8 @@ class IChat(IBaseModel):
 
     _name: str | None
     _is_group: bool
+    _last_message_id: int | None
+    _last_activity_at: datetime | None
 
     _messages: list['IMessage']
     _user_chat_matches: list['IUserChatMatch']
@@ -130,18 +164,54 @@ class IChat(IBaseModel):
                                   ) -> tuple[Self, list['IUserChatMatch']]:
         raise NotImplementedError
 
+    @property
+    def last_message_id(self) -> int | None:
+        raise NotImplementedError
+
+    @property
+    def last_activity_at(self) -> datetime | None:
+        raise NotImplementedError
+
     @property
     def last_message(self) -> 'IMessage':
         raise NotImplementedError
 
+    def set_last_message(self, message: 'IMessage') -> None:
+        raise NotImplementedError
+
+    def update_last_message(self) -> None:
+        raise NotImplementedError
+
+    def add_message(self, text: str,
+                    user: 'IUser',
+                    replied_message: Union['IMessage', None] = None,
+                    ) -> 'IMessage':
+        raise NotImplementedError
+
+    def message_by_id(self, message_id: int) -> 'IMessage':
+        raise NotImplementedError
+
     def messages(self, offset: int | None = None,
                  size: int | None = None,
+                 before_message_id: int | None = None,
                  ) -> 'IMessageList':
         raise NotImplementedError
 
-    def unread_interlocutor_messages_up_to(self, message_id: int,
-                                           user_id_to_ignore: int,
-                                           ) -> 'IMessageList':
+    async def async_messages(self, session: AsyncSession,
+                             offset: int | None = None,
+                             size: int | None = None,
+                             before_message_id: int | None = None,
+                             ) -> 'IMessageList':
+        raise NotImplementedError
+
+    def read_interlocutor_messages_up_to(self, message_id: int,
+                                         user_id: int,
+                                         ) -> dict[int, list[int]]:
+        raise NotImplementedError
+
+    def read_messages_of_user_up_to(self, message_id: int,
+                                    user_id: int,
+                                    ) -> dict[int, list[int]]:
         raise NotImplementedError
 
     def interlocutor_messages_after_count(self, message_id: int,
@@ -152,30 +222,64 @@ class IChat(IBaseModel):
     def users(self) -> 'IUserList':
         raise NotImplementedError
 
+    async def async_users(self, session: AsyncSession) -> 'IUserList':
+        raise NotImplementedError
+
+    def user_ids(self, exclude_ids: list[int] | None = None) -> list[int]:
+        raise NotImplementedError
+
     def check_user_access(self, user_id: int) -> None:
         raise NotImplementedError
 
+    async def async_check_user_access(self, session: AsyncSession,
+                                      user_id: int,
+                                      ) -> None:
+        raise NotImplementedError
+
     def interlocutor_of_user(self, user_id: int) -> 'IUser':
         raise NotImplementedError
 
+    async def async_interlocutor_of_user(self, session: AsyncSession,
+                                         user_id: int,
+                                         ) -> 'IUser':
+        raise NotImplementedError
+
     def all_interlocutors_of_user(self, user_id: int) -> 'IUserList':
         raise NotImplementedError
 
     def unread_count_of_user(self, user_id: int) -> int:
         raise NotImplementedError
 
+    async def async_unread_count_of_user(self, session: AsyncSession,
+                                         user_id: int,
+                                         ) -> int:
+        raise NotImplementedError
+
     def last_seen_message_id_of_user(self, user_id: int) -> int:
         raise NotImplementedError
 
     def set_last_seen_message_id_of_user(self, user_id: int, message_id: int) -> None:
         raise NotImplementedError
 
+    def increment_unread_counts(self, sender_id: int) -> None:
+        raise NotImplementedError
+
+    def decrement_unread_counts(self, deleted_message: 'IMessage') -> None:
+        raise NotImplementedError
+
     @classmethod
     def between_users(cls, first_user_id: int,
                       second_user_id: int,
                       ) -> 'IChat':
         raise NotImplementedError
 
+    @classmethod
+    async def async_between_users(cls, session: AsyncSession,
+                                  first_user_id: int,
+                                  second_user_id: int,
+                                  ) -> 'IChat':
+        raise NotImplementedError
+
 
 class IMessage(IBaseModel):
 
@@ -185,6 +289,7 @@ class IMessage(IBaseModel):
     _text: str
     _creating_datetime: datetime
     _is_read: bool
+    _has_files: bool
 
     _user: 'IUser'
     _chat: 'IChat'
@@ -212,6 +317,10 @@ class IMessage(IBaseModel):
     def is_read(self) -> bool:
         raise NotImplementedError
 
+    @property
+    def has_files(self) -> bool:
+        raise NotImplementedError
+
     @property
     def user(self) -> 'IUser':
         raise NotImplementedError
@@ -232,6 +341,19 @@ class IMessage(IBaseModel):
     def set_replied_message_id(self, replied_message_id: int | None) -> None:
         raise NotImplementedError
 
+    def set_has_files(self, has_files: bool) -> None:
+        raise NotImplementedError
+
+    @classmethod
+    def by_ids(cls, ids: list[int]) -> list[Self]:
+        raise NotImplementedError
+
+    @classmethod
+    async def async_by_ids(cls, session: AsyncSession,
+                           ids: list[int],
+                           ) -> list[Self]:
+        raise NotImplementedError
+
 
 class IMessageStorage:
     _message: 'IMessage'
@@ -282,6 +404,7 @@ class IUserChatMatch(IBaseModel):
     _user_id: int
     _chat_id: int
     _last_seen_message_id: int | None
+    _unread_count: int
 
     _user: 'IUser'
     _chat: 'IChat'
@@ -298,47 +421,169 @@ class IUserChatMatch(IBaseModel):
     def last_seen_message_id(self) -> int:
         raise NotImplementedError
 
+    @property
+    def unread_count(self) -> int:
+        raise NotImplementedError
+
     @classmethod
     def chat_if_user_has_access(cls, user_id: int,
                                 chat_id: int,
                                 ) -> 'IChat':
         raise NotImplementedError
 
+    @classmethod
+    async def async_chat_if_user_has_access(cls, session: AsyncSession,
+                                            user_id: int,
+                                            chat_id: int,
+                                            ) -> 'IChat':
+        raise NotImplementedError
+
     @classmethod
     def users_of_chat(cls, chat_id: int) -> 'IUserList':
         raise NotImplementedError
 
+    @classmethod
+    async def async_users_of_chat(cls, session: AsyncSession,
+                                  chat_id: int,
+                                  ) -> 'IUserList':
+        raise NotImplementedError
+
     @classmethod
     def chats_of_user(cls, user_id: int,
                       offset: int | None = None,
                       size: int | None = None,
+                      before_activity: datetime | None = None,
+                      before_chat_id: int | None = None,
                       ) -> 'IChatList':
         raise NotImplementedError
 
+    @classmethod
+    async def async_chats_of_user(cls, session: AsyncSession,
+                                  user_id: int,
+                                  offset: int | None = None,
+                                  size: int | None = None,
+                                  before_activity: datetime | None = None,
+                                  before_chat_id: int | None = None,
+                                  ) -> 'IChatList':
+        raise NotImplementedError
+
+    @classmethod
+    def search_messages_of_user(cls, user_id: int,
+                                words: list[str],
+                                chat_id: int | None = None,
+                                size: int | None = None,
+                                before_relevance: float | None = None,
+                                before_message_id: int | None = None,
+                                ) -> list[tuple['IMessage', float]]:
+        raise NotImplementedError
+
     @classmethod
     def interlocutor_of_user_of_chat(cls, user_id: int,
                                      chat_id: int,
                                      ) -> 'IUser':
         raise NotImplementedError
 
+    @classmethod
+    async def async_interlocutor_of_user_of_chat(cls, session: AsyncSession,
+                                                 user_id: int,
+                                                 chat_id: int,
+                                                 ) -> 'IUser':
+        raise NotImplementedError
+
     @classmethod
     def private_chat_between_users(cls, first_user_id: int,
                                    second_user_id: int,
                                    ) -> 'IChat':
         raise NotImplementedError
 
+    @classmethod
+    async def async_private_chat_between_users(cls, session: AsyncSession,
+                                               first_user_id: int,
+                                               second_user_id: int,
+                                               ) -> 'IChat':
+        raise NotImplementedError
+
     @classmethod
     def all_interlocutors_of_all_chats_of_user(cls, user_id: int) -> 'IUserList':
         raise NotImplementedError
 
+    @classmethod
+    async def async_all_interlocutors_of_all_chats_of_user(cls, session: AsyncSession,
+                                                           user_id: int,
+                                                           ) -> 'IUserList':
+        raise NotImplementedError
+
+    @classmethod
+    def chat_ids_of_user(cls, user_id: int) -> list[int]:
+        raise NotImplementedError
+
+    @classmethod
+    async def async_chat_ids_of_user(cls, session: AsyncSession,
+                                     user_id: int,
+                                     ) -> list[int]:
+        raise NotImplementedError
+
+    @classmethod
+    def user_ids_of_chats(cls, chat_ids: list[int]) -> dict[int, list[int]]:
+        raise NotImplementedError
+
+    @classmethod
+    async def async_user_ids_of_chats(cls, session: AsyncSession,
+                                      chat_ids: list[int],
+                                      ) -> dict[int, list[int]]:
+        raise NotImplementedError
+
+    @classmethod
+    def unread_counts_of_user(cls, user_id: int,
+                              chat_ids: list[int],
+                              ) -> dict[int, int]:
+        raise NotImplementedError
+
+    @classmethod
+    async def async_unread_counts_of_user(cls, session: AsyncSession,
+                                          user_id: int,
+                                          chat_ids: list[int],
+                                          ) -> dict[int, int]:
+        raise NotImplementedError
+
     @classmethod
     def last_seen_message_id_of_user(cls, user_id: int, chat_id: int) -> int:
         raise NotImplementedError
 
+    @classmethod
+    async def async_last_seen_message_id_of_user(cls, session: AsyncSession,
+                                                 user_id: int,
+                                                 chat_id: int,
+                                                 ) -> int:
+        raise NotImplementedError
+
     @classmethod
     def set_last_seen_message_id_of_user(cls, user_id: int, chat_id: int, message_id: int) -> None:
         raise NotImplementedError
 
+    @classmethod
+    def unread_count_of_user(cls, user_id: int, chat_id: int) -> int:
+        raise NotImplementedError
+
+    @classmethod
+    async def async_unread_count_of_user(cls, session: AsyncSession,
+                                         user_id: int,
+                                         chat_id: int,
+                                         ) -> int:
+        raise NotImplementedError
+
+    @classmethod
+    def increment_unread_counts(cls, chat_id: int, sender_id: int) -> None:
+        raise NotImplementedError
+
+    @classmethod
+    def decrement_unread_counts(cls, chat_id: int, deleted_message: 'IMessage') -> None:
+        raise NotImplementedError
+
+    @classmethod
+    def recompute_unread_counts(cls) -> int:
+        raise NotImplementedError
+
 
 class IBaseList(CustomList[Union['IUser', 'IChat', 'IMessage']]):
 
@@ -353,6 +598,14 @@ class IUserList(IBaseList, CustomList['IUser']):
 class IChatList(IBaseList, CustomList['IChat']):
     _user_id: int
 
+    def user_ids_of_chats(self) -> dict[int, list[int]]:
+        raise NotImplementedError
+
+    def unread_counts(self) -> dict[int, int]:
+        raise NotImplementedError
+
 
 class IMessageList(IBaseList, CustomList['IMessage']):
-    pass
+
+    def load_replied_messages(self) -> None:
+        raise NotImplementedError
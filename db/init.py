@@ -1,10 +1,15 @@
-from config.db import DB_URL
-from db.builders import db_sync_builder
+from config.db import DB_URL, DB_ASYNC_URL
+from db.builders import db_sync_builder, db_async_builder
 
 __all__ = (
     'init_db',
+    'init_async_db',
 )
 
 
 def init_db() -> None:
     db_sync_builder.init_session(DB_URL)
+
+
+def init_async_db() -> None:
+    db_async_builder.init_session(DB_ASYNC_URL)
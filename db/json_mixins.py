@@ -36,18 +36,30 @@ class UserJSONMixin(IJSONMixin, IUser):
         }
 
     def as_json(self):
+        return self._as_json(is_online=OnlineSet().exists(self.id))
+
+    def _as_json(self, is_online: bool):
         return {
             JSONKey.ID: self._id,
             JSONKey.FIRST_NAME: self._first_name,
             JSONKey.LAST_NAME: self._last_name,
-            JSONKey.IS_ONLINE: OnlineSet().exists(self.id),
+            JSONKey.IS_ONLINE: is_online,
         }
 
 
 class ChatJSONMixin(IJSONMixin, IChat):
 
     def as_json(self, user_id: int):
-        user_ids = self.users().ids()
+        return self._as_json(
+            user_id=user_id,
+            user_ids=self.user_ids(),
+            unread_count=self.unread_count_of_user(user_id=user_id),
+        )
+
+    def _as_json(self, user_id: int,
+                 user_ids: list[int],
+                 unread_count: int,
+                 ):
         interlocutor_id = None
         if not self._is_group:
             interlocutor_id = [_user_id for _user_id in user_ids if _user_id != user_id][0]
@@ -58,7 +70,8 @@ class ChatJSONMixin(IJSONMixin, IChat):
             JSONKey.INTERLOCUTOR_ID: interlocutor_id,
             JSONKey.NAME: self._name,
             JSONKey.IS_GROUP: self._is_group,
-            JSONKey.UNREAD_COUNT: self.unread_count_of_user(user_id=user_id),
+            JSONKey.UNREAD_COUNT: unread_count,
+            JSONKey.LAST_ACTIVITY: self._last_activity_at.isoformat() if self._last_activity_at else None,
         }
 
 
@@ -69,7 +82,7 @@ class MessageJSONMixin(IJSONMixin, IMessage):
         if self._replied_message_id:
             replied_message = {
                 JSONKey.ID: self._replied_message.id,
-                JSONKey.USER_ID: self._replied_message.user.id,
+                JSONKey.USER_ID: self._replied_message._user_id,
                 JSONKey.TEXT: self._replied_message.text,
             }
         else:
@@ -81,7 +94,7 @@ class MessageJSONMixin(IJSONMixin, IMessage):
             JSONKey.TEXT: self._text,
             JSONKey.CREATING_DATETIME: self._creating_datetime.isoformat(),
             JSONKey.IS_READ: self._is_read,
-            JSONKey.HAS_FILES: self.get_storage().exists(),
+            JSONKey.HAS_FILES: self._has_files,
             JSONKey.REPLIED_MESSAGE: replied_message,
         }
 
@@ -89,16 +102,29 @@ class MessageJSONMixin(IJSONMixin, IMessage):
 class UserListJSONMixin(IJSONMixin, IUserList, CustomList['UserJSONMixin']):
 
     def as_json(self):
-        raise NotImplementedError
+        # One Redis call for the whole list instead of one per user.
+        statuses: dict[int, bool] = OnlineSet().exists_many(self.ids())
+        return [user._as_json(is_online=statuses[user.id]) for user in self]
 
 
 class ChatListJSONMixin(IJSONMixin, IChatList, CustomList['ChatJSONMixin']):
 
     def as_json(self):
-        return [chat.as_json(self._user_id) for chat in self]
+        # A fixed number of queries for the whole list instead of several ones per chat.
+        user_ids_of_chats: dict[int, list[int]] = self.user_ids_of_chats()
+        unread_counts: dict[int, int] = self.unread_counts()
+        return [
+            chat._as_json(
+                user_id=self._user_id,
+                user_ids=user_ids_of_chats[chat.id],
+                unread_count=unread_counts[chat.id],
+            )
+            for chat in self
+        ]
 
 
 class MessageListJSONMixin(IJSONMixin, IMessageList, CustomList['MessageJSONMixin']):
 
     def as_json(self):
+        self.load_replied_messages()
         return [msg.as_json() for msg in self]
@@ -12,7 +12,6 @@ from db.json_mixins import (
     ChatListJSONMixin,
     MessageListJSONMixin,
 )
-from db.signal_mixins import MessageListSignalMixin
 
 __all__ = (
     'UserList',
@@ -43,13 +42,25 @@ class ChatList(AbstractList, ChatListJSONMixin, IChatList, CustomList['Chat']):
         super().__init__(items)
         self._user_id = user_id
 
+    def user_ids_of_chats(self) -> dict[int, list[int]]:
+        return MembershipCache().user_ids_of_chats(self.ids())
 
-class MessageList(AbstractList, MessageListJSONMixin, MessageListSignalMixin, IMessageList, CustomList['Message']):
-    pass
+    def unread_counts(self) -> dict[int, int]:
+        return UserChatMatch.unread_counts_of_user(self._user_id, self.ids())
+
+
+class MessageList(AbstractList, MessageListJSONMixin, IMessageList, CustomList['Message']):
+
+    def load_replied_messages(self) -> None:
+        # One query puts all of them into the identity map, so `_replied_message` doesn't lazy load one by one.
+        ids: set[int] = {message._replied_message_id for message in self if message._replied_message_id}
+        Message.by_ids(list(ids))
 
 
 from db.models import (  # noqa
     User,
     Chat,
     Message,
+    UserChatMatch,
 )
+from db.membership_cache import MembershipCache  # noqa
@@ -0,0 +1,107 @@
+from typing import Final
+
+from common.resident_app import resident_app
+from common.singleton import SingletonMeta
+from config.api import MEMBERSHIP_CACHE_TTL
+from db.cache_versions import CacheVersions
+
+__all__ = (
+    'MembershipCache',
+)
+
+
+class MembershipCache(metaclass=SingletonMeta):
+    # Redis sets "chat -> member ids" and "user -> chat ids", filled from DB on a miss.
+    # Chats always have members, so an absent key always means a miss.
+    _CHAT_MEMBERS_KEY_PREFIX: Final[str] = 'chat_members_'
+    _USER_CHATS_KEY_PREFIX: Final[str] = 'user_chats_'
+
+    def __init__(self) -> None:
+        self._versions: CacheVersions = CacheVersions()
+
+    def user_ids_of_chat(self, chat_id: int) -> list[int]:
+        return self.user_ids_of_chats([chat_id])[chat_id]
+
+    def user_ids_of_chats(self, chat_ids: list[int]) -> dict[int, list[int]]:
+        pipeline = resident_app.pipeline()
+        for chat_id in chat_ids:
+            pipeline.smembers(self._chat_members_key(chat_id))
+        user_ids_of_chats: dict[int, list[int]] = {
+            chat_id: sorted(int(user_id) for user_id in user_ids)
+            for chat_id, user_ids in zip(chat_ids, pipeline.execute())
+        }
+
+        missed_chat_ids: list[int] = [chat_id for chat_id, user_ids in user_ids_of_chats.items() if not user_ids]
+        if missed_chat_ids:
+            versions: list[str] = self._versions.get_many([
+                self._chat_members_key(chat_id) for chat_id in missed_chat_ids
+            ])
+            loaded: dict[int, list[int]] = UserChatMatch.user_ids_of_chats(missed_chat_ids)
+            self._fill({
+                self._chat_members_key(chat_id): (version, loaded.get(chat_id, []))
+                for chat_id, version in zip(missed_chat_ids, versions)
+            })
+            user_ids_of_chats.update({chat_id: sorted(user_ids) for chat_id, user_ids in loaded.items()})
+
+        return user_ids_of_chats
+
+    def has_member(self, chat_id: int, user_id: int) -> bool:
+        pipeline = resident_app.pipeline()
+        pipeline.exists(self._chat_members_key(chat_id))
+        pipeline.sismember(self._chat_members_key(chat_id), user_id)
+        key_exists, is_member = pipeline.execute()
+        if key_exists:
+            return bool(is_member)
+
+        return user_id in self.user_ids_of_chat(chat_id)
+
+    def chat_ids_of_user(self, user_id: int) -> list[int]:
+        chat_ids: list[int] = [int(chat_id) for chat_id in resident_app.smembers(self._user_chats_key(user_id))]
+        if chat_ids:
+            return sorted(chat_ids)
+
+        version: str = self._versions.get(self._user_chats_key(user_id))
+        chat_ids = UserChatMatch.chat_ids_of_user(user_id)
+        self._fill({self._user_chats_key(user_id): (version, chat_ids)})
+        return chat_ids
+
+    def interlocutor_ids_of_user(self, user_id: int) -> list[int]:
+        # Members of all chats of the user except the user.
+        interlocutor_ids: set[int] = set()
+        for user_ids in self.user_ids_of_chats(self.chat_ids_of_user(user_id)).values():
+            interlocutor_ids.update(user_ids)
+        interlocutor_ids.discard(user_id)
+        return sorted(interlocutor_ids)
+
+    def add_chat(self, chat_id: int, user_ids: list[int]) -> None:
+        # Chat sets of members are just dropped, they will be filled on the next read:
+        self._versions.invalidate([self._user_chats_key(user_id) for user_id in user_ids])
+        # A new chat can't have been read before, so its members are filled unconditionally:
+        self._fill({self._chat_members_key(chat_id): (None, user_ids)})
+
+    def clear(self) -> None:
+        for prefix in (self._CHAT_MEMBERS_KEY_PREFIX, self._USER_CHATS_KEY_PREFIX):
+            for key in resident_app.scan_iter(match=prefix + '*'):
+                resident_app.delete(key)
+
+    def _fill(self, versions_and_ids: dict[str, tuple[str | None, list[int]]]) -> None:
+        # A set is filled only if its version is still the same (`None` means any version).
+        pipeline = resident_app.pipeline()
+        for key, (version, ids) in versions_and_ids.items():
+            if not ids:
+                continue
+            if version is None:
+                pipeline.sadd(key, *ids)
+                pipeline.expire(key, MEMBERSHIP_CACHE_TTL)
+            else:
+                self._versions.sadd_if_not_invalidated(key, version, ids, MEMBERSHIP_CACHE_TTL, pipeline)
+        pipeline.execute()
+
+    def _chat_members_key(self, chat_id: int) -> str:
+        return self._CHAT_MEMBERS_KEY_PREFIX + str(chat_id)
+
+    def _user_chats_key(self, user_id: int) -> str:
+        return self._USER_CHATS_KEY_PREFIX + str(user_id)
+
+
+from db.models import UserChatMatch  # noqa
@@ -8,9 +8,16 @@ from sqlalchemy import (
     Boolean,
     ForeignKey,
     func,
-    Subquery,
+    false,
+    or_,
+    and_,
+    select,
+    Select,
+    Index,
+    UniqueConstraint,
 )
-from sqlalchemy.dialects.mysql import DATETIME
+from sqlalchemy.dialects.mysql import DATETIME, match
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import (
     DeclarativeBase,
     mapped_column,
@@ -69,6 +76,17 @@ class BaseModel(DeclarativeBase, IBaseModel):
 
         return obj
 
+    @classmethod
+    @raises(DBEntityNotFoundException)
+    async def async_by_id(cls, session: AsyncSession,
+                          id_: int,
+                          ) -> Self:
+        obj: Self | None = await session.get(cls, id_)
+        if obj is None:
+            raise DBEntityNotFoundException
+
+        return obj
+
     def __repr__(self) -> str:
         return type(self).__name__ + f'<{self.id}>'
 
@@ -152,10 +170,41 @@ class User(BaseModel, UserJSONMixin, IUser):
 
         return user
 
+    @classmethod
+    @raises(DBEntityNotFoundException)
+    async def async_by_email(cls, session: AsyncSession,
+                             email: str,
+                             ) -> Self:
+        user: Self | None = await session.scalar(select(cls).where(cls._email == email))
+        if user is None:
+            raise DBEntityNotFoundException
+
+        return user
+
     def chats(self, offset: int | None = None,
               size: int | None = None,
+              before_activity: datetime | None = None,
+              before_chat_id: int | None = None,
               ) -> 'ChatList':
-        return UserChatMatch.chats_of_user(self.id, offset, size)
+        return UserChatMatch.chats_of_user(self.id, offset, size, before_activity, before_chat_id)
+
+    async def async_chats(self, session: AsyncSession,
+                          offset: int | None = None,
+                          size: int | None = None,
+                          before_activity: datetime | None = None,
+                          before_chat_id: int | None = None,
+                          ) -> 'ChatList':
+        return await UserChatMatch.async_chats_of_user(session, self.id, offset, size, before_activity, before_chat_id)
+
+    def search_messages(self, words: list[str],
+                        chat_id: int | None = None,
+                        size: int | None = None,
+                        before_relevance: float | None = None,
+                        before_message_id: int | None = None,
+                        ) -> list[tuple['Message', float]]:
+        return UserChatMatch.search_messages_of_user(
+            self.id, words, chat_id, size, before_relevance, before_message_id,
+        )
 
     def set_info(self, first_name: str | None = None,
                  last_name: str | None = None,
@@ -168,13 +217,21 @@ class User(BaseModel, UserJSONMixin, IUser):
 
 class Chat(BaseModel, ChatJSONMixin, ChatSignalMixin, IChat):
     __tablename__ = 'chats'
+    __table_args__ = (
+        Index('ix_chats_last_activity_at_id', 'last_activity_at', 'id'),
+    )
 
     _name: Mapped[str | None] = mapped_column(String(100), name='name', nullable=True)
     _is_group: Mapped[bool] = mapped_column(Boolean, name='is_group', nullable=False, default=False)
+    # Denormalized pointer to the last message, so chats can be sorted without scanning messages.
+    # It isn't a foreign key to avoid a circular dependency between `chats` and `messages`.
+    _last_message_id: Mapped[int | None] = mapped_column(Integer, name='last_message_id', nullable=True)
+    _last_activity_at: Mapped[datetime | None] = mapped_column(DATETIME(fsp=6), name='last_activity_at',
+                                                               nullable=True)
 
     _messages: Mapped[list['Message']] = relationship(
         back_populates='_chat',
-        order_by='-Message._creating_datetime',
+        order_by='Message._creating_datetime.desc()',
         cascade='all, delete',
         lazy='dynamic',
     )
@@ -213,28 +270,125 @@ class Chat(BaseModel, ChatJSONMixin, ChatSignalMixin, IChat):
     def is_group(self) -> bool:
         return self._is_group
 
+    @property
+    def last_message_id(self) -> int | None:
+        return self._last_message_id
+
+    @property
+    def last_activity_at(self) -> datetime | None:
+        return self._last_activity_at
+
     @property
     @raises(IndexError)
     def last_message(self) -> 'Message':
         return cast(Message, self._messages[0])
 
+    def set_last_message(self, message: 'Message') -> None:
+        # The message must be flushed already.
+        self._last_message_id = cast(Mapped[int], message.id)
+        self._last_activity_at = cast(Mapped[datetime], message.creating_datetime)
+
+    def update_last_message(self) -> None:
+        try:
+            self.set_last_message(self.last_message)
+        except IndexError:
+            self._last_message_id = None
+            self._last_activity_at = None
+
+    def add_message(self, text: str,
+                    user: 'User',
+                    replied_message: Union['Message', None] = None,
+                    ) -> 'Message':
+        # Shared by HTTP and WebSocket. The message is flushed, the caller commits.
+        message: Message = Message.create(
+            text=text,
+            user=user,
+            chat=self,
+            replied_message=replied_message,
+        )
+        db_sync_builder.session.add(message)
+        db_sync_builder.session.flush()
+        self.set_last_message(message)
+        self.increment_unread_counts(user.id)
+        return message
+
+    @raises(DBEntityNotFoundException, DBEntityIsForbiddenException)
+    def message_by_id(self, message_id: int) -> 'Message':
+        message: Message = Message.by_id(message_id)
+        if message.chat.id != self.id:
+            raise DBEntityIsForbiddenException
+        return message
+
     def messages(self, offset: int | None = None,
                  size: int | None = None,
+                 before_message_id: int | None = None,
                  ) -> 'MessageList':
+        query: Query[Message] = cast(Query[Message], self._messages)
+        if before_message_id is not None:
+            # Keyset page: ids grow in the same order as creating datetimes, so it is an index seek.
+            query = query.filter(
+                Message._id < before_message_id,  # noqa
+            ).order_by(None).order_by(
+                Message._id.desc(),  # noqa
+            )
+
         return MessageList(
-            cast(Query[Message], self._messages).limit(size).offset(offset).all(),
+            query.limit(size).offset(offset).all(),
         )
 
-    def unread_interlocutor_messages_up_to(self, message_id: int,
-                                           user_id: int,
-                                           ) -> 'MessageList':
+    async def async_messages(self, session: AsyncSession,
+                             offset: int | None = None,
+                             size: int | None = None,
+                             before_message_id: int | None = None,
+                             ) -> 'MessageList':
+        # Dynamic relationships can't be awaited, so the same query is built explicitly.
+        statement: Select = select(Message).where(Message._chat_id == self.id)  # noqa
+        if before_message_id is None:
+            statement = statement.order_by(Message._creating_datetime.desc())  # noqa
+        else:
+            statement = statement.where(
+                Message._id < before_message_id,  # noqa
+            ).order_by(
+                Message._id.desc(),  # noqa
+            )
+
         return MessageList(
-            cast(Query[Message], self._messages).filter(
-                Message._id <= message_id,  # noqa
-                Message._is_read == False,  # noqa
-                Message._user_id != user_id,  # noqa
-            ).all(),
+            list(await session.scalars(statement.limit(size).offset(offset))),
+        )
+
+    def read_interlocutor_messages_up_to(self, message_id: int,
+                                         user_id: int,
+                                         ) -> dict[int, list[int]]:
+        # Marks messages by one UPDATE without loading them.
+        # Returns ids of the marked messages grouped by their senders, the newest ones first.
+        filters = (
+            Message._chat_id == self.id,  # noqa
+            Message._id <= message_id,  # noqa
+            Message._is_read == False,  # noqa
+            Message._user_id != user_id,  # noqa
         )
+        rows = db_sync_builder.session.query(Message._id, Message._user_id).filter(  # noqa
+            *filters,
+        ).order_by(
+            Message._id.desc(),  # noqa
+        ).all()
+        if not rows:
+            return {}
+
+        db_sync_builder.session.query(Message).filter(*filters).update({Message._is_read: True})
+
+        sender_message_ids: dict[int, list[int]] = {}
+        for id_, sender_id in rows:
+            sender_message_ids.setdefault(sender_id, []).append(id_)
+        return sender_message_ids
+
+    def read_messages_of_user_up_to(self, message_id: int,
+                                    user_id: int,
+                                    ) -> dict[int, list[int]]:
+        # Shared by HTTP and WebSocket, the caller commits. Returns the same as `read_interlocutor_messages_up_to`.
+        sender_message_ids: dict[int, list[int]] = self.read_interlocutor_messages_up_to(message_id, user_id)
+        self.set_last_seen_message_id_of_user(user_id, message_id)
+        return sender_message_ids
 
     def interlocutor_messages_after_count(self, message_id: int,
                                           user_id: int,
@@ -247,22 +401,50 @@ class Chat(BaseModel, ChatJSONMixin, ChatSignalMixin, IChat):
     def users(self) -> 'UserList':
         return UserList(UserChatMatch.users_of_chat(self.id))
 
+    async def async_users(self, session: AsyncSession) -> 'UserList':
+        return await UserChatMatch.async_users_of_chat(session, self.id)
+
+    def user_ids(self, exclude_ids: list[int] | None = None) -> list[int]:
+        # Cached, unlike `users`.
+        if exclude_ids is None:
+            exclude_ids = []
+        return [user_id for user_id in MembershipCache().user_ids_of_chat(self.id) if user_id not in exclude_ids]
+
     @raises(DBEntityIsForbiddenException)
     def check_user_access(self, user_id: int) -> None:
-        UserChatMatch.chat_if_user_has_access(user_id, self.id)
+        if not MembershipCache().has_member(self.id, user_id):
+            raise DBEntityIsForbiddenException
+
+    @raises(DBEntityIsForbiddenException)
+    async def async_check_user_access(self, session: AsyncSession,
+                                      user_id: int,
+                                      ) -> None:
+        # Goes to DB, unlike `check_user_access` which is served by the sync Redis client.
+        await UserChatMatch.async_chat_if_user_has_access(session, user_id, self.id)
 
     @raises(DBEntityNotFoundException)
     def interlocutor_of_user(self, user_id: int) -> 'User':
         return UserChatMatch.interlocutor_of_user_of_chat(user_id, self.id)
 
+    @raises(DBEntityNotFoundException)
+    async def async_interlocutor_of_user(self, session: AsyncSession,
+                                         user_id: int,
+                                         ) -> 'User':
+        return await UserChatMatch.async_interlocutor_of_user_of_chat(session, user_id, self.id)
+
     def all_interlocutors_of_user(self, user_id: int) -> 'UserList':
         users: UserList = self.users()
         return UserList([user for user in users if user.id != user_id])
 
     @raises(DBEntityNotFoundException)
     def unread_count_of_user(self, user_id: int) -> int:
-        last_seen_message_id: int = self.last_seen_message_id_of_user(user_id)
-        return self.interlocutor_messages_after_count(last_seen_message_id, user_id)
+        return UserChatMatch.unread_count_of_user(user_id, self.id)
+
+    @raises(DBEntityNotFoundException)
+    async def async_unread_count_of_user(self, session: AsyncSession,
+                                         user_id: int,
+                                         ) -> int:
+        return await UserChatMatch.async_unread_count_of_user(session, user_id, self.id)
 
     @raises(DBEntityNotFoundException)
     def last_seen_message_id_of_user(self, user_id: int) -> int:
@@ -272,6 +454,12 @@ class Chat(BaseModel, ChatJSONMixin, ChatSignalMixin, IChat):
     def set_last_seen_message_id_of_user(self, user_id: int, message_id: int) -> None:
         UserChatMatch.set_last_seen_message_id_of_user(user_id, self.id, message_id)
 
+    def increment_unread_counts(self, sender_id: int) -> None:
+        UserChatMatch.increment_unread_counts(self.id, sender_id)
+
+    def decrement_unread_counts(self, deleted_message: 'Message') -> None:
+        UserChatMatch.decrement_unread_counts(self.id, deleted_message)
+
     @classmethod
     @raises(DBEntityNotFoundException)
     def between_users(cls, first_user_id: int,
@@ -279,9 +467,23 @@ class Chat(BaseModel, ChatJSONMixin, ChatSignalMixin, IChat):
                       ) -> Self:
         return UserChatMatch.private_chat_between_users(first_user_id, second_user_id)
 
+    @classmethod
+    @raises(DBEntityNotFoundException)
+    async def async_between_users(cls, session: AsyncSession,
+                                  first_user_id: int,
+                                  second_user_id: int,
+                                  ) -> Self:
+        return await UserChatMatch.async_private_chat_between_users(session, first_user_id, second_user_id)
+
 
 class Message(BaseModel, MessageJSONMixin, MessageSignalMixin, IMessage):
     __tablename__ = 'messages'
+    __table_args__ = (
+        Index('ix_messages_chat_id_id', 'chat_id', 'id'),
+        Index('ix_messages_chat_id_creating_datetime', 'chat_id', 'creating_datetime'),
+        Index('ix_messages_chat_id_is_read_user_id', 'chat_id', 'is_read', 'user_id'),
+        Index('ix_messages_text_fulltext', 'text', mysql_prefix='FULLTEXT'),
+    )
 
     _user_id: Mapped[int] = mapped_column(ForeignKey('users.id', ondelete='CASCADE'), name='user_id', nullable=False)
     _chat_id: Mapped[int] = mapped_column(ForeignKey('chats.id', ondelete='CASCADE'), name='chat_id', nullable=False)
@@ -290,6 +492,9 @@ class Message(BaseModel, MessageJSONMixin, MessageSignalMixin, IMessage):
     _creating_datetime: Mapped[datetime] = mapped_column(DATETIME(fsp=6), name='creating_datetime',
                                                          default=datetime.utcnow)
     _is_read: Mapped[bool] = mapped_column(Boolean, name='is_read', default=False)
+    # Mirrors existence of the storage folder, so serialization doesn't touch the filesystem.
+    _has_files: Mapped[bool] = mapped_column(Boolean, name='has_files', nullable=False, default=False,
+                                             server_default=false())
 
     _user: Mapped['User'] = relationship(
         back_populates='_messages',
@@ -329,6 +534,10 @@ class Message(BaseModel, MessageJSONMixin, MessageSignalMixin, IMessage):
     def is_read(self) -> bool:
         return self._is_read
 
+    @property
+    def has_files(self) -> bool:
+        return self._has_files
+
     @property
     def user(self) -> User:
         return self._user
@@ -351,14 +560,39 @@ class Message(BaseModel, MessageJSONMixin, MessageSignalMixin, IMessage):
     def set_replied_message_id(self, replied_message_id: int | None) -> None:
         self._replied_message_id = cast(Mapped[int], replied_message_id)
 
+    def set_has_files(self, has_files: bool) -> None:
+        self._has_files = cast(Mapped[bool], has_files)
+
+    @classmethod
+    def by_ids(cls, ids: list[int]) -> list[Self]:
+        if not ids:
+            return []
+        return cast(list[Self], db_sync_builder.session.query(cls).filter(cls._id.in_(ids)).all())
+
+    @classmethod
+    async def async_by_ids(cls, session: AsyncSession,
+                           ids: list[int],
+                           ) -> list[Self]:
+        if not ids:
+            return []
+        return list(await session.scalars(select(cls).where(cls._id.in_(ids))))
+
 
 class UserChatMatch(BaseModel, IUserChatMatch):
     __tablename__ = 'user_chat_matches'
+    __table_args__ = (
+        UniqueConstraint('user_id', 'chat_id', name='uq_user_chat_matches_user_id_chat_id'),
+        Index('ix_user_chat_matches_chat_id_user_id', 'chat_id', 'user_id'),
+    )
 
     _user_id: Mapped[int] = mapped_column(ForeignKey('users.id', ondelete='CASCADE'), name='user_id', nullable=False)
     _chat_id: Mapped[int] = mapped_column(ForeignKey('chats.id', ondelete='CASCADE'), name='chat_id', nullable=False)
     # This is not full-mapped message ID, this is rather a position of user reading.
     _last_seen_message_id: Mapped[int] = mapped_column(Integer, name='last_seen_message_id', default=-1)
+    # Count of interlocutor messages after `_last_seen_message_id`, it is maintained incrementally.
+    # See `db.unread_counts_repair` to recompute it from history.
+    _unread_count: Mapped[int] = mapped_column(Integer, name='unread_count', nullable=False, default=0,
+                                               server_default='0')
 
     _user: Mapped['User'] = relationship(
         back_populates='_user_chats_matches',
@@ -381,6 +615,10 @@ class UserChatMatch(BaseModel, IUserChatMatch):
     def last_seen_message_id(self) -> int:
         return self._last_seen_message_id
 
+    @property
+    def unread_count(self) -> int:
+        return self._unread_count
+
     @classmethod
     @raises(DBEntityIsForbiddenException)
     def chat_if_user_has_access(cls, user_id: int,
@@ -394,6 +632,25 @@ class UserChatMatch(BaseModel, IUserChatMatch):
 
         return match.chat
 
+    @classmethod
+    @raises(DBEntityIsForbiddenException)
+    async def async_chat_if_user_has_access(cls, session: AsyncSession,
+                                            user_id: int,
+                                            chat_id: int,
+                                            ) -> 'Chat':
+        chat: Chat | None = await session.scalar(
+            select(Chat).join(
+                cls, cls._chat_id == Chat._id,
+            ).where(
+                cls._user_id == user_id,
+                cls._chat_id == chat_id,
+            ),
+        )
+        if chat is None:
+            raise DBEntityIsForbiddenException
+
+        return chat
+
     @classmethod
     def users_of_chat(cls, chat_id: int) -> 'UserList':
         query: Query[cls] = db_sync_builder.session.query(
@@ -408,37 +665,201 @@ class UserChatMatch(BaseModel, IUserChatMatch):
             cast(list[User], query.all()),
         )
 
+    @classmethod
+    async def async_users_of_chat(cls, session: AsyncSession,
+                                  chat_id: int,
+                                  ) -> 'UserList':
+        return UserList(
+            list(await session.scalars(
+                select(User).join(
+                    cls, cls._user_id == User._id,
+                ).where(
+                    cls._chat_id == chat_id,
+                ),
+            )),
+        )
+
+    @classmethod
+    def chat_ids_of_user(cls, user_id: int) -> list[int]:
+        rows = db_sync_builder.session.query(cls._chat_id).filter(cls._user_id == user_id).order_by(cls._chat_id).all()
+        return [row[0] for row in rows]
+
+    @classmethod
+    async def async_chat_ids_of_user(cls, session: AsyncSession,
+                                     user_id: int,
+                                     ) -> list[int]:
+        return list(await session.scalars(
+            select(cls._chat_id).where(cls._user_id == user_id).order_by(cls._chat_id),
+        ))
+
+    @classmethod
+    def user_ids_of_chats(cls, chat_ids: list[int]) -> dict[int, list[int]]:
+        user_ids_of_chats: dict[int, list[int]] = {chat_id: [] for chat_id in chat_ids}
+        if not chat_ids:
+            return user_ids_of_chats
+
+        rows = db_sync_builder.session.query(cls._chat_id, cls._user_id).filter(
+            cls._chat_id.in_(chat_ids),
+        ).order_by(cls._id).all()
+        for chat_id, user_id in rows:
+            user_ids_of_chats[chat_id].append(user_id)
+
+        return user_ids_of_chats
+
+    @classmethod
+    async def async_user_ids_of_chats(cls, session: AsyncSession,
+                                      chat_ids: list[int],
+                                      ) -> dict[int, list[int]]:
+        user_ids_of_chats: dict[int, list[int]] = {chat_id: [] for chat_id in chat_ids}
+        if not chat_ids:
+            return user_ids_of_chats
+
+        rows = await session.execute(
+            select(cls._chat_id, cls._user_id).where(cls._chat_id.in_(chat_ids)).order_by(cls._id),
+        )
+        for chat_id, user_id in rows:
+            user_ids_of_chats[chat_id].append(user_id)
+
+        return user_ids_of_chats
+
+    @classmethod
+    def unread_counts_of_user(cls, user_id: int,
+                              chat_ids: list[int],
+                              ) -> dict[int, int]:
+        unread_counts: dict[int, int] = {chat_id: 0 for chat_id in chat_ids}
+        if not chat_ids:
+            return unread_counts
+
+        rows = db_sync_builder.session.query(cls._chat_id, cls._unread_count).filter(
+            cls._user_id == user_id,
+            cls._chat_id.in_(chat_ids),
+        ).all()
+        for chat_id, unread_count in rows:
+            unread_counts[chat_id] = unread_count
+
+        return unread_counts
+
+    @classmethod
+    async def async_unread_counts_of_user(cls, session: AsyncSession,
+                                          user_id: int,
+                                          chat_ids: list[int],
+                                          ) -> dict[int, int]:
+        unread_counts: dict[int, int] = {chat_id: 0 for chat_id in chat_ids}
+        if not chat_ids:
+            return unread_counts
+
+        rows = await session.execute(
+            select(cls._chat_id, cls._unread_count).where(
+                cls._user_id == user_id,
+                cls._chat_id.in_(chat_ids),
+            ),
+        )
+        for chat_id, unread_count in rows:
+            unread_counts[chat_id] = unread_count
+
+        return unread_counts
+
     @classmethod
     def chats_of_user(cls, user_id: int,
                       offset: int | None = None,
                       size: int | None = None,
+                      before_activity: datetime | None = None,
+                      before_chat_id: int | None = None,
                       ) -> 'ChatList':
-        subquery: Subquery = db_sync_builder.session.query(
-            cls._chat_id,
-            Message._creating_datetime,  # noqa
-            func.row_number().over(
-                partition_by=cls._chat_id,
-                order_by=Message._creating_datetime.desc(),  # noqa
-            ).label('rn'),
-        ).outerjoin(
-            Message, cls._chat_id == Message._chat_id,  # noqa
-        ).filter(
-            cls._user_id == user_id,
-        ).subquery()
-
-        query: Query[Chat] = db_sync_builder.session.query(subquery).join(
-            Chat, Chat._id == subquery.c._chat_id,  # noqa
-        ).filter(
-            subquery.c.rn == 1,
-        ).order_by(
-            subquery.c._creating_datetime.desc(),  # noqa
-        ).with_entities(Chat)
+        return ChatList(
+            list(db_sync_builder.session.scalars(
+                cls._chats_of_user_statement(user_id, offset, size, before_activity, before_chat_id),
+            )),
+            user_id,
+        )
 
+    @classmethod
+    async def async_chats_of_user(cls, session: AsyncSession,
+                                  user_id: int,
+                                  offset: int | None = None,
+                                  size: int | None = None,
+                                  before_activity: datetime | None = None,
+                                  before_chat_id: int | None = None,
+                                  ) -> 'ChatList':
         return ChatList(
-            cast(list[Chat], query.limit(size).offset(offset).all()),
+            list(await session.scalars(
+                cls._chats_of_user_statement(user_id, offset, size, before_activity, before_chat_id),
+            )),
             user_id,
         )
 
+    @classmethod
+    def _chats_of_user_statement(cls, user_id: int,
+                                 offset: int | None = None,
+                                 size: int | None = None,
+                                 before_activity: datetime | None = None,
+                                 before_chat_id: int | None = None,
+                                 ) -> Select:
+        # Shared by the sync and the async versions.
+        statement: Select = select(Chat).join(
+            cls, cls._chat_id == Chat._id,
+        ).where(
+            cls._user_id == user_id,
+        )
+
+        # Keyset page, it continues the order below right after the given chat:
+        if before_activity is not None:
+            conditions: list = [
+                Chat._last_activity_at < before_activity,
+                Chat._last_activity_at.is_(None),
+            ]
+            if before_chat_id is not None:
+                conditions.append(and_(Chat._last_activity_at == before_activity, Chat._id < before_chat_id))
+            statement = statement.where(or_(*conditions))
+        elif before_chat_id is not None:
+            # The given chat is one of chats without messages.
+            statement = statement.where(
+                Chat._last_activity_at.is_(None),
+                Chat._id < before_chat_id,
+            )
+
+        return statement.order_by(
+            Chat._last_activity_at.desc(),  # Chats without messages are the last ones.
+            Chat._id.desc(),
+        ).limit(size).offset(offset)
+
+    @classmethod
+    def search_messages_of_user(cls, user_id: int,
+                                words: list[str],
+                                chat_id: int | None = None,
+                                size: int | None = None,
+                                before_relevance: float | None = None,
+                                before_message_id: int | None = None,
+                                ) -> list[tuple['Message', float]]:
+        # Every word is required and matched as a prefix. Only chats of the user are searched.
+        # Results are sorted by relevance, the newest messages go first among equally relevant ones.
+        against: str = ' '.join(f'+{word}*' for word in words)
+        matching = match(Message._text, against=against).in_boolean_mode()  # noqa
+        # Rounded, so the value sent to a client compares equal to itself when it comes back as a cursor.
+        relevance = func.round(matching, 6)
+
+        query: Query = db_sync_builder.session.query(Message, relevance).join(
+            cls, and_(cls._chat_id == Message._chat_id, cls._user_id == user_id),  # noqa
+        ).filter(
+            matching,
+        )
+        if chat_id is not None:
+            query = query.filter(Message._chat_id == chat_id)  # noqa
+
+        # Keyset page, it continues the order below right after the given message:
+        if before_relevance is not None and before_message_id is not None:
+            query = query.filter(or_(
+                relevance < before_relevance,
+                and_(relevance == before_relevance, Message._id < before_message_id),  # noqa
+            ))
+
+        query = query.order_by(
+            relevance.desc(),
+            Message._id.desc(),  # noqa
+        )
+
+        return [(message, float(message_relevance)) for message, message_relevance in query.limit(size).all()]
+
     @classmethod
     @raises(DBEntityNotFoundException)
     def interlocutor_of_user_of_chat(cls, user_id: int,
@@ -453,6 +874,25 @@ class UserChatMatch(BaseModel, IUserChatMatch):
 
         return interlocutor_match.user
 
+    @classmethod
+    @raises(DBEntityNotFoundException)
+    async def async_interlocutor_of_user_of_chat(cls, session: AsyncSession,
+                                                 user_id: int,
+                                                 chat_id: int,
+                                                 ) -> 'User':
+        interlocutor: User | None = await session.scalar(
+            select(User).join(
+                cls, cls._user_id == User._id,
+            ).where(
+                cls._user_id != user_id,
+                cls._chat_id == chat_id,
+            ).limit(1),
+        )
+        if interlocutor is None:
+            raise DBEntityNotFoundException
+
+        return interlocutor
+
     @classmethod
     @raises(DBEntityNotFoundException)
     def private_chat_between_users(cls, first_user_id: int,
@@ -478,6 +918,30 @@ class UserChatMatch(BaseModel, IUserChatMatch):
 
         return chat
 
+    @classmethod
+    @raises(DBEntityNotFoundException)
+    async def async_private_chat_between_users(cls, session: AsyncSession,
+                                               first_user_id: int,
+                                               second_user_id: int,
+                                               ) -> 'Chat':
+        chat: Chat | None = await session.scalar(
+            select(Chat).join(
+                cls, cls._chat_id == Chat._id,
+            ).where(
+                Chat._is_group == False,  # noqa
+                cls._user_id.in_([
+                    first_user_id,
+                    second_user_id,
+                ]),
+            ).group_by(Chat._id).having(
+                func.count(cls._user_id) == 2,
+            ).limit(1),
+        )
+        if chat is None:
+            raise DBEntityNotFoundException
+
+        return chat
+
     @classmethod
     def all_interlocutors_of_all_chats_of_user(cls, user_id: int) -> 'UserList':
         chat_ids: list[int] = cast(
@@ -497,6 +961,22 @@ class UserChatMatch(BaseModel, IUserChatMatch):
             cast(list[User], query.all()),
         )
 
+    @classmethod
+    async def async_all_interlocutors_of_all_chats_of_user(cls, session: AsyncSession,
+                                                           user_id: int,
+                                                           ) -> 'UserList':
+        chat_ids = select(cls._chat_id).where(cls._user_id == user_id).scalar_subquery()
+        return UserList(
+            list(await session.scalars(
+                select(User).join(
+                    cls, cls._user_id == User._id,
+                ).where(
+                    cls._user_id != user_id,
+                    cls._chat_id.in_(chat_ids),
+                ),
+            )),
+        )
+
     @classmethod
     @raises(DBEntityNotFoundException)
     def last_seen_message_id_of_user(cls, user_id: int, chat_id: int) -> int:
@@ -509,6 +989,23 @@ class UserChatMatch(BaseModel, IUserChatMatch):
 
         return match._last_seen_message_id
 
+    @classmethod
+    @raises(DBEntityNotFoundException)
+    async def async_last_seen_message_id_of_user(cls, session: AsyncSession,
+                                                 user_id: int,
+                                                 chat_id: int,
+                                                 ) -> int:
+        last_seen_message_id: int | None = await session.scalar(
+            select(cls._last_seen_message_id).where(
+                cls._user_id == user_id,
+                cls._chat_id == chat_id,
+            ),
+        )
+        if last_seen_message_id is None:
+            raise DBEntityNotFoundException
+
+        return last_seen_message_id
+
     @classmethod
     @raises(DBEntityNotFoundException)
     def set_last_seen_message_id_of_user(cls, user_id: int, chat_id: int, message_id: int) -> None:
@@ -523,6 +1020,66 @@ class UserChatMatch(BaseModel, IUserChatMatch):
         if message.chat.id != chat_id:
             raise DBEntityNotFoundException
         match._last_seen_message_id = message_id
+        match._unread_count = message.chat.interlocutor_messages_after_count(message_id, user_id)
+
+    @classmethod
+    @raises(DBEntityNotFoundException)
+    def unread_count_of_user(cls, user_id: int, chat_id: int) -> int:
+        unread_count: int | None = db_sync_builder.session.query(cls._unread_count).filter(
+            cls._user_id == user_id,
+            cls._chat_id == chat_id,
+        ).scalar()
+        if unread_count is None:
+            raise DBEntityNotFoundException
+
+        return unread_count
+
+    @classmethod
+    @raises(DBEntityNotFoundException)
+    async def async_unread_count_of_user(cls, session: AsyncSession,
+                                         user_id: int,
+                                         chat_id: int,
+                                         ) -> int:
+        unread_count: int | None = await session.scalar(
+            select(cls._unread_count).where(
+                cls._user_id == user_id,
+                cls._chat_id == chat_id,
+            ),
+        )
+        if unread_count is None:
+            raise DBEntityNotFoundException
+
+        return unread_count
+
+    @classmethod
+    def increment_unread_counts(cls, chat_id: int, sender_id: int) -> None:
+        db_sync_builder.session.query(cls).filter(
+            cls._chat_id == chat_id,
+            cls._user_id != sender_id,
+        ).update({cls._unread_count: cls._unread_count + 1})
+
+    @classmethod
+    def decrement_unread_counts(cls, chat_id: int, deleted_message: 'Message') -> None:
+        # Only for users who hadn't seen the message yet.
+        db_sync_builder.session.query(cls).filter(
+            cls._chat_id == chat_id,
+            cls._user_id != deleted_message._user_id,
+            cls._last_seen_message_id < deleted_message.id,
+            cls._unread_count > 0,
+        ).update({cls._unread_count: cls._unread_count - 1})
+
+    @classmethod
+    def recompute_unread_counts(cls) -> int:
+        # Returns count of updated rows.
+        count_subquery = select(func.count(Message._id)).where(  # noqa
+            Message._chat_id == cls._chat_id,  # noqa
+            Message._id > cls._last_seen_message_id,  # noqa
+            Message._user_id != cls._user_id,  # noqa
+        ).scalar_subquery()
+        return db_sync_builder.session.query(cls).update(
+            {cls._unread_count: count_subquery},
+            synchronize_session=False,
+        )
 
 
 from db.lists import (  # noqa
@@ -531,3 +1088,4 @@ from db.lists import (  # noqa
     MessageList,
 )
 from db.message_storage import MessageStorage  # noqa
+from db.membership_cache import MembershipCache  # noqa
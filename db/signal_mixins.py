@@ -4,13 +4,11 @@ from common.signals.signal_types import SignalType
 from db.i import (
     IChat,
     IMessage,
-    IMessageList,
 )
 
 __all__ = (
     'ChatSignalMixin',
     'MessageSignalMixin',
-    'MessageListSignalMixin',
 )
 
 
@@ -29,12 +27,27 @@ class ChatSignalMixin(IChat):
             JSONKey.USER_ID: user_id,
         }
 
+    @signal_decorator(SignalType.READ)
+    def signal_read(self, message_ids: list[int]):
+        return {
+            JSONKey.CHAT_ID: self.id,
+            JSONKey.MESSAGE_IDS: message_ids,
+        }
+
     @signal_decorator(SignalType.NEW_UNREAD_COUNT)
     def signal_new_unread_count(self):
         return {
             JSONKey.CHAT_ID: self.id,
         }
 
+    def signal_read_by_user(self, sender_message_ids: dict[int, list[int]],
+                            user_id: int,
+                            ) -> None:
+        # Every sender gets ids of its messages only, the reader gets its new unread count.
+        for sender_id, message_ids in sender_message_ids.items():
+            self.signal_read([sender_id], message_ids=message_ids)
+        self.signal_new_unread_count([user_id])
+
 
 class MessageSignalMixin(IMessage):
 
@@ -65,13 +78,3 @@ class MessageSignalMixin(IMessage):
             JSONKey.CHAT_ID: self.chat.id,
             JSONKey.MESSAGE_ID: self.id,
         }
-
-
-class MessageListSignalMixin(IMessageList):
-
-    @signal_decorator(SignalType.READ)
-    def signal_read(self):
-        return {
-            JSONKey.CHAT_ID: self[0].chat.id,
-            JSONKey.MESSAGE_IDS: self.ids(),
-        }
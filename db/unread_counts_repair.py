@@ -0,0 +1,19 @@
+from db.builders import db_sync_builder
+from db.init import init_db
+from db.models import UserChatMatch
+
+__all__ = (
+    'repair_unread_counts',
+)
+
+
+def repair_unread_counts() -> int:
+    # Recomputes all stored unread counts from history. Returns count of updated rows.
+    updated_count: int = UserChatMatch.recompute_unread_counts()
+    db_sync_builder.session.commit()
+    return updated_count
+
+
+if __name__ == '__main__':
+    init_db()
+    print(f'Unread counts were recomputed, updated rows: {repair_unread_counts()}.')
@@ -0,0 +1,70 @@
+import json
+from typing import Final, Any
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from common.hinting import raises
+from common.resident_app import resident_app
+from common.singleton import SingletonMeta
+from common.ttl_cache import TTLCache
+from config.api import AUTH_LOCAL_CACHE_TTL, AUTH_LOCAL_CACHE_MAX_SIZE, USER_CACHE_TTL
+from db.builders import db_sync_builder
+from db.cache_versions import CacheVersions
+from db.exceptions import DBEntityNotFoundException
+from db.models import User
+
+__all__ = (
+    'UserCache',
+)
+
+
+class UserCache(metaclass=SingletonMeta):
+    # Column values of users: in-process tier, then Redis, then DB.
+    # A hit is attached to the current session without any query.
+    _KEY_PREFIX: Final[str] = 'cached_user_'
+
+    def __init__(self) -> None:
+        self._local_cache: TTLCache[int, dict[str, Any]] = TTLCache(AUTH_LOCAL_CACHE_MAX_SIZE, AUTH_LOCAL_CACHE_TTL)
+        self._versions: CacheVersions = CacheVersions()
+
+    @raises(DBEntityNotFoundException)
+    def by_id(self, user_id: int) -> User:
+        columns: dict[str, Any]
+        try:
+            columns = self._local_cache.get(user_id)
+        except KeyError:
+            dumped_columns: str | None = resident_app.get(self._key(user_id))
+            if dumped_columns is None:
+                version: str = self._versions.get(self._key(user_id))
+                loaded_user: User = User.by_id(user_id)
+                columns = self._columns(loaded_user)
+                # The user could have been edited since it was read, then it isn't cached:
+                if self._versions.set_if_not_invalidated(
+                    self._key(user_id), version, json.dumps(columns), USER_CACHE_TTL,
+                ):
+                    self._local_cache.set(user_id, columns)
+                return loaded_user
+
+            columns = json.loads(dumped_columns)
+            self._local_cache.set(user_id, columns)
+
+        user: User = User(**columns)
+        make_transient_to_detached(user)
+        return db_sync_builder.session.merge(user, load=False)
+
+    def invalidate(self, user_id: int) -> None:
+        self._local_cache.delete(user_id)
+        self._versions.invalidate([self._key(user_id)])
+
+    def clear(self) -> None:
+        self._local_cache.clear()
+        for key in resident_app.scan_iter(match=self._KEY_PREFIX + '*'):
+            resident_app.delete(key)
+
+    @staticmethod
+    def _columns(user: User) -> dict[str, Any]:
+        return {attribute.key: getattr(user, attribute.key) for attribute in inspect(User).column_attrs}
+
+    def _key(self, user_id: int) -> str:
+        return self._KEY_PREFIX + str(user_id)
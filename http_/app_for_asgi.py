@@ -0,0 +1,15 @@
+from a2wsgi import WSGIMiddleware
+
+from config.api import HTTP_ASGI_THREADS, HTTP_ASGI_SEND_QUEUE_SIZE
+from db.init import init_db
+from http_.app import app as wsgi_app
+
+__all__ = (
+    'app',
+)
+
+init_db()
+# The Flask app runs in a thread pool. Request bodies are read and responses are sent in chunks,
+# and only `HTTP_ASGI_SEND_QUEUE_SIZE` chunks are buffered per request, so a long download isn't held in RAM.
+# A client which reads slower than the app writes holds its thread, as with gunicorn.
+app: WSGIMiddleware = WSGIMiddleware(wsgi_app, workers=HTTP_ASGI_THREADS, send_queue_size=HTTP_ASGI_SEND_QUEUE_SIZE)
@@ -9,11 +9,15 @@ from flask import (
 from flask_jwt_extended import jwt_required
 
 from common.json_keys import JSONKey
+from common.typing_rate_limiter import TypingRateLimiter
 from db.builders import db_sync_builder
-from db.exceptions import DBEntityNotFoundException
+from db.exceptions import DBEntityNotFoundException, DBEntityIsForbiddenException
+from db.lists import ChatList, MessageList
+from db.membership_cache import MembershipCache
 from db.models import (
     User,
     Chat,
+    Message,
     UserChatMatch,
 )
 from db.transaction_retry_decorator import transaction_retry_decorator
@@ -24,11 +28,16 @@ from http_.common.apidocs_constants import (
     CHAT_TYPING_SPECS,
     CHAT_UNREAD_COUNT_SPECS,
     CHAT_MESSAGES_SPECS,
+    CHAT_MESSAGES_SEARCH_SPECS,
 )
 from http_.common.get_current_user import get_current_user
 from http_.common.simple_response import make_simple_response
 from http_.common.urls import Url
-from http_.common.validation import NewChatJSONValidator, OffsetSizeJSONValidator
+from http_.common.validation import (
+    NewChatJSONValidator,
+    MessagesPageJSONValidator,
+    SearchMessagesJSONValidator,
+)
 from http_.common.check_access_decorators import (
     chat_access_query_decorator,
     chat_access_json_decorator,
@@ -48,7 +57,7 @@ chats_bp: Blueprint = Blueprint('chats', __name__)
 def chat_get(chat: Chat,
              user: User,
              ):
-    return chat.as_json(user.id)
+    return ChatList([chat], user.id).as_json()[0]
 
 
 @chats_bp.route(Url.CHAT_BY_INTERLOCUTOR, methods=[HTTPMethod.GET])
@@ -67,10 +76,12 @@ def chat_by_interlocutor():
 
     current_user: User = get_current_user()
     try:
-        return Chat.between_users(current_user.id, interlocutor_id).as_json(current_user.id)
+        chat: Chat = Chat.between_users(current_user.id, interlocutor_id)
     except DBEntityNotFoundException:
         return abort(HTTPStatus.NOT_FOUND)
 
+    return ChatList([chat], current_user.id).as_json()[0]
+
 
 @chats_bp.route(Url.CHAT_NEW, methods=[HTTPMethod.POST])
 @jwt_required()
@@ -101,9 +112,10 @@ def chat_new():
     )
     db_sync_builder.session.add_all([chat, *objects])
     db_sync_builder.session.commit()
+    MembershipCache().add_chat(chat.id, data.user_ids)
 
     chat.signal_new(data.user_ids)
-    return chat.as_json(user.id), HTTPStatus.CREATED
+    return ChatList([chat], user.id).as_json()[0], HTTPStatus.CREATED
 
 
 @chats_bp.route(Url.CHAT_TYPING, methods=[HTTPMethod.POST])
@@ -113,8 +125,10 @@ def chat_new():
 def typing(chat: Chat,
            user: User,
            ):
-    user_ids: list[int] = chat.users().ids(exclude_ids=[user.id])
-    chat.signal_typing(user_ids, user_id=user.id)
+    # Fallback of the WebSocket `TYPING` frame, too frequent signals are dropped silently.
+    if TypingRateLimiter().allow(user.id, chat.id):
+        user_ids: list[int] = chat.user_ids(exclude_ids=[user.id])
+        chat.signal_typing(user_ids, user_id=user.id)
 
     return make_simple_response(HTTPStatus.OK)
 
@@ -139,5 +153,30 @@ def unread_count_get(chat: Chat,
 @swag_from(CHAT_MESSAGES_SPECS)
 @chat_access_query_decorator
 def messages_get(chat: Chat, _):
-    data: OffsetSizeJSONValidator = OffsetSizeJSONValidator.from_args()
-    return chat.messages(data.offset, data.size).as_json()
+    data: MessagesPageJSONValidator = MessagesPageJSONValidator.from_args()
+    return chat.messages(data.offset, data.size, data.before_message_id).as_json()
+
+
+@chats_bp.route(Url.CHAT_MESSAGES_SEARCH, methods=[HTTPMethod.GET])
+@jwt_required()
+@swag_from(CHAT_MESSAGES_SEARCH_SPECS)
+def messages_search():
+    data: SearchMessagesJSONValidator = SearchMessagesJSONValidator.from_args()
+
+    user: User = get_current_user()
+    if data.chat_id is not None:
+        try:
+            Chat.by_id(data.chat_id).check_user_access(user.id)
+        except DBEntityNotFoundException:
+            return abort(HTTPStatus.NOT_FOUND)
+        except DBEntityIsForbiddenException:
+            return abort(HTTPStatus.FORBIDDEN)
+
+    found: list[tuple[Message, float]] = user.search_messages(
+        data.words, data.chat_id, data.size, data.before_relevance, data.before_message_id,
+    )
+    messages_json: list[dict] = MessageList([message for message, _ in found]).as_json()
+    for message_json, (_, relevance) in zip(messages_json, found):
+        message_json[JSONKey.RELEVANCE] = relevance
+
+    return messages_json
@@ -18,6 +18,7 @@ __all__ = (
     'CHAT_TYPING_SPECS',
     'CHAT_UNREAD_COUNT_SPECS',
     'CHAT_MESSAGES_SPECS',
+    'CHAT_MESSAGES_SEARCH_SPECS',
 
     'MESSAGE_SPECS',
     'MESSAGE_NEW_SPECS',
@@ -165,6 +166,9 @@ _CHAT_SCHEMA = {
             'type': 'array',
             'items': {'type': 'integer'},
         },
+        'lastActivity': {
+            'type': ['null', 'string'],
+        },
     },
 }
 
@@ -401,10 +405,24 @@ USER_BACKGROUND_EDIT_SPECS = {
 
 USER_CHATS_SPECS = {
     'tags': _USER_TAGS,
-    'description': 'Chats sorted by "creatingDatetime" of last messages in descending order.',
+    'description': 'Chats sorted by "lastActivity" in descending order, chats without messages are the last ones. '
+                   'Pass "lastActivity" and "id" of the last received chat as "beforeActivity" and "beforeChatId" '
+                   'to get the next page ("beforeChatId" only if its "lastActivity" is null).',
     'parameters': [
         _ACCESS_TOKEN_COOKIE,
         *_OFFSET_AND_SIZE_QUERY_PARAMS,
+        {
+            'name': 'beforeActivity',
+            'in': 'query',
+            'type': 'string',
+            'required': False,
+        },
+        {
+            'name': 'beforeChatId',
+            'in': 'query',
+            'type': 'integer',
+            'required': False,
+        },
     ],
     'responses': {
         200: {
@@ -545,7 +563,8 @@ CHAT_UNREAD_COUNT_SPECS = {
 
 CHAT_MESSAGES_SPECS = {
     'tags': _CHAT_TAGS,
-    'description': 'Messages sorted by "creatingDatetime" in descending order.',
+    'description': 'Messages sorted by "creatingDatetime" in descending order. '
+                   'Pass "id" of the last received message as "beforeMessageId" to get the next page.',
     'parameters': [
         _ACCESS_TOKEN_COOKIE,
         {
@@ -555,6 +574,12 @@ CHAT_MESSAGES_SPECS = {
             'required': True,
         },
         *_OFFSET_AND_SIZE_QUERY_PARAMS,
+        {
+            'name': 'beforeMessageId',
+            'in': 'query',
+            'type': 'integer',
+            'required': False,
+        },
     ],
     'responses': {
         200: {
@@ -570,6 +595,67 @@ CHAT_MESSAGES_SPECS = {
     }
 }
 
+CHAT_MESSAGES_SEARCH_SPECS = {
+    'tags': _CHAT_TAGS,
+    'description': 'Messages of all chats of the user (or of the given chat) which contain every word of "query". '
+                   'They are sorted by "relevance" in descending order, then by "id" in descending order. '
+                   'Pass "relevance" and "id" of the last received message as "beforeRelevance" '
+                   'and "beforeMessageId" to get the next page.',
+    'parameters': [
+        _ACCESS_TOKEN_COOKIE,
+        {
+            'name': 'query',
+            'in': 'query',
+            'type': 'string',
+            'required': True,
+        },
+        {
+            'name': 'chatId',
+            'in': 'query',
+            'type': 'integer',
+            'required': False,
+        },
+        {
+            'name': 'size',
+            'in': 'query',
+            'type': 'integer',
+            'required': False,
+        },
+        {
+            'name': 'beforeRelevance',
+            'in': 'query',
+            'type': 'number',
+            'required': False,
+        },
+        {
+            'name': 'beforeMessageId',
+            'in': 'query',
+            'type': 'integer',
+            'required': False,
+        },
+    ],
+    'responses': {
+        200: {
+            'schema': {
+                'type': 'array',
+                'items': {
+                    'type': 'object',
+                    'properties': {
+                        **_MESSAGE_SCHEMA['properties'],
+                        'relevance': {
+                            'type': 'number',
+                        },
+                    },
+                },
+            }
+        },
+        400: _SIMPLE_REQUEST_RESPONSES[400],
+        401: _SIMPLE_REQUEST_RESPONSES[401],
+        403: _SIMPLE_REQUEST_RESPONSES[403],
+        404: _SIMPLE_REQUEST_RESPONSES[404],
+    }
+}
+
 MESSAGE_SPECS = {
     'tags': _MESSAGE_TAGS,
     'parameters': [
@@ -26,6 +26,7 @@ class Url(StrEnum):
     CHAT_TYPING = '/chat/typing'
     CHAT_UNREAD_COUNT = '/chat/unreadCount'
     CHAT_MESSAGES = '/chat/messages'
+    CHAT_MESSAGES_SEARCH = '/chat/messages/search'
 
     MESSAGE = '/message'
     MESSAGE_NEW = '/message/new'
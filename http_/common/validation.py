@@ -1,5 +1,6 @@
+from datetime import datetime
 from http import HTTPStatus
-from re import sub
+from re import sub, findall
 from typing import Union, Final
 
 from flask import request, abort
@@ -9,6 +10,7 @@ from pydantic import (
     conint,
     validate_email,
     field_validator,
+    model_validator,
     ValidationError,
     Field,
 )
@@ -21,9 +23,14 @@ __all__ = (
     'UserJSONValidator',
     'EditMessageJSONValidator',
     'NewChatJSONValidator',
+    'ChatIdJSONValidator',
+    'MessageIdJSONValidator',
     'NewMessageJSONValidator',
     'FilenamesJSONValidator',
     'OffsetSizeJSONValidator',
+    'MessagesPageJSONValidator',
+    'ChatsPageJSONValidator',
+    'SearchMessagesJSONValidator',
 )
 
 
@@ -69,6 +76,14 @@ class NewChatJSONValidator(BaseValidator):
     is_group: bool = Field(alias=JSONKey.IS_GROUP, default=False)
 
 
+class ChatIdJSONValidator(BaseValidator):
+    chat_id: int = Field(alias=JSONKey.CHAT_ID)
+
+
+class MessageIdJSONValidator(BaseValidator):
+    message_id: int = Field(alias=JSONKey.MESSAGE_ID)
+
+
 class BaseMessageJSONValidator(BaseValidator):
     _TEXT_MAX_LENGTH: Final[int] = 10_000
 
@@ -110,3 +125,46 @@ class OffsetSizeJSONValidator(BaseValidator):
 
     offset: int = Field(alias=JSONKey.OFFSET, ge=0, default=0)
     size: int = Field(alias=JSONKey.SIZE, ge=1, le=100, default=20)
+
+
+class MessagesPageJSONValidator(OffsetSizeJSONValidator):
+
+    before_message_id: int | None = Field(alias=JSONKey.BEFORE_MESSAGE_ID, ge=1, default=None)
+
+
+class ChatsPageJSONValidator(OffsetSizeJSONValidator):
+
+    before_activity: datetime | None = Field(alias=JSONKey.BEFORE_ACTIVITY, default=None)
+    before_chat_id: int | None = Field(alias=JSONKey.BEFORE_CHAT_ID, ge=1, default=None)
+
+
+class SearchMessagesJSONValidator(BaseValidator):
+    _WORDS_MAX_COUNT: Final[int] = 10
+
+    query: constr(min_length=1, max_length=200) = Field(alias=JSONKey.QUERY)
+    chat_id: int | None = Field(alias=JSONKey.CHAT_ID, default=None)
+    size: int = Field(alias=JSONKey.SIZE, ge=1, le=100, default=20)
+    before_relevance: float | None = Field(alias=JSONKey.BEFORE_RELEVANCE, ge=0, default=None)
+    before_message_id: int | None = Field(alias=JSONKey.BEFORE_MESSAGE_ID, ge=1, default=None)
+
+    @field_validator('query')  # noqa: from pydantic doc
+    @classmethod
+    def _validate_query(cls, query: str) -> str:
+        if not cls._words_of(query):
+            raise AssertionError
+        return query
+
+    @model_validator(mode='after')  # noqa: from pydantic doc
+    def _validate_cursor(self) -> 'SearchMessagesJSONValidator':
+        if (self.before_relevance is None) != (self.before_message_id is None):
+            raise AssertionError
+        return self
+
+    @property
+    def words(self) -> list[str]:
+        return self._words_of(self.query)[:self._WORDS_MAX_COUNT]
+
+    @staticmethod
+    def _words_of(query: str) -> list[str]:
+        # Operators of the boolean full-text search are dropped with the rest of punctuation.
+        return findall(r'\w+', query.lower())
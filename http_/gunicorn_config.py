@@ -0,0 +1,11 @@
+from db.builders import db_sync_builder
+
+__all__ = (
+    'post_fork',
+)
+
+
+def post_fork(server, worker) -> None:
+    # With `--preload` the engine is created in the master process, its connections must not be shared by workers:
+    if db_sync_builder.is_initialized:
+        db_sync_builder.dispose_after_fork()
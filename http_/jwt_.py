@@ -1,8 +1,9 @@
 from flask_jwt_extended import JWTManager
 
-from db.builders import db_sync_builder
+from db.auth_token_cache import AuthTokenCache
 from db.exceptions import DBEntityNotFoundException
-from db.models import User, AuthToken
+from db.models import User
+from db.user_cache import UserCache
 
 __all__ = (
     'jwt',
@@ -13,13 +14,13 @@ jwt: JWTManager = JWTManager()
 
 @jwt.token_in_blocklist_loader
 def token_in_blocklist_callback(_, jwt_payload: dict) -> bool:
-    return not AuthToken.exists(jwt_payload['jti'])
+    return not AuthTokenCache().exists(jwt_payload['jti'], jwt_payload['exp'])
 
 
 @jwt.user_lookup_loader
 def user_lookup_callback(_jwt_header, jwt_data) -> User | None:
     user_id: int = int(jwt_data['sub'])
     try:
-        return User.by_id(user_id)
+        return UserCache().by_id(user_id)
     except DBEntityNotFoundException:
         return
@@ -8,8 +8,7 @@ from flask import (
 from flask_jwt_extended import jwt_required
 
 from db.builders import db_sync_builder
-from db.exceptions import DBEntityNotFoundException
-from db.lists import MessageList
+from db.exceptions import DBEntityNotFoundException, DBEntityIsForbiddenException
 from db.models import (
     User,
     Chat,
@@ -65,19 +64,13 @@ def message_new(chat: Chat,
 
     replied_message: Message | None = None
     if data.replied_message_id:
-        replied_message = _get_replied_message(data.replied_message_id, chat.id)
+        replied_message = _get_replied_message(data.replied_message_id, chat)
 
-    message: Message = Message.create(
-        text=data.text,
-        user=user,
-        chat=chat,
-        replied_message=replied_message,
-    )
-    db_sync_builder.session.add(message)
+    message: Message = chat.add_message(data.text, user, replied_message)
     db_sync_builder.session.commit()
 
     message.signal_new(
-        chat.users().ids(),
+        chat.user_ids(),
     )
     return message.as_json(), HTTPStatus.CREATED
 
@@ -99,26 +92,24 @@ def message_edit(message: Message, _):
     if data.replied_message_id is not None:
         if data.replied_message_id == message.id:
             return abort(HTTPStatus.CONFLICT)
-        replied_message: Message = _get_replied_message(data.replied_message_id, message.chat.id)
+        replied_message: Message = _get_replied_message(data.replied_message_id, message.chat)
         message.set_replied_message_id(replied_message.id)
 
     db_sync_builder.session.commit()
 
-    message.signal_edit(message.chat.users().ids())
+    message.signal_edit(message.chat.user_ids())
     return make_simple_response(HTTPStatus.OK)
 
 
 def _get_replied_message(replied_message_id: int,
-                         chat_id: int,
+                         chat: Chat,
                          ) -> Message:
     try:
-        replied_message: Message = Message.by_id(replied_message_id)
+        return chat.message_by_id(replied_message_id)
     except DBEntityNotFoundException:
         return abort(HTTPStatus.NOT_FOUND)
-    if replied_message.chat.id != chat_id:
-        raise abort(HTTPStatus.FORBIDDEN)
-
-    return replied_message
+    except DBEntityIsForbiddenException:
+        return abort(HTTPStatus.FORBIDDEN)
 
 
 @messages_bp.route(Url.MESSAGE_DELETE, methods=[HTTPMethod.DELETE])
@@ -127,11 +118,16 @@ def _get_replied_message(replied_message_id: int,
 @transaction_retry_decorator()
 @message_full_access_json_decorator
 def message_delete(message: Message, _):
+    chat: Chat = message.chat
     db_sync_builder.session.delete(message)
+    db_sync_builder.session.flush()
+    if chat.last_message_id == message.id:
+        chat.update_last_message()
+    chat.decrement_unread_counts(message)
     db_sync_builder.session.commit()
 
     message.get_storage().delete_all()
-    message.signal_delete(message.chat.users().ids())
+    message.signal_delete(chat.user_ids())
 
     return make_simple_response(HTTPStatus.OK)
 
@@ -144,16 +140,10 @@ def message_delete(message: Message, _):
 def message_read(message: Message,
                  user: User,
                  ):
-    sender_read_messages: dict[int, MessageList] = {}
-    for history_message in message.chat.unread_interlocutor_messages_up_to(message.id, user.id):
-        history_message.read()
-        sender_read_messages.setdefault(message.user.id, MessageList()).append(history_message)
-
-    message.chat.set_last_seen_message_id_of_user(user.id, message.id)
+    chat: Chat = message.chat
+    sender_message_ids: dict[int, list[int]] = chat.read_messages_of_user_up_to(message.id, user.id)
     db_sync_builder.session.commit()
 
-    for user_id, messages in sender_read_messages.items():
-        messages.signal_read([user_id])
-    message.chat.signal_new_unread_count([user.id])
+    chat.signal_read_by_user(sender_message_ids, user.id)
 
     return make_simple_response(HTTPStatus.OK)
@@ -7,6 +7,7 @@ from flask_jwt_extended import jwt_required
 
 from common.json_keys import JSONKey
 from config.api import MESSAGE_FILES_MAX_CONTENT_LENGTH
+from db.builders import db_sync_builder
 from db.models import Message
 from http_.common.simple_response import make_simple_response
 from http_.common.apidocs_constants import (
@@ -43,7 +44,10 @@ def message_files_update(message: Message, _):
         return abort(HTTPStatus.BAD_REQUEST)
 
     message.get_storage().update(files)
-    message.signal_files(message.chat.users().ids())
+    message.set_has_files(True)
+    db_sync_builder.session.commit()
+
+    message.signal_files(message.chat.user_ids())
 
     return make_simple_response(HTTPStatus.CREATED)
 
@@ -56,7 +60,7 @@ def message_files_delete(message: Message, _):
     filenames: list[str] = FilenamesJSONValidator.from_json().filenames
 
     message.get_storage().delete(filenames)
-    message.signal_files(message.chat.users().ids())
+    message.signal_files(message.chat.user_ids())
 
     return make_simple_response(HTTPStatus.OK)
 
@@ -1,21 +1,40 @@
 from subprocess import run as run_subprocess
-from typing import NoReturn
+from typing import NoReturn, Callable, Final
 
 from common.ssl_context import create_ssl_context
-from config.api import HOST, HTTP_PORT as PORT
+from config.api import (
+    HOST,
+    HTTP_PORT as PORT,
+    HTTP_SERVER,
+    HTTP_WORKERS,
+    HTTP_WORKER_CLASS,
+    HTTP_THREADS,
+    HTTP_PRELOAD,
+)
 from db.init import init_db
 from http_.app import app
+from http_.servers import HTTPServer
 
 __all__ = (
+    'run_http',
     'run_http_wsgi',
+    'run_http_asgi',
     'run_default_http',
 )
 
 
+def run_http() -> NoReturn:
+    _RUNNERS[HTTPServer(HTTP_SERVER)]()
+
+
 def run_http_wsgi() -> NoReturn:
     run_subprocess([
         'gunicorn',
-        '-w', '4',
+        '-c', 'python:http_.gunicorn_config',
+        '-w', str(HTTP_WORKERS),
+        '-k', HTTP_WORKER_CLASS,
+        '--threads', str(HTTP_THREADS),
+        *(['--preload'] if HTTP_PRELOAD else []),
         '-b', f'{HOST}:{PORT}',
         '--access-logfile', '-',
         '--error-logfile', '-',
@@ -23,6 +42,22 @@ def run_http_wsgi() -> NoReturn:
     ])
 
 
+def run_http_asgi() -> NoReturn:
+    run_subprocess([
+        'uvicorn',
+        '--workers', str(HTTP_WORKERS),
+        '--host', HOST,
+        '--port', str(PORT),
+        'http_.app_for_asgi:app',
+    ])
+
+
 def run_default_http() -> NoReturn:
     init_db()
     app.run(HOST, PORT)
+
+
+_RUNNERS: Final[dict[HTTPServer, Callable[[], NoReturn]]] = {
+    HTTPServer.WSGI: run_http_wsgi,
+    HTTPServer.ASGI: run_http_asgi,
+}
@@ -0,0 +1,11 @@
+from enum import StrEnum
+
+__all__ = (
+    'HTTPServer',
+)
+
+
+class HTTPServer(StrEnum):
+
+    WSGI = 'wsgi'
+    ASGI = 'asgi'
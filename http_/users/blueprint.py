@@ -19,9 +19,11 @@ from flask_jwt_extended import (
 )
 
 from common.json_keys import JSONKey
+from db.auth_token_cache import AuthTokenCache
 from db.builders import db_sync_builder
 from db.exceptions import DBEntityNotFoundException
 from db.models import User, AuthToken
+from db.user_cache import UserCache
 from db.transaction_retry_decorator import transaction_retry_decorator
 from http_.common.apidocs_constants import (
     USER_LOGIN_SPECS,
@@ -37,7 +39,7 @@ from http_.common.urls import Url
 from http_.common.validation import (
     EmailAndCodeJSONValidator,
     UserJSONValidator,
-    OffsetSizeJSONValidator,
+    ChatsPageJSONValidator,
 )
 from http_.users.email.codes.functions import (
     email_code_is_valid,
@@ -102,9 +104,11 @@ def refresh_access():
 
 
 def _revoke_current_token() -> None:
-    token: AuthToken = AuthToken.by_value(get_jwt()['jti'])
+    jti: str = get_jwt()['jti']
+    token: AuthToken = AuthToken.by_value(jti)
     db_sync_builder.session.delete(token)
     db_sync_builder.session.commit()
+    AuthTokenCache().invalidate(jti)
 
 
 def _make_auth_response(user: User,
@@ -161,11 +165,13 @@ def user_get():
 def user_edit():
     data: UserJSONValidator = UserJSONValidator.from_json()
 
-    get_current_user().set_info(
+    user: User = get_current_user()
+    user.set_info(
         data.first_name,
         data.last_name,
     )
     db_sync_builder.session.commit()
+    UserCache().invalidate(user.id)
 
     return make_simple_response(HTTPStatus.OK)
 
@@ -174,5 +180,5 @@ def user_edit():
 @jwt_required()
 @swag_from(USER_CHATS_SPECS)
 def user_chats():
-    data: OffsetSizeJSONValidator = OffsetSizeJSONValidator.from_args()
-    return get_current_user().chats(data.offset, data.size).as_json()
+    data: ChatsPageJSONValidator = ChatsPageJSONValidator.from_args()
+    return get_current_user().chats(data.offset, data.size, data.before_activity, data.before_chat_id).as_json()
@@ -1,33 +1,32 @@
-import pytest
-from threading import Thread
 from sys import argv
-from typing import NoReturn
 
+import pytest
+
+from common.supervisor import Supervisor
+from config.api import (
+    SUPERVISOR_RESTART_DELAY,
+    SUPERVISOR_MAX_RESTART_DELAY,
+    SUPERVISOR_STOP_TIMEOUT,
+)
 from db.alembic_.main import make_migrations
-from http_.run import run_http_wsgi as run_http
+from http_.run import run_http
 from http_.users.email.run import run_celery
 from websocket_.run import run_websocket
 
 
-def main() -> NoReturn:
-    _run_tests()
+def main() -> None:
+    if '--with-tests' in argv[1:]:
+        _run_tests()
 
-    need_migrations: bool
-    try:
-        if argv[1] != '--with-migrations':
-            raise IndexError
-        need_migrations = True
-    except IndexError:
-        need_migrations = False
-
-    if need_migrations:
+    if '--with-migrations' in argv[1:]:
         make_migrations()
 
-    for func in (run_websocket, run_http, run_celery):
-        Thread(target=func).start()
-
-    while True:
-        pass
+    Supervisor(
+        [run_websocket, run_http, run_celery],
+        restart_delay=SUPERVISOR_RESTART_DELAY,
+        max_restart_delay=SUPERVISOR_MAX_RESTART_DELAY,
+        stop_timeout=SUPERVISOR_STOP_TIMEOUT,
+    ).run()
 
 
 def _run_tests() -> None:
@@ -0,0 +1,386 @@
+import json
+import re
+import signal
+from abc import ABC, abstractmethod
+from random import uniform
+from socket import gethostname
+from ssl import SSLContext
+from threading import Lock
+from time import monotonic
+from typing import Final, Generic, TypeVar
+
+from jwt import decode as decode_jwt, PyJWTError
+from websockets.datastructures import Headers
+from websockets.frames import CloseCode
+
+from common.hinting import raises
+from common.json_keys import JSONKey
+from common.logs import logger
+from common.online_set import OnlineSet
+from common.signals.exceptions import SignalQueueIsEmptyException
+from common.signals.message import (
+    SignalQueueMessage,
+    DumpedSignalQueueMessage,
+    SignalQueueMessageJSONDictToForward,
+)
+from common.signals.node_registry import NodeRegistry
+from common.signals.queue import SignalQueue
+from common.signals.signal_types import SignalType
+from db.exceptions import DBEntityNotFoundException
+from db.membership_cache import MembershipCache
+from db.models import User
+from websocket_.command_handler import CommandHandler
+from websocket_.exceptions import (
+    InvalidOriginException,
+    JWTNotFoundInCookiesException,
+    UserIdNotFoundInJWTException,
+)
+from websocket_.outboxes import AbstractOutbox
+from websocket_.presence_aggregator import PresenceAggregator
+from websocket_.slow_client_policy import SlowClientPolicy
+
+__all__ = (
+    'AbstractWebSocketServer',
+)
+
+OutboxT = TypeVar('OutboxT', bound=AbstractOutbox)
+
+
+class AbstractWebSocketServer(ABC, Generic[OutboxT]):
+    _RE_TO_EXTRACT_JWT_FROM_COOKIES: Final[str] = 'access_token_cookie=([^;]*);?'
+    # These signals start draining:
+    _STOP_SIGNALS: Final[tuple[signal.Signals, ...]] = (signal.SIGTERM, signal.SIGINT)
+
+    def __init__(self, host: str, port: int,
+                 jwt_secret_key: str, jwt_algorithm: str,
+                 origins: list[str] | None = None,
+                 ssl_context: SSLContext | None = None,
+                 node_id: str = gethostname(),
+                 multi_node: bool = False,
+                 outbox_max_size: int = 1000,
+                 slow_client_policy: SlowClientPolicy = SlowClientPolicy.DROP_OLDEST,
+                 outbox_metrics_interval: float = 60,
+                 drain_batch_size: int = 100,
+                 drain_batch_interval: float = 0.1,
+                 reconnect_max_delay: float = 10,
+                 drain_timeout: float = 20,
+                 heartbeat_interval: float = 5,
+                 node_ttl: float = 30,
+                 presence_window: float = 1,
+                 ) -> None:
+        self._host = host
+        self._port = port
+        self._jwt_secret_key = jwt_secret_key
+        self._jwt_algorithm = jwt_algorithm
+        self._origins = [] if origins is None else origins
+        self._ssl_context = ssl_context
+        # Presence is owned by nodes in both modes, signals are routed to nodes only in the multi node mode:
+        self._node_id = node_id
+        self._multi_node = multi_node
+        self._outbox_max_size = outbox_max_size
+        self._slow_client_policy = slow_client_policy
+        self._outbox_metrics_interval = outbox_metrics_interval
+        self._drain_batch_size = drain_batch_size
+        self._drain_batch_interval = drain_batch_interval
+        self._reconnect_max_delay = reconnect_max_delay
+        self._drain_timeout = drain_timeout
+        self._heartbeat_interval = heartbeat_interval
+        self._node_ttl = node_ttl
+
+        self._online_set: OnlineSet = OnlineSet()
+        self._signal_queue: SignalQueue = SignalQueue()
+        self._node_registry: NodeRegistry = NodeRegistry()
+        self._membership_cache: MembershipCache = MembershipCache()
+        self._command_handler: CommandHandler = CommandHandler()
+        self._presence_aggregator: PresenceAggregator = PresenceAggregator(presence_window)
+        self._clients: dict[int, list[OutboxT]] = {}
+        # Connections of a user and ownership of the user by this node are changed together:
+        self._clients_lock: Lock = Lock()
+        self._dropped_messages_count: int = 0
+        self._outbox_metrics_logged_at: float = monotonic()
+        self._heartbeat_sent_at: float = 0
+        # New connections aren't accepted and online statuses of leaving users aren't sent anymore:
+        self._is_draining: bool = False
+
+    @abstractmethod
+    def run(self) -> None:
+        # Returns when the server has been drained.
+        raise NotImplementedError
+
+    def _send_to_many_users(self, user_ids: list[int],
+                            dumped_message: str,
+                            ) -> None:
+        # Never blocks: every client has its own outbox and writer.
+        # `dumped_message` is encoded once and the same string is sent to every client.
+        for user_id in set(user_ids):
+            for outbox in tuple(self._clients.get(user_id, ())):
+                if not outbox.put(dumped_message):
+                    self._dropped_messages_count += 1
+
+    def _log_outbox_metrics_if_it_is_time(self) -> None:
+        if monotonic() - self._outbox_metrics_logged_at < self._outbox_metrics_interval:
+            return
+        self._outbox_metrics_logged_at = monotonic()
+
+        depths: list[int] = [outbox.depth for outboxes in tuple(self._clients.values()) for outbox in outboxes]
+        logger.info(
+            f'Outboxes: {len(depths)}, '
+            f'total depth: {sum(depths)}, '
+            f'max depth: {max(depths, default=0)}, '
+            f'dropped messages: {self._dropped_messages_count}'
+        )
+
+    def _user_id_by_headers(self, headers: Headers) -> int | None:
+        # Blocking (DB).
+        user_id: int | None = self._claimed_user_id_by_headers(headers)
+        if user_id is None:
+            return
+
+        try:
+            return User.by_id(user_id).id
+        except DBEntityNotFoundException:
+            return self._log_user_not_found()
+
+    def _claimed_user_id_by_headers(self, headers: Headers) -> int | None:
+        # User id from JWT, it isn't checked in DB.
+        if 'Cookie' not in headers:
+            return
+
+        try:
+            origin: str = headers['Origin']
+            cookies: str = headers['Cookie']
+        except KeyError:
+            logger.info('Client has been disconnected due to origin or cookie header was not found.')
+            return
+
+        try:
+            self._check_origin(origin)
+        except InvalidOriginException:
+            logger.info('Client has been disconnected due to invalid origin.')
+            return
+
+        try:
+            jwt: str = self._extract_jwt_from_cookies(cookies)
+        except JWTNotFoundInCookiesException:
+            logger.info('Client has been disconnected due to JWT was not found in cookies.')
+            return
+
+        try:
+            return self._user_id_by_jwt(jwt)
+        except UserIdNotFoundInJWTException:
+            return self._log_user_not_found()
+
+    @staticmethod
+    def _log_user_not_found() -> None:
+        logger.info('Client has been disconnected due to invalid JWT (user id was not found).')
+
+    @raises(InvalidOriginException)
+    def _check_origin(self, origin: str) -> None:
+        if not self._origins:
+            return
+
+        for origin_regex in self._origins:
+            if re.match(origin_regex, origin):
+                return
+        raise InvalidOriginException
+
+    @raises(JWTNotFoundInCookiesException)
+    def _extract_jwt_from_cookies(self, cookies: str) -> str:
+        match = re.search(self._RE_TO_EXTRACT_JWT_FROM_COOKIES, cookies)
+        if not match:
+            raise JWTNotFoundInCookiesException
+
+        return match.group(1)
+
+    @raises(UserIdNotFoundInJWTException)
+    def _user_id_by_jwt(self, jwt: str) -> int:
+        try:
+            return self._extract_user_id_from_jwt(jwt)
+        except PyJWTError:
+            raise UserIdNotFoundInJWTException
+
+    @raises(PyJWTError)
+    def _extract_user_id_from_jwt(self, jwt: str) -> int:
+        try:
+            decoded: dict = decode_jwt(
+                jwt,
+                key=self._jwt_secret_key,
+                algorithms=[self._jwt_algorithm],
+            )
+            return int(decoded['sub'])
+        except KeyError:
+            raise PyJWTError
+
+    def _unregister_client(self, user_id: int,
+                           client: OutboxT,
+                           ) -> bool:
+        # Returns `True` if it was the last connection of the user.
+        try:
+            self._clients[user_id].remove(client)
+        except (KeyError, ValueError):
+            return False
+
+        if self._clients[user_id]:
+            return False
+
+        self._clients.pop(user_id)
+        return True
+
+    def _add_client(self, user_id: int,
+                    outbox: OutboxT,
+                    ) -> None:
+        # Blocking (Redis). Signals are routed to this node as soon as the first connection of the user is added,
+        # only the new online status is applied and sent with others by the popping loop.
+        with self._clients_lock:
+            if user_id not in self._clients:
+                self._node_registry.add(self._node_id, user_id)
+                self._presence_aggregator.add(user_id, True)
+                self._clients[user_id] = []
+            self._clients[user_id].append(outbox)
+
+    def _del_client(self, user_id: int,
+                    outbox: OutboxT,
+                    ) -> None:
+        # Blocking (Redis). The outbox must be stopped before.
+        with self._clients_lock:
+            # Draining resets the online state of all users at once:
+            if not self._unregister_client(user_id, outbox) or self._is_draining:
+                return
+            if self._node_registry.remove(self._node_id, user_id):  # Not connected to other nodes too.
+                self._presence_aggregator.add(user_id, False)
+
+    @property
+    def _queue_node_id(self) -> str | None:
+        # `None` means the shared signal queue of the single node mode.
+        return self._node_id if self._multi_node else None
+
+    @raises(SignalQueueIsEmptyException)
+    def _pop_signals(self) -> list[DumpedSignalQueueMessage]:
+        # Blocking (Redis).
+        return self._signal_queue.pop_many(node_id=self._queue_node_id)
+
+    def _pop_pending_signals(self) -> list[DumpedSignalQueueMessage]:
+        # Blocking (Redis). Signals which are already queued for this node, the queue isn't waited for.
+        messages: list[DumpedSignalQueueMessage] = []
+        while True:
+            try:
+                messages += self._signal_queue.pop_pending(node_id=self._queue_node_id)
+            except SignalQueueIsEmptyException:
+                return messages
+
+    def _send_signals(self, messages: list[DumpedSignalQueueMessage]) -> None:
+        for message in messages:
+            self._send_to_many_users(
+                user_ids=message.user_ids,
+                dumped_message=message.dumped_message,
+            )
+
+    def _outbox_batches_to_drain(self) -> list[list[OutboxT]]:
+        outboxes: list[OutboxT] = [outbox for outboxes in tuple(self._clients.values()) for outbox in outboxes]
+        return [
+            outboxes[i:i + self._drain_batch_size]
+            for i in range(0, len(outboxes), self._drain_batch_size)
+        ]
+
+    def _close_for_reconnect(self, outbox: OutboxT) -> None:
+        # Every client gets its own random delay, so the other nodes aren't hit by all of them at once.
+        reason: str = json.dumps({
+            JSONKey.RECONNECT_AFTER: round(uniform(0, self._reconnect_max_delay) * 1000),  # In milliseconds.
+        })
+        outbox.close(CloseCode.SERVICE_RESTART, reason)
+
+    def _reset_online_state(self) -> None:
+        # Blocking. Forgets everything what was left by the previous run of this node
+        # or by this run after draining. Users connected to other nodes stay online.
+        self._clear_node(self._node_id)
+        if not self._multi_node:
+            self._online_set.clear()  # This node is the only one.
+
+    def _clear_node(self, node_id: str) -> list[int]:
+        # Blocking (Redis). Returns ids of users who are offline now.
+        if self._multi_node:
+            self._signal_queue.clear_node(node_id)
+        user_ids: list[int] = self._node_registry.clear_node(node_id)
+        self._online_set.remove_many(user_ids)
+        return user_ids
+
+    def _is_time_to_heartbeat(self) -> bool:
+        return monotonic() - self._heartbeat_sent_at >= self._heartbeat_interval
+
+    def _heartbeat_and_reap(self) -> dict[int, list[int]]:
+        # Blocking (Redis and DB). Nodes which have stopped sending heartbeats (crashed or lost) are cleared
+        # by the first alive node which notices them. Returns ids of users who are offline now
+        # with ids of users who must be notified about it.
+        is_first_heartbeat: bool = self._heartbeat_sent_at == 0
+        self._heartbeat_sent_at = monotonic()
+        if self._node_registry.heartbeat(self._node_id) and not is_first_heartbeat:
+            self._restore_clients()
+
+        offline_user_ids: list[int] = []
+        for node_id in self._node_registry.claim_dead_nodes(self._node_ttl):
+            user_ids: list[int] = self._clear_node(node_id)
+            logger.warning(f'Node {node_id} has been reaped, {len(user_ids)} users are offline now.')
+            offline_user_ids += user_ids
+
+        return {
+            user_id: self._membership_cache.interlocutor_ids_of_user(user_id)
+            for user_id in offline_user_ids
+        }
+
+    def _restore_clients(self) -> None:
+        # Blocking (Redis). This node has been reaped by another one while it was stalled (e.g. by a long call),
+        # so its users are offline and signals aren't routed to it. They are routed again right away,
+        # the online statuses are applied and sent by the popping loop.
+        with self._clients_lock:
+            user_ids: list[int] = list(self._clients)
+            self._node_registry.add_many(self._node_id, user_ids)
+            for user_id in user_ids:
+                self._presence_aggregator.add(user_id, True)
+        logger.warning(f'Node {self._node_id} has been reaped while alive, {len(user_ids)} users are restored.')
+
+    def _update_online_statuses(self, statuses: dict[int, bool]) -> dict[int, list[int]]:
+        # Blocking (Redis and DB). Returns ids of users who must be notified about the new statuses.
+        interlocutor_ids_of_users: dict[int, list[int]] = {}
+        for user_id, status in statuses.items():
+            if status:
+                self._online_set.add(user_id)
+            elif self._node_registry.is_connected(user_id):
+                continue  # The user has connected to another node within the window.
+            else:
+                self._online_set.remove(user_id)
+
+            interlocutor_ids_of_users[user_id] = self._membership_cache.interlocutor_ids_of_user(user_id)
+        return interlocutor_ids_of_users
+
+    def _send_online_statuses(self, statuses: dict[int, bool],
+                              recipient_ids_of_users: dict[int, list[int]],
+                              ) -> list[SignalQueueMessage]:
+        # Never blocks. Every recipient connected to this node gets one message with all statuses meant for it.
+        # Returns the same messages for recipients connected to other nodes (the multi node mode only),
+        # they must be passed to `_push_to_other_nodes`.
+        if not self._multi_node:
+            recipient_ids_of_users = {
+                user_id: [recipient_id for recipient_id in recipient_ids if recipient_id in self._clients]
+                for user_id, recipient_ids in recipient_ids_of_users.items()
+            }
+
+        messages: list[SignalQueueMessage] = []
+        for recipient_ids, statuses_of_recipients in self._presence_aggregator.merge(
+            statuses, recipient_ids_of_users,
+        ):
+            message: SignalQueueMessageJSONDictToForward = {
+                JSONKey.TYPE: SignalType.ONLINE_STATUSES,
+                JSONKey.DATA: statuses_of_recipients,
+            }
+            self._send_to_many_users(
+                user_ids=recipient_ids,
+                dumped_message=json.dumps(message),
+            )
+            if self._multi_node:
+                messages.append(SignalQueueMessage(user_ids=recipient_ids, message=message))
+        return messages
+
+    def _push_to_other_nodes(self, messages: list[SignalQueueMessage]) -> None:
+        # Blocking (Redis). Recipients connected to this node have already got the messages.
+        for message in messages:
+            self._signal_queue.push(message, except_node_id=self._node_id)
@@ -0,0 +1,137 @@
+import asyncio
+from typing import Callable, TypeVar
+
+from websockets import ConnectionClosed
+from websockets.asyncio.server import serve, Server, ServerConnection
+from websockets.datastructures import Headers
+
+from common.signals.message import DumpedSignalQueueMessage
+from common.signals.exceptions import SignalQueueIsEmptyException
+from db.builders import db_sync_builder, db_async_builder
+from db.exceptions import DBEntityNotFoundException
+from db.models import User
+from common.logs import logger, init_logs
+from websocket_.abstract_server import AbstractWebSocketServer
+from websocket_.outboxes import AsyncOutbox
+
+__all__ = (
+    'AsyncWebSocketServer',
+)
+
+ResultT = TypeVar('ResultT')
+
+
+class AsyncWebSocketServer(AbstractWebSocketServer[AsyncOutbox]):
+    # Event loop engine: connections cost a coroutine instead of an OS thread.
+    # DB is queried by the async counterparts of model methods (see `db_async_builder`),
+    # other blocking calls (Redis, cached DB lookups) are moved to the default thread pool via `_to_thread`.
+
+    def run(self) -> None:
+        init_logs()
+        asyncio.run(self._serve())
+
+    async def _serve(self) -> None:
+        async with serve(handler=self._handler, host=self._host, port=self._port, ssl=self._ssl_context) as server:
+            for signal_ in self._STOP_SIGNALS:
+                asyncio.get_running_loop().add_signal_handler(signal_, self._stop_accepting, server)
+            logger.info(f'AsyncWebSocketServer is serving on wss://{self._host}:{self._port}')
+            # Returns when draining starts:
+            await self._signal_queue_pop_task()
+            await self._drain(server)
+
+    def _stop_accepting(self, server: Server) -> None:
+        self._is_draining = True
+        # Connections are closed by draining:
+        server.close(close_connections=False)
+
+    async def _drain(self, server: Server) -> None:
+        logger.info(f'AsyncWebSocketServer is draining {len(self._clients)} users...')
+        # Outboxes must be used only inside the event loop:
+        self._send_signals(await self._to_thread(self._pop_pending_signals))
+        for batch in self._outbox_batches_to_drain():
+            for outbox in batch:
+                self._close_for_reconnect(outbox)
+            await asyncio.sleep(self._drain_batch_interval)
+
+        try:
+            await asyncio.wait_for(server.wait_closed(), self._drain_timeout)
+        except TimeoutError:
+            logger.warning(f'{len(self._clients)} users have not disconnected in time, their connections are aborted.')
+            # Otherwise leaving `serve` waits for them without a timeout:
+            for connection in tuple(server.handlers):
+                connection.transport.abort()
+            await server.wait_closed()
+
+        await self._to_thread(self._reset_online_state)
+        logger.info('AsyncWebSocketServer has been drained.')
+
+    async def _signal_queue_pop_task(self) -> None:
+        await self._to_thread(self._reset_online_state)
+
+        messages: list[DumpedSignalQueueMessage]
+        while not self._is_draining:
+            self._log_outbox_metrics_if_it_is_time()
+            if self._is_time_to_heartbeat():
+                interlocutor_ids_of_users: dict[int, list[int]] = await self._to_thread(self._heartbeat_and_reap)
+                await self._to_thread(self._push_to_other_nodes, self._send_online_statuses(
+                    dict.fromkeys(interlocutor_ids_of_users, False), interlocutor_ids_of_users,
+                ))
+            if self._presence_aggregator.is_due():
+                statuses: dict[int, bool] = self._presence_aggregator.pop_changes()
+                await self._to_thread(self._push_to_other_nodes, self._send_online_statuses(
+                    statuses, await self._to_thread(self._update_online_statuses, statuses),
+                ))
+            try:
+                messages = await self._to_thread(self._pop_signals)
+            except SignalQueueIsEmptyException:
+                continue
+
+            self._send_signals(messages)
+
+    async def _handler(self, client: ServerConnection) -> None:
+        logger.info(f'New client connected. Total connected users: {len(self._clients)}')
+        try:
+            await self._handle_client(client)
+        except ConnectionClosed:
+            pass
+        logger.info('Client disconnected.')
+
+    async def _handle_client(self, client: ServerConnection) -> None:
+        user_id: int | None = await self._async_user_id_by_headers(client.request.headers)
+        if user_id is None:
+            return
+
+        outbox: AsyncOutbox = AsyncOutbox(client, self._outbox_max_size, self._slow_client_policy)
+        await self._to_thread(self._add_client, user_id, outbox)
+        outbox.start()
+        try:
+            async for frame in client:
+                dumped_ack: str | None = await self._to_thread(self._command_handler.handle, user_id, frame)
+                if dumped_ack is not None:
+                    outbox.put(dumped_ack)
+        finally:
+            outbox.stop()
+            await self._to_thread(self._del_client, user_id, outbox)
+
+    async def _async_user_id_by_headers(self, headers: Headers) -> int | None:
+        user_id: int | None = self._claimed_user_id_by_headers(headers)
+        if user_id is None:
+            return
+
+        async with db_async_builder.new_session() as session:
+            try:
+                return (await User.async_by_id(session, user_id)).id
+            except DBEntityNotFoundException:
+                return self._log_user_not_found()
+
+    @staticmethod
+    async def _to_thread(func: Callable[..., ResultT], *args) -> ResultT:
+        return await asyncio.to_thread(_call_with_session_removing, func, *args)
+
+
+def _call_with_session_removing(func: Callable[..., ResultT], *args) -> ResultT:
+    try:
+        return func(*args)
+    finally:
+        # Pool threads are reused, so the thread-local session must not outlive the call:
+        db_sync_builder.session.remove()
@@ -0,0 +1,157 @@
+import json
+from http import HTTPStatus
+from traceback import format_exc
+from typing import Callable
+
+from pydantic import Field, ValidationError, constr
+
+from common.hinting import raises
+from common.json_keys import JSONKey
+from common.logs import logger
+from common.signals.message import SignalQueueMessage, SignalQueueMessageJSONDictToForward
+from common.signals.queue import SignalQueue
+from common.signals.signal_types import SignalType
+from common.typing_rate_limiter import TypingRateLimiter
+from db.builders import db_sync_builder
+from db.exceptions import DBEntityNotFoundException, DBEntityIsForbiddenException
+from db.membership_cache import MembershipCache
+from db.models import User, Chat, Message
+from db.transaction_retry_decorator import transaction_retry_decorator
+from http_.common.validation import (
+    BaseValidator,
+    ChatIdJSONValidator,
+    MessageIdJSONValidator,
+    NewMessageJSONValidator,
+)
+from websocket_.command_types import CommandType
+
+__all__ = (
+    'CommandHandler',
+)
+
+CommandResult = tuple[HTTPStatus, dict | None]
+
+
+class CommandJSONValidator(BaseValidator):
+
+    type: CommandType = Field(alias=JSONKey.TYPE)
+    # Any id chosen by the client, the `ACK` is sent only if it is passed:
+    request_id: int | constr(max_length=100) | None = Field(alias=JSONKey.REQUEST_ID, default=None)
+    data: dict = Field(alias=JSONKey.DATA, default_factory=dict)
+
+
+class CommandHandler:
+    # Commands sent by clients over their WebSocket connections, e.g.
+    # `{"type": "NEW_MESSAGE", "requestId": 1, "data": {"chatId": 1, "text": "Hi"}}`.
+    # They are validated and executed as their HTTP endpoints do, without cookies, JWT and CSRF checks per action.
+    # The answer is `{"type": "ACK", "data": {"requestId": 1, "status": 201, "data": {...}}}` with an HTTP status.
+
+    def __init__(self) -> None:
+        self._signal_queue: SignalQueue = SignalQueue()
+        self._membership_cache: MembershipCache = MembershipCache()
+        self._typing_rate_limiter: TypingRateLimiter = TypingRateLimiter()
+        self._executors: dict[CommandType, Callable[[int, dict], CommandResult]] = {
+            CommandType.NEW_MESSAGE: self._new_message,
+            CommandType.READ: self._read,
+            CommandType.TYPING: self._typing,
+        }
+
+    def handle(self, user_id: int,
+               frame: str | bytes,
+               ) -> str | None:
+        # Blocking (DB and Redis). Returns the dumped `ACK` if the command has a request id.
+        try:
+            command: CommandJSONValidator = CommandJSONValidator.model_validate_json(frame)
+        except ValidationError:
+            return  # There is no request id to answer to.
+
+        try:
+            status, data = self._executors[command.type](user_id, command.data)
+        except ValidationError:
+            status, data = HTTPStatus.BAD_REQUEST, None
+        except DBEntityNotFoundException:
+            status, data = HTTPStatus.NOT_FOUND, None
+        except DBEntityIsForbiddenException:
+            status, data = HTTPStatus.FORBIDDEN, None
+        except Exception:
+            # E.g. DB or Redis is unavailable: the connection must survive it, as a worker of HTTP server does.
+            db_sync_builder.session.rollback()
+            logger.error(format_exc())
+            status, data = HTTPStatus.INTERNAL_SERVER_ERROR, None
+
+        if command.request_id is None:
+            return
+        return self._dump_ack(command.request_id, status, data)
+
+    @transaction_retry_decorator()
+    @raises(ValidationError, DBEntityNotFoundException, DBEntityIsForbiddenException)
+    def _new_message(self, user_id: int,
+                     data: dict,
+                     ) -> CommandResult:
+        validated: NewMessageJSONValidator = NewMessageJSONValidator.model_validate(data)
+        chat: Chat = Chat.by_id(validated.chat_id)
+        chat.check_user_access(user_id)
+
+        replied_message: Message | None = None
+        if validated.replied_message_id:
+            replied_message = chat.message_by_id(validated.replied_message_id)
+
+        message: Message = chat.add_message(validated.text, User.by_id(user_id), replied_message)
+        db_sync_builder.session.commit()
+
+        message.signal_new(chat.user_ids())
+        return HTTPStatus.CREATED, message.as_json()
+
+    @transaction_retry_decorator()
+    @raises(ValidationError, DBEntityNotFoundException, DBEntityIsForbiddenException)
+    def _read(self, user_id: int,
+              data: dict,
+              ) -> CommandResult:
+        validated: MessageIdJSONValidator = MessageIdJSONValidator.model_validate(data)
+        message: Message = Message.by_id(validated.message_id)
+        chat: Chat = message.chat
+        chat.check_user_access(user_id)
+
+        sender_message_ids: dict[int, list[int]] = chat.read_messages_of_user_up_to(message.id, user_id)
+        db_sync_builder.session.commit()
+
+        chat.signal_read_by_user(sender_message_ids, user_id)
+        return HTTPStatus.OK, None
+
+    @raises(ValidationError, DBEntityIsForbiddenException)
+    def _typing(self, user_id: int,
+                data: dict,
+                ) -> CommandResult:
+        # Unlike `/chat/typing`, DB is queried only on misses of the membership cache.
+        chat_id: int = ChatIdJSONValidator.model_validate(data).chat_id
+        if chat_id not in self._membership_cache.chat_ids_of_user(user_id):
+            raise DBEntityIsForbiddenException
+        if not self._typing_rate_limiter.allow(user_id, chat_id):
+            return HTTPStatus.OK, None  # Dropped silently, as `/chat/typing` does.
+
+        self._signal_queue.push(SignalQueueMessage(
+            user_ids=[_user_id for _user_id in self._membership_cache.user_ids_of_chat(chat_id) if _user_id != user_id],
+            message={
+                JSONKey.TYPE: SignalType.TYPING,
+                JSONKey.DATA: {
+                    JSONKey.CHAT_ID: chat_id,
+                    JSONKey.USER_ID: user_id,
+                },
+            },
+        ))
+        return HTTPStatus.OK, None
+
+    @staticmethod
+    def _dump_ack(request_id: int | str,
+                  status: HTTPStatus,
+                  data: dict | None,
+                  ) -> str:
+        message: SignalQueueMessageJSONDictToForward = {
+            JSONKey.TYPE: SignalType.ACK,
+            JSONKey.DATA: {
+                JSONKey.REQUEST_ID: request_id,
+                JSONKey.STATUS: status,
+                JSONKey.DATA: data,
+            },
+        }
+        return json.dumps(message)
@@ -0,0 +1,12 @@
+from enum import StrEnum
+
+__all__ = (
+    'CommandType',
+)
+
+
+class CommandType(StrEnum):
+
+    NEW_MESSAGE = 'NEW_MESSAGE'
+    READ = 'READ'
+    TYPING = 'TYPING'
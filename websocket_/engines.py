@@ -0,0 +1,11 @@
+from enum import StrEnum
+
+__all__ = (
+    'WebSocketEngine',
+)
+
+
+class WebSocketEngine(StrEnum):
+
+    SYNC = 'sync'
+    ASYNCIO = 'asyncio'
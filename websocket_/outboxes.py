@@ -0,0 +1,237 @@
+import asyncio
+from abc import ABC, abstractmethod
+from queue import Queue, Full, Empty
+from threading import Thread, Lock
+from typing import Final, Generic, TypeVar
+
+from websockets import ConnectionClosed
+from websockets.asyncio.server import ServerConnection as AsyncServerConnection
+from websockets.sync.server import ServerConnection as SyncServerConnection
+
+from websocket_.slow_client_policy import SlowClientPolicy
+
+__all__ = (
+    'AbstractOutbox',
+    'ThreadOutbox',
+    'AsyncOutbox',
+)
+
+ConnectionT = TypeVar('ConnectionT')
+
+
+class AbstractOutbox(ABC, Generic[ConnectionT]):
+    # Bounded queue of dumped messages with its own writer, so a slow client can't block the others.
+    _SLOW_CLIENT_CLOSE_CODE: Final[int] = 1008
+    _SLOW_CLIENT_CLOSE_REASON: Final[str] = 'Slow consumer.'
+
+    def __init__(self, connection: ConnectionT,
+                 max_size: int,
+                 slow_client_policy: SlowClientPolicy,
+                 ) -> None:
+        self._connection = connection
+        self._max_size = max_size
+        self._slow_client_policy = slow_client_policy
+        self._is_closed: bool = False
+        # Code and reason to close the connection with once the queued messages are sent:
+        self._close_frame: tuple[int, str] | None = None
+
+    @property
+    @abstractmethod
+    def depth(self) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def start(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def stop(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def close(self, code: int, reason: str) -> None:
+        # Never blocks. Messages which are already queued are sent before the close frame.
+        raise NotImplementedError
+
+    def put(self, dumped_message: str) -> bool:
+        # Never blocks. Returns `False` if some message was dropped.
+        if self._is_closed:
+            return False
+
+        if self._put_nowait(dumped_message):
+            return True
+
+        match self._slow_client_policy:
+            case SlowClientPolicy.DROP_OLDEST:
+                self._drop_oldest()
+                self._put_nowait(dumped_message)
+            case SlowClientPolicy.DISCONNECT:
+                self._is_closed = True
+                self._disconnect()
+        return False
+
+    @abstractmethod
+    def _put_nowait(self, dumped_message: str) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _drop_oldest(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _disconnect(self) -> None:
+        raise NotImplementedError
+
+
+class ThreadOutbox(AbstractOutbox[SyncServerConnection]):
+
+    def __init__(self, connection: SyncServerConnection,
+                 max_size: int,
+                 slow_client_policy: SlowClientPolicy,
+                 ) -> None:
+        super().__init__(connection, max_size, slow_client_policy)
+        # `None` stops the writer:
+        self._queue: Queue[str | None] = Queue(maxsize=max_size)
+        self._writer: Thread = Thread(target=self._write_task, daemon=True)
+        # The writer takes from the queue concurrently, so dropping and putting must be atomic:
+        self._lock: Lock = Lock()
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        self._writer.start()
+
+    def stop(self) -> None:
+        with self._lock:
+            self._is_closed = True
+            self._clear()
+            self._queue.put_nowait(None)
+
+    def close(self, code: int, reason: str) -> None:
+        with self._lock:
+            self._is_closed = True
+            self._close_frame = (code, reason)
+            # Otherwise the writer closes the connection after the last queued message:
+            if self._queue.empty():
+                self._queue.put_nowait(None)
+
+    def put(self, dumped_message: str) -> bool:
+        with self._lock:
+            return super().put(dumped_message)
+
+    def _put_nowait(self, dumped_message: str) -> bool:
+        try:
+            self._queue.put_nowait(dumped_message)
+        except Full:
+            return False
+        return True
+
+    def _drop_oldest(self) -> None:
+        try:
+            self._queue.get_nowait()
+        except Empty:
+            pass
+
+    def _disconnect(self) -> None:
+        self._clear()
+        self._queue.put_nowait(None)
+        # Closing waits for the handshake, so it mustn't block the caller:
+        Thread(
+            target=self._connection.close,
+            kwargs={'code': self._SLOW_CLIENT_CLOSE_CODE, 'reason': self._SLOW_CLIENT_CLOSE_REASON},
+            daemon=True,
+        ).start()
+
+    def _clear(self) -> None:
+        while True:
+            try:
+                self._queue.get_nowait()
+            except Empty:
+                return
+
+    def _write_task(self) -> None:
+        dumped_message: str | None
+        while True:
+            dumped_message = self._queue.get()
+            if dumped_message is None:
+                break
+            try:
+                self._connection.send(dumped_message)
+            except ConnectionClosed:
+                return
+            with self._lock:
+                if self._close_frame is not None and self._queue.empty():
+                    break
+
+        if self._close_frame is not None:
+            self._connection.close(*self._close_frame)
+
+
+class AsyncOutbox(AbstractOutbox[AsyncServerConnection]):
+    # Must be used only inside the event loop of the connection.
+
+    def __init__(self, connection: AsyncServerConnection,
+                 max_size: int,
+                 slow_client_policy: SlowClientPolicy,
+                 ) -> None:
+        super().__init__(connection, max_size, slow_client_policy)
+        # `None` stops the writer:
+        self._queue: asyncio.Queue[str | None] = asyncio.Queue(maxsize=max_size)
+        self._writer: asyncio.Task | None = None
+        self._closer: asyncio.Task | None = None
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        self._writer = asyncio.create_task(self._write_task())
+
+    def stop(self) -> None:
+        self._is_closed = True
+        if self._writer is not None:
+            self._writer.cancel()
+
+    def close(self, code: int, reason: str) -> None:
+        self._is_closed = True
+        self._close_frame = (code, reason)
+        # Otherwise the writer closes the connection after the last queued message:
+        if self._queue.empty():
+            self._queue.put_nowait(None)
+
+    def _put_nowait(self, dumped_message: str) -> bool:
+        try:
+            self._queue.put_nowait(dumped_message)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    def _drop_oldest(self) -> None:
+        try:
+            self._queue.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+
+    def _disconnect(self) -> None:
+        self.stop()
+        self._closer = asyncio.create_task(
+            self._connection.close(code=self._SLOW_CLIENT_CLOSE_CODE, reason=self._SLOW_CLIENT_CLOSE_REASON),
+        )
+
+    async def _write_task(self) -> None:
+        dumped_message: str | None
+        while True:
+            dumped_message = await self._queue.get()
+            if dumped_message is None:
+                break
+            try:
+                await self._connection.send(dumped_message)
+            except ConnectionClosed:
+                return
+            if self._close_frame is not None and self._queue.empty():
+                break
+
+        if self._close_frame is not None:
+            await self._connection.close(*self._close_frame)
@@ -0,0 +1,61 @@
+from collections import defaultdict
+from threading import Lock
+from time import monotonic
+
+__all__ = (
+    'PresenceAggregator',
+)
+
+
+class PresenceAggregator:
+    # Thread-safe. Collects online status transitions of users of this node for a window,
+    # so a user who has gone offline and online again (or vice versa) within it produces nothing.
+
+    def __init__(self, window: float) -> None:
+        self._window = window
+        self._statuses: dict[int, bool] = {}
+        # Statuses before the first transition in the window:
+        self._previous_statuses: dict[int, bool] = {}
+        self._window_started_at: float | None = None
+        self._lock: Lock = Lock()
+
+    def add(self, user_id: int, status: bool) -> None:
+        with self._lock:
+            self._previous_statuses.setdefault(user_id, not status)
+            self._statuses[user_id] = status
+            if self._window_started_at is None:
+                self._window_started_at = monotonic()
+
+    def is_due(self) -> bool:
+        window_started_at: float | None = self._window_started_at
+        return window_started_at is not None and monotonic() - window_started_at >= self._window
+
+    def pop_changes(self) -> dict[int, bool]:
+        # Returns new statuses of users whose statuses differ from the ones before the window.
+        with self._lock:
+            changes: dict[int, bool] = {
+                user_id: status
+                for user_id, status in self._statuses.items()
+                if status != self._previous_statuses[user_id]
+            }
+            self._statuses.clear()
+            self._previous_statuses.clear()
+            self._window_started_at = None
+        return changes
+
+    @staticmethod
+    def merge(statuses: dict[int, bool],
+              recipient_ids_of_users: dict[int, list[int]],
+              ) -> list[tuple[list[int], dict[int, bool]]]:
+        # Every recipient gets one payload with all statuses meant for it.
+        # Recipients with equal payloads are grouped, so every payload is encoded once.
+        statuses_of_recipients: defaultdict[int, dict[int, bool]] = defaultdict(dict)
+        for user_id, recipient_ids in recipient_ids_of_users.items():
+            for recipient_id in recipient_ids:
+                statuses_of_recipients[recipient_id][user_id] = statuses[user_id]
+
+        recipient_ids_of_payloads: defaultdict[tuple[tuple[int, bool], ...], list[int]] = defaultdict(list)
+        for recipient_id, statuses_of_recipient in statuses_of_recipients.items():
+            recipient_ids_of_payloads[tuple(sorted(statuses_of_recipient.items()))].append(recipient_id)
+
+        return [(recipient_ids, dict(payload)) for payload, recipient_ids in recipient_ids_of_payloads.items()]
@@ -1,21 +1,64 @@
-from typing import NoReturn
+from typing import Final
 
 from common.ssl_context import create_ssl_context
-from config.api import HOST, WEBSOCKET_PORT, JWT_SECRET_KEY, JWT_ALGORITHM
-from db.init import init_db
+from config.api import (
+    HOST,
+    WEBSOCKET_PORT,
+    WEBSOCKET_ENGINE,
+    WEBSOCKET_MULTI_NODE,
+    WEBSOCKET_NODE_ID,
+    WEBSOCKET_OUTBOX_MAX_SIZE,
+    WEBSOCKET_SLOW_CLIENT_POLICY,
+    WEBSOCKET_OUTBOX_METRICS_INTERVAL,
+    WEBSOCKET_DRAIN_BATCH_SIZE,
+    WEBSOCKET_DRAIN_BATCH_INTERVAL,
+    WEBSOCKET_RECONNECT_MAX_DELAY,
+    WEBSOCKET_DRAIN_TIMEOUT,
+    WEBSOCKET_HEARTBEAT_INTERVAL,
+    WEBSOCKET_NODE_TTL,
+    WEBSOCKET_PRESENCE_WINDOW,
+    JWT_SECRET_KEY,
+    JWT_ALGORITHM,
+)
+from db.init import init_db, init_async_db
+from websocket_.abstract_server import AbstractWebSocketServer
+from websocket_.async_server import AsyncWebSocketServer
+from websocket_.engines import WebSocketEngine
 from websocket_.server import WebSocketServer
+from websocket_.slow_client_policy import SlowClientPolicy
 
 __all__ = (
     'run_websocket',
 )
 
+_SERVER_TYPES: Final[dict[WebSocketEngine, type[AbstractWebSocketServer]]] = {
+    WebSocketEngine.SYNC: WebSocketServer,
+    WebSocketEngine.ASYNCIO: AsyncWebSocketServer,
+}
+
 
-def run_websocket() -> NoReturn:
+def run_websocket() -> None:
+    engine: WebSocketEngine = WebSocketEngine(WEBSOCKET_ENGINE)
     init_db()
-    server: WebSocketServer = WebSocketServer(
+    if engine == WebSocketEngine.ASYNCIO:
+        init_async_db()
+
+    server: AbstractWebSocketServer = _SERVER_TYPES[engine](
         host=HOST,
         port=WEBSOCKET_PORT,
         jwt_secret_key=JWT_SECRET_KEY,
         jwt_algorithm=JWT_ALGORITHM,
+        node_id=WEBSOCKET_NODE_ID,
+        multi_node=WEBSOCKET_MULTI_NODE,
+        outbox_max_size=WEBSOCKET_OUTBOX_MAX_SIZE,
+        slow_client_policy=SlowClientPolicy(WEBSOCKET_SLOW_CLIENT_POLICY),
+        outbox_metrics_interval=WEBSOCKET_OUTBOX_METRICS_INTERVAL,
+        drain_batch_size=WEBSOCKET_DRAIN_BATCH_SIZE,
+        drain_batch_interval=WEBSOCKET_DRAIN_BATCH_INTERVAL,
+        reconnect_max_delay=WEBSOCKET_RECONNECT_MAX_DELAY,
+        drain_timeout=WEBSOCKET_DRAIN_TIMEOUT,
+        heartbeat_interval=WEBSOCKET_HEARTBEAT_INTERVAL,
+        node_ttl=WEBSOCKET_NODE_TTL,
+        presence_window=WEBSOCKET_PRESENCE_WINDOW,
     )
     server.run()
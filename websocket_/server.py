@@ -1,75 +1,83 @@
-import json
-import re
-from ssl import SSLContext
-from typing import NoReturn, Final
+import signal
 from threading import Thread
+from time import monotonic, sleep
+from typing import Final
 
-from jwt import decode as decode_jwt, PyJWTError
 from websockets import ConnectionClosed
-from websockets.sync.server import serve, ServerConnection
+from websockets.sync.server import serve, Server, ServerConnection
 
 from common.hinting import raises
-from common.json_keys import JSONKey
-from common.online_set import OnlineSet
-from common.signals.message import SignalQueueMessage, SignalQueueMessageJSONDictToForward
-from common.signals.queue import SignalQueue
-from common.signals.signal_types import SignalType
+from common.signals.message import DumpedSignalQueueMessage
 from common.signals.exceptions import SignalQueueIsEmptyException
 from db.builders import db_sync_builder
-from db.exceptions import DBEntityNotFoundException
-from db.models import User, UserChatMatch
 from common.logs import logger, init_logs
-from websocket_.exceptions import (
-    InvalidOriginException,
-    JWTNotFoundInCookiesException,
-    UserIdNotFoundInJWTException,
-)
+from websocket_.abstract_server import AbstractWebSocketServer
+from websocket_.outboxes import ThreadOutbox
 
 __all__ = (
     'WebSocketServer',
 )
 
 
-class WebSocketServer:
-    _RE_TO_EXTRACT_JWT_FROM_COOKIES: Final[str] = 'access_token_cookie=([^;]*);?'
-
-    def __init__(self, host: str, port: int,
-                 jwt_secret_key: str, jwt_algorithm: str,
-                 origins: list[str] | None = None,
-                 ssl_context: SSLContext | None = None,
-                 ) -> None:
-        self._host = host
-        self._port = port
-        self._jwt_secret_key = jwt_secret_key
-        self._jwt_algorithm = jwt_algorithm
-        self._origins = [] if origins is None else origins
-        self._ssl_context = ssl_context
-
-        self._online_set: OnlineSet = OnlineSet()
-        self._signal_queue: SignalQueue = SignalQueue()
-        self._clients: dict[int, list[ServerConnection]] = {}
+class WebSocketServer(AbstractWebSocketServer[ThreadOutbox]):
+    # Thread-per-connection engine. Each connection also has a writer thread of its outbox.
+    _DRAIN_CHECK_INTERVAL: Final[float] = 0.1
 
-    def run(self) -> NoReturn:
+    def run(self) -> None:
         init_logs()
-        Thread(target=self._signal_queue_pop_task).start()
+        popping: Thread = Thread(target=self._signal_queue_pop_task)
+        popping.start()
         with serve(handler=self._handler, host=self._host, port=self._port, ssl=self._ssl_context) as server:
+            for signal_ in self._STOP_SIGNALS:
+                signal.signal(signal_, lambda *_: self._stop_accepting(server))
             logger.info(f'WebSocketServer is serving on wss://{self._host}:{self._port}')
             server.serve_forever()
 
-    def _signal_queue_pop_task(self) -> NoReturn:
-        self._online_set.clear()
-
-        message: SignalQueueMessage
-        while True:
+        popping.join()
+        self._drain()
+
+    def _stop_accepting(self, server: Server) -> None:
+        # Signal handler: `serve_forever` returns and the popping stops, nothing is logged as logging isn't reentrant.
+        self._is_draining = True
+        server.shutdown()
+
+    def _drain(self) -> None:
+        logger.info(f'WebSocketServer is draining {len(self._clients)} users...')
+        self._send_signals(self._pop_pending_signals())
+        for batch in self._outbox_batches_to_drain():
+            for outbox in batch:
+                self._close_for_reconnect(outbox)
+            sleep(self._drain_batch_interval)
+
+        deadline: float = monotonic() + self._drain_timeout
+        while self._clients and monotonic() < deadline:
+            sleep(self._DRAIN_CHECK_INTERVAL)
+        if self._clients:
+            logger.warning(f'{len(self._clients)} users have not disconnected in time.')
+
+        self._reset_online_state()
+        logger.info('WebSocketServer has been drained.')
+
+    def _signal_queue_pop_task(self) -> None:
+        self._reset_online_state()
+
+        messages: list[DumpedSignalQueueMessage]
+        while not self._is_draining:
+            self._log_outbox_metrics_if_it_is_time()
+            if self._is_time_to_heartbeat():
+                interlocutor_ids_of_users: dict[int, list[int]] = self._heartbeat_and_reap()
+                self._push_to_other_nodes(self._send_online_statuses(
+                    dict.fromkeys(interlocutor_ids_of_users, False), interlocutor_ids_of_users,
+                ))
+            if self._presence_aggregator.is_due():
+                statuses: dict[int, bool] = self._presence_aggregator.pop_changes()
+                self._push_to_other_nodes(self._send_online_statuses(statuses, self._update_online_statuses(statuses)))
             try:
-                message = self._signal_queue.pop()
+                messages = self._pop_signals()
             except SignalQueueIsEmptyException:
                 continue
 
-            self._send_to_many_users(
-                user_ids=message.user_ids,
-                message=message.message,
-            )
+            self._send_signals(messages)
 
     def _handler(self, client: ServerConnection) -> None:
         logger.info(f'New client connected. Total connected users: {len(self._clients)}')
@@ -77,144 +85,27 @@ class WebSocketServer:
             self._handle_client(client)
         except ConnectionClosed:
             pass
-        logger.info('Client disconnected.')
-        # Likewise `@app.teardown_appcontext` in flask:
-        db_sync_builder.session.remove()
+        finally:
+            logger.info('Client disconnected.')
+            # Likewise `@app.teardown_appcontext` in flask:
+            db_sync_builder.session.remove()
 
     @raises(ConnectionClosed)
     def _handle_client(self, client: ServerConnection) -> None:
-        if 'Cookie' not in client.request.headers:
+        user_id: int | None = self._user_id_by_headers(client.request.headers)
+        if user_id is None:
             return
 
-        try:
-            origin: str = client.request.headers['Origin']
-            cookies: str = client.request.headers['Cookie']
-        except KeyError:
-            logger.info('Client has been disconnected due to origin or cookie header was not found.')
-            return
-
-        try:
-            self._check_origin(origin)
-        except InvalidOriginException:
-            logger.info('Client has been disconnected due to invalid origin.')
-            return
-
-        try:
-            jwt: str = self._extract_jwt_from_cookies(cookies)
-        except JWTNotFoundInCookiesException:
-            logger.info('Client has been disconnected due to JWT was not found in cookies.')
-            return
-
-        try:
-            user_id: int = self._user_id_by_jwt(jwt)
-        except UserIdNotFoundInJWTException:
-            logger.info('Client has been disconnected due to invalid JWT (user id was not found).')
-            return
-
-        self._add_client(user_id, client)
+        outbox: ThreadOutbox = ThreadOutbox(client, self._outbox_max_size, self._slow_client_policy)
+        self._add_client(user_id, outbox)
+        outbox.start()
         try:
             while True:
-                client.recv()
-        except ConnectionClosed:
-            self._del_client(user_id, client)
-            raise
-
-    @raises(InvalidOriginException)
-    def _check_origin(self, origin: str) -> None:
-        if not self._origins:
-            return
-
-        for origin_regex in self._origins:
-            if re.match(origin_regex, origin):
-                return
-        raise InvalidOriginException
-
-    @raises(JWTNotFoundInCookiesException)
-    def _extract_jwt_from_cookies(self, cookies: str) -> str:
-        match = re.search(self._RE_TO_EXTRACT_JWT_FROM_COOKIES, cookies)
-        if not match:
-            raise JWTNotFoundInCookiesException
-
-        return match.group(1)
-
-    @raises(UserIdNotFoundInJWTException)
-    def _user_id_by_jwt(self, jwt: str) -> int:
-        try:
-            user_id: int = self._extract_user_id_from_jwt(jwt)
-        except PyJWTError:
-            raise UserIdNotFoundInJWTException
-
-        try:
-            return User.by_id(user_id).id
-        except DBEntityNotFoundException:
-            raise UserIdNotFoundInJWTException
-
-    @raises(PyJWTError)
-    def _extract_user_id_from_jwt(self, jwt: str) -> int:
-        try:
-            decoded: dict = decode_jwt(
-                jwt,
-                key=self._jwt_secret_key,
-                algorithms=[self._jwt_algorithm],
-            )
-            return int(decoded['sub'])
-        except KeyError:
-            raise PyJWTError
-
-    def _add_client(self, user_id: int,
-                    client: ServerConnection,
-                    ) -> None:
-        if user_id not in self._clients:
-            self._clients[user_id] = []
-            self._online_set.add(user_id)
-            self._send_online_statuses(user_id, True)
-
-        self._clients[user_id].append(client)
-
-    def _del_client(self, user_id: int,
-                    client: ServerConnection,
-                    ) -> None:
-        try:
-            self._clients[user_id].remove(client)
-        except (KeyError, ValueError):
-            return
-
-        if not self._clients[user_id]:
-            self._clients.pop(user_id)
-            self._online_set.remove(user_id)
-            self._send_online_statuses(user_id, False)
-
-    def _send_online_statuses(self, user_id: int,
-                              status: bool,
-                              ) -> None:
-        self._send_to_many_users(
-            user_ids=UserChatMatch.all_interlocutors_of_all_chats_of_user(user_id).ids(),
-            message={
-                JSONKey.TYPE: SignalType.ONLINE_STATUSES,
-                JSONKey.DATA: {
-                    user_id: status,
-                },
-            },
-        )
-
-    def _send_to_many_users(self, user_ids: list[int],
-                            message: SignalQueueMessageJSONDictToForward,
-                            ) -> None:
-        user_ids = set(user_ids)
-        for id_ in user_ids:
-            self._send_to_one_user(id_, message)
-
-    def _send_to_one_user(self, user_id: int,
-                          message: SignalQueueMessageJSONDictToForward,
-                          ) -> None:
-        for client in self._clients.get(user_id, []):
-            self._send_to_one_client(client, message)
-
-    @staticmethod
-    def _send_to_one_client(client: ServerConnection,
-                            message: SignalQueueMessageJSONDictToForward,
-                            ) -> None:
-        try:
-            client.send(json.dumps(message))
-        except ConnectionClosed:
-            return
+                dumped_ack: str | None = self._command_handler.handle(user_id, client.recv())
+                # The connection lives long, so it mustn't hold a DB connection between frames:
+                db_sync_builder.session.remove()
+                if dumped_ack is not None:
+                    outbox.put(dumped_ack)
+        finally:
+            outbox.stop()
+            self._del_client(user_id, outbox)
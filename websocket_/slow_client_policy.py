@@ -0,0 +1,13 @@
+from enum import StrEnum
+
+__all__ = (
+    'SlowClientPolicy',
+)
+
+
+class SlowClientPolicy(StrEnum):
+    # What to do when the outbox of a client is full.
+
+    DROP_NEW = 'drop_new'
+    DROP_OLDEST = 'drop_oldest'
+    DISCONNECT = 'disconnect'